@@ -0,0 +1,72 @@
+"""Serve the chat API with the LLM calls replaced by canned answers.
+
+Runs VannaAiCodeAPI14's app unchanged (caches, limiter, executor, query
+runner, database) except that ``generate_sql`` and
+``generate_plotly_code`` sleep for --llm-latency seconds and return
+canned code instead of calling OpenAI, so /chat can be load tested with
+loadDriver.py --chat without an API key or token costs.  Point
+``mysql_config`` in VannaAiCodeAPI14.py at the benchmark database.
+
+    python chatStubServer.py --llm-latency 1.5 --port 5001
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Skip Chroma training on start-up unless asked for
+os.environ.setdefault('VANNA_TRAINING_MODE', 'skip')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Vanna.AI', 'BackEndAPI'))
+import VannaAiCodeAPI14 as api
+
+# First keyword found in the lower-cased question picks the SQL
+CANNED_SQL = (
+    ('each category', "SELECT category, COUNT(*) AS jobs FROM jobs GROUP BY category ORDER BY jobs DESC"),
+    ('per location', "SELECT location, COUNT(*) AS jobs FROM jobs GROUP BY location ORDER BY jobs DESC"),
+    ('salary by location', "SELECT location, AVG(monthly_equiv_max) AS avg_salary FROM jobs GROUP BY location"),
+    ('companies', "SELECT company, COUNT(*) AS jobs FROM jobs GROUP BY company ORDER BY jobs DESC LIMIT 20"),
+    ('hourly and monthly', "SELECT salary_type, COUNT(*) AS jobs FROM jobs GROUP BY salary_type"),
+    ('highest paying', "SELECT title, company, monthly_equiv_max FROM jobs ORDER BY monthly_equiv_max DESC LIMIT 1"),
+    ('rīga', "SELECT title, company, salary_min, salary_max FROM jobs "
+             "WHERE location = 'Rīga' AND monthly_equiv_max > 2000 ORDER BY id DESC"),
+    ('hourly', "SELECT title, company, location, salary_max FROM jobs WHERE salary_type = 'hourly' ORDER BY id DESC"),
+)
+
+DEFAULT_SQL = "SELECT title, company, location, category, salary_max FROM jobs ORDER BY id DESC LIMIT 200"
+
+PLOTLY_CODE = "fig = px.bar(df, x=df.columns[0], y=df.columns[-1])"
+
+
+def stub_llm(latency, jitter):
+    def wait():
+        if latency:
+            time.sleep(max(0.0, random.gauss(latency, latency * jitter)))
+
+    def generate_sql(question, **kwargs):
+        wait()
+        lowered = question.lower()
+        return next((sql for keyword, sql in CANNED_SQL if keyword in lowered), DEFAULT_SQL)
+
+    def generate_plotly_code(question=None, sql=None, df_metadata=None, **kwargs):
+        wait()
+        return PLOTLY_CODE
+
+    api.vn.generate_sql = generate_sql
+    api.vn.generate_plotly_code = generate_plotly_code
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--llm-latency', type=float, default=1.0, help="mean seconds per stubbed LLM call")
+    parser.add_argument('--jitter', type=float, default=0.3, help="standard deviation as a share of the mean")
+    parser.add_argument('--port', type=int, default=api.server_config['port'])
+    args = parser.parse_args()
+
+    stub_llm(args.llm_latency, args.jitter)
+    from waitress import serve
+    serve(api.app, host=api.server_config['host'], port=args.port, threads=api.server_config['threads'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,258 @@
+"""Generate a synthetic ``jobs`` table for benchmarking the job API.
+
+Rows are sampled from the listings in DataBaseAPI/jobs.sql, so category,
+location, company and salary distributions follow the real data:
+category, company, title and salary come from one sampled listing (the
+salary jittered), the location is drawn independently from the location
+frequencies, and a share of companies is replaced by a long tail of
+synthetic ones so company cardinality grows with the row count.
+
+    # Load 1M rows into a database prepared with jobs.sql and the migrations
+    python generateJobs.py --rows 1000000 --database VakancesBench --truncate
+
+    # Or write an SQL file to load with `mysql VakancesBench < jobs_1m.sql`
+    python generateJobs.py --rows 1000000 --output jobs_1m.sql
+
+The same --seed always produces the same rows.  Listing URLs are numbered
+after the table's current MAX(id) (--start-id for an SQL file), so a run
+without --truncate adds rows instead of colliding with an earlier run's URLs.
+"""
+import argparse
+import datetime
+import logging
+import os
+import re
+import time
+
+import numpy as np
+import pymysql
+from pymysql.converters import escape_string
+
+DUMP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'DataBaseAPI', 'jobs.sql')
+
+COLUMNS = (
+    'title', 'company', 'location', 'category', 'deadline', 'salary_type',
+    'salary_min', 'salary_max', 'salary_text',
+    'hourly_equiv_min', 'hourly_equiv_max',
+    'monthly_equiv_min', 'monthly_equiv_max',
+    'calculated', 'url', 'views'
+)
+
+GENERATOR_CONFIG = {
+    'hours_per_month': 160,
+    # Spread of the multiplicative jitter applied to sampled salaries
+    'salary_sigma': 0.2,
+    # Share of rows whose company is replaced by a synthetic one
+    'synthetic_company_share': 0.4,
+    'rows_per_synthetic_company': 200,
+    'deadline_days': 60,
+    'url_prefix': 'https://www.visidarbi.lv/darba-sludinajums/bench-'
+}
+
+_ROW = re.compile(r"^\((.*)\)[,;]$")
+_VALUE = re.compile(r"'((?:[^'\\]|\\.|'')*)'|(NULL)|(-?\d+(?:\.\d+)?)")
+_DUMP_COLUMNS = re.compile(r"INSERT INTO `jobs` \((.*?)\) VALUES")
+
+_COMPANY_WORDS = ('Baltic', 'Nord', 'Rīgas', 'Daugava', 'Kurzemes', 'Vidzemes', 'Latgales',
+                  'Amber', 'Forest', 'Logistics', 'Serviss', 'Būve', 'Grupa', 'Partneri')
+
+
+def load_listings(dump_path=DUMP_PATH):
+    """The rows of the ``jobs`` INSERTs in a phpMyAdmin dump, as dicts."""
+    listings = []
+    columns = None
+    with open(dump_path, encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            header = _DUMP_COLUMNS.match(line)
+            if header:
+                columns = [column.strip(' `') for column in header.group(1).split(',')]
+                continue
+            row = _ROW.match(line)
+            if not row or columns is None:
+                continue
+            values = []
+            for text, null, number in _VALUE.findall(row.group(1)):
+                if null:
+                    values.append(None)
+                elif number:
+                    values.append(float(number))
+                else:
+                    values.append(text.replace("''", "'").replace("\\'", "'").replace('\\\\', '\\'))
+            if len(values) == len(columns):
+                listings.append(dict(zip(columns, values)))
+    return [listing for listing in listings if listing.get('salary_max')]
+
+
+def _salary_text(low, high, hourly):
+    unit = ' /st.' if hourly else ''
+    if low == high:
+        return f"€ {low:g}{unit}"
+    return f"€ {low:g} - {high:g}{unit}"
+
+
+class JobGenerator:
+    def __init__(self, listings, seed=0, config=GENERATOR_CONFIG, start_id=0):
+        if not listings:
+            raise ValueError("No listings with a salary to sample from")
+        self.listings = listings
+        self.config = config
+        self.rng = np.random.default_rng(seed)
+        locations, counts = np.unique([listing['location'] for listing in listings], return_counts=True)
+        self.locations = locations
+        self.location_weights = counts / counts.sum()
+        self.today = datetime.date(2025, 4, 3)
+        # Numbers the bench-N listing URLs, which must be unique across runs
+        self.next_id = start_id
+
+    def _companies(self, size, total_rows):
+        # Zipf-like tail: a few synthetic companies post a lot, most post a little
+        pool = max(50, total_rows // self.config['rows_per_synthetic_company'])
+        ranks = np.minimum(self.rng.zipf(1.3, size), pool)
+        words = self.rng.choice(_COMPANY_WORDS, size)
+        return [f"SIA {word} {rank}" for word, rank in zip(words, ranks)]
+
+    def chunk(self, size, total_rows):
+        """``size`` rows as tuples in COLUMNS order."""
+        config = self.config
+        rng = self.rng
+        base = rng.integers(0, len(self.listings), size)
+        locations = rng.choice(self.locations, size, p=self.location_weights)
+        synthetic = rng.random(size) < config['synthetic_company_share']
+        companies = iter(self._companies(int(synthetic.sum()), total_rows))
+        jitter = rng.lognormal(0.0, config['salary_sigma'], size)
+        deadlines = rng.integers(1, config['deadline_days'] + 1, size)
+        views = rng.lognormal(3.5, 1.2, size).astype(int)
+        hours = config['hours_per_month']
+
+        rows = []
+        for i in range(size):
+            listing = self.listings[base[i]]
+            hourly = listing['salary_type'] == 'hourly'
+            low = listing['salary_min'] or listing['salary_max']
+            high = listing['salary_max']
+            digits = 2 if hourly else -1
+            low, high = round(float(low * jitter[i]), digits), round(float(high * jitter[i]), digits)
+            high = max(low, high)
+            if hourly:
+                equivalents = (low, high, round(low * hours, 2), round(high * hours, 2))
+            else:
+                equivalents = (round(low / hours, 2), round(high / hours, 2), low, high)
+            deadline = self.today + datetime.timedelta(days=int(deadlines[i]))
+            self.next_id += 1
+            rows.append((
+                listing['title'],
+                next(companies) if synthetic[i] else listing['company'],
+                str(locations[i]),
+                listing['category'],
+                f"Termiņš {deadline:%d.%m}",
+                listing['salary_type'],
+                low, high, _salary_text(low, high, hourly),
+                *equivalents,
+                1,
+                f"{config['url_prefix']}{self.next_id}",
+                int(views[i])
+            ))
+        return rows
+
+
+def _sql_literal(value):
+    if value is None:
+        return 'NULL'
+    if isinstance(value, str):
+        return "'" + escape_string(value) + "'"
+    return repr(value)
+
+
+def insert_statement(columns, rows):
+    values = ",\n".join("(" + ", ".join(_sql_literal(value) for value in row) + ")" for row in rows)
+    return f"INSERT INTO jobs ({', '.join(columns)}) VALUES\n{values};\n"
+
+
+def table_columns(cursor):
+    cursor.execute("SHOW COLUMNS FROM jobs")
+    return {row[0] for row in cursor.fetchall()}
+
+
+def generate(generator, rows, chunk_size, write):
+    written = 0
+    started = time.monotonic()
+    while written < rows:
+        size = min(chunk_size, rows - written)
+        write(generator.chunk(size, rows))
+        written += size
+        elapsed = time.monotonic() - started
+        logging.info("%d / %d rows (%.0f rows/s)", written, rows, written / elapsed if elapsed else 0)
+    return written
+
+
+def load_into_database(args, generator):
+    connection = pymysql.connect(host=args.host, user=args.user, password=args.password,
+                                 database=args.database, port=args.port, charset='utf8mb4')
+    try:
+        with connection.cursor() as cursor:
+            # salary_text only exists after migration 004
+            columns = [column for column in COLUMNS if column in table_columns(cursor)]
+            indexes = [COLUMNS.index(column) for column in columns]
+            if args.truncate:
+                cursor.execute("TRUNCATE TABLE jobs")
+            else:
+                # Every bench URL number is at most its row's id, so numbering from MAX(id)
+                # never repeats an earlier run's URLs
+                cursor.execute("SELECT COALESCE(MAX(id), 0) FROM jobs")
+                generator.next_id = max(generator.next_id, cursor.fetchone()[0])
+            statement = ("INSERT INTO jobs (" + ", ".join(columns) + ") VALUES ("
+                         + ", ".join(["%s"] * len(columns)) + ")")
+
+            def write(chunk):
+                # pymysql turns executemany of a plain INSERT into multi-row statements
+                cursor.executemany(statement, [tuple(row[i] for i in indexes) for row in chunk])
+                connection.commit()
+
+            written = generate(generator, args.rows, args.chunk_size, write)
+            cursor.execute("UPDATE data_version SET version = version + 1 WHERE name = 'jobs'")
+            cursor.execute("ANALYZE TABLE jobs")
+            cursor.fetchall()
+            connection.commit()
+    finally:
+        connection.close()
+    return written
+
+
+def write_sql_file(args, generator):
+    with open(args.output, 'w', encoding='utf-8') as f:
+        f.write("SET NAMES utf8mb4;\nSTART TRANSACTION;\n")
+        if args.truncate:
+            f.write("TRUNCATE TABLE jobs;\n")
+        written = generate(generator, args.rows, args.chunk_size,
+                           lambda chunk: f.write(insert_statement(COLUMNS, chunk)))
+        f.write("UPDATE data_version SET version = version + 1 WHERE name = 'jobs';\nCOMMIT;\n")
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--dump', default=DUMP_PATH, help="jobs.sql to sample listings from")
+    parser.add_argument('--output', help="write an SQL file instead of loading a database")
+    parser.add_argument('--truncate', action='store_true', help="empty the jobs table first")
+    parser.add_argument('--start-id', type=int, default=0,
+                        help="number listing URLs after this (for --output files loaded into a non-empty table)")
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='Vakances')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    generator = JobGenerator(load_listings(args.dump), seed=args.seed, start_id=args.start_id)
+    started = time.monotonic()
+    written = write_sql_file(args, generator) if args.output else load_into_database(args, generator)
+    logging.info("Generated %d rows in %.1f s", written, time.monotonic() - started)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,285 @@
+"""Replay the mobile app's request mix against the job API (or the chat API).
+
+Each worker thread plays one user after another, issuing the same requests
+the app does:
+
+* home screen: ``/jobs?categories=...&location=...`` for a saved profile;
+* job list: ``/filter-options``, then ``/all-jobs?page=1`` together with
+  ``/filter-counts``, again for every filter toggled, then paging on,
+  sometimes jumping to a deep page.
+
+Filter values come from the server's own ``/filter-options``.  Latency is
+reported per endpoint as p50/p95/p99 with throughput and error counts.
+
+    python loadDriver.py --base-url http://localhost:5000 --concurrency 32 --duration 60
+
+    # /chat, e.g. against chatStubServer.py
+    python loadDriver.py --chat --base-url http://localhost:5001 --concurrency 8
+"""
+import argparse
+import json
+import random
+import threading
+import time
+
+import requests
+
+MIX_CONFIG = {
+    # Share of users who open the home screen instead of the job list
+    'home_share': 0.3,
+    'max_toggles': 4,
+    # Chance to page on after each page, and to jump to a deep page instead
+    'next_page': 0.6,
+    'deep_page': 0.1,
+    'pay_steps': (500, 1000, 1500, 2000, 3000)
+}
+
+CHAT_QUESTIONS = (
+    "How many jobs are there in each category?",
+    "How many jobs are in each category",
+    "Show the average monthly salary by location as a chart",
+    "Which companies have the most job listings?",
+    "List jobs in Rīga paying over 2000 euros a month",
+    "Show hourly jobs in Norvēģija",
+    "What is the highest paying job?",
+    "Plot the number of jobs per location",
+    "How many hourly and monthly jobs are there?",
+    "List the newest transport jobs"
+)
+
+
+def percentile(sorted_values, share):
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, int(round(share * len(sorted_values))) - 1))
+    return sorted_values[index]
+
+
+class Recorder:
+    def __init__(self):
+        self.samples = {}
+        self.errors = {}
+        self.statuses = {}
+        self.recording = False
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, seconds, status):
+        if not self.recording:
+            return
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append(seconds)
+            key = (endpoint, status)
+            self.statuses[key] = self.statuses.get(key, 0) + 1
+            if status is None or status >= 400:
+                self.errors[endpoint] = self.errors.get(endpoint, 0) + 1
+
+    def summary(self, seconds):
+        def describe(latencies, errors):
+            latencies = sorted(latencies)
+            return {
+                'requests': len(latencies),
+                'errors': errors,
+                'per_second': round(len(latencies) / seconds, 1) if seconds else None,
+                'p50_ms': round(percentile(latencies, 0.50) * 1000, 1),
+                'p95_ms': round(percentile(latencies, 0.95) * 1000, 1),
+                'p99_ms': round(percentile(latencies, 0.99) * 1000, 1),
+                'max_ms': round(latencies[-1] * 1000, 1)
+            }
+
+        with self._lock:
+            endpoints = {name: describe(values, self.errors.get(name, 0)) for name, values in self.samples.items()}
+            everything = [value for values in self.samples.values() for value in values]
+            statuses = {f"{endpoint} {status}": count for (endpoint, status), count in self.statuses.items()}
+        return {
+            'seconds': round(seconds, 1),
+            'overall': describe(everything, sum(self.errors.values())) if everything else None,
+            'endpoints': endpoints,
+            'statuses': statuses
+        }
+
+
+class Client:
+    def __init__(self, base_url, recorder, timeout):
+        self.base_url = base_url.rstrip('/')
+        self.recorder = recorder
+        self.timeout = timeout
+        self.session = requests.Session()
+
+    def request(self, endpoint, method='GET', params=None, json_body=None):
+        started = time.perf_counter()
+        try:
+            response = self.session.request(method, self.base_url + endpoint, params=params,
+                                            json=json_body, timeout=self.timeout)
+            body = response.content
+            status = response.status_code
+        except requests.RequestException:
+            self.recorder.record(endpoint, time.perf_counter() - started, None)
+            return None
+        self.recorder.record(endpoint, time.perf_counter() - started, status)
+        if status != 200:
+            return None
+        try:
+            return json.loads(body)
+        except ValueError:
+            return None
+
+
+def filter_params(filters):
+    params = {}
+    if filters['locations']:
+        params['location'] = ','.join(filters['locations'])
+    if filters['categories']:
+        params['categories'] = ','.join(filters['categories'])
+    if filters['pay_from']:
+        params['payFrom'] = filters['pay_from']
+    return params
+
+
+class JobAppUser:
+    """One user of the mobile app; ``run`` plays a single visit."""
+
+    def __init__(self, client, options, rng, mix=MIX_CONFIG):
+        self.client = client
+        self.options = options
+        self.rng = rng
+        self.mix = mix
+
+    def pick(self, values, most):
+        return self.rng.sample(values, self.rng.randint(1, min(most, len(values))))
+
+    def run(self):
+        if self.rng.random() < self.mix['home_share']:
+            self.home()
+        else:
+            self.job_list()
+
+    def home(self):
+        self.client.request('/jobs', params={
+            'categories': ','.join(self.pick(self.options['categories'], 3)),
+            'location': self.rng.choice(self.options['locations'])
+        })
+
+    def list_page(self, filters, page):
+        params = filter_params(filters)
+        params['page'] = page
+        data = self.client.request('/all-jobs', params=params)
+        return (data or {}).get('pages') or 1
+
+    def job_list(self):
+        rng = self.rng
+        mix = self.mix
+        self.client.request('/filter-options')
+        filters = {'categories': [], 'locations': [], 'pay_from': None}
+        pages = self.list_page(filters, 1)
+        self.client.request('/filter-counts', params=filter_params(filters))
+
+        for _ in range(rng.randint(0, mix['max_toggles'])):
+            toggle = rng.random()
+            if toggle < 0.5:
+                self.toggle(filters['categories'], self.options['categories'])
+            elif toggle < 0.85:
+                self.toggle(filters['locations'], self.options['locations'])
+            else:
+                filters['pay_from'] = rng.choice((None,) + tuple(mix['pay_steps']))
+            pages = self.list_page(filters, 1)
+            self.client.request('/filter-counts', params=filter_params(filters))
+
+        page = 1
+        while page < pages and rng.random() < mix['next_page']:
+            if rng.random() < mix['deep_page']:
+                page = rng.randint(max(page + 1, pages // 2), pages)
+            else:
+                page += 1
+            self.list_page(filters, page)
+
+    def toggle(self, selected, values):
+        value = self.rng.choice(values)
+        if value in selected:
+            selected.remove(value)
+        else:
+            selected.append(value)
+
+
+class ChatUser:
+    """Asks one question per visit, and sometimes pages through a large result."""
+
+    def __init__(self, client, rng, questions=CHAT_QUESTIONS):
+        self.client = client
+        self.rng = rng
+        self.questions = questions
+
+    def run(self):
+        reply = self.client.request('/chat', method='POST', json_body={'message': self.rng.choice(self.questions)})
+        handle = (reply or {}).get('resultHandle')
+        if handle and self.rng.random() < 0.5:
+            self.client.request(f'/chat/result/{handle}', params={'offset': 100, 'limit': 100})
+
+
+def run_load(args):
+    recorder = Recorder()
+    options = None
+    if not args.chat:
+        options = Client(args.base_url, recorder, args.timeout).request('/filter-options')
+        if not options or not options.get('categories') or not options.get('locations'):
+            raise SystemExit(f"Could not read /filter-options from {args.base_url}")
+
+    stop = threading.Event()
+
+    def worker(number):
+        rng = random.Random(args.seed * 1000 + number)
+        client = Client(args.base_url, recorder, args.timeout)
+        user = ChatUser(client, rng) if args.chat else JobAppUser(client, options, rng)
+        while not stop.is_set():
+            user.run()
+            if args.think:
+                stop.wait(rng.expovariate(1 / args.think))
+
+    threads = [threading.Thread(target=worker, args=(number,), daemon=True) for number in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    # Samples from the warm-up (cold caches, connection set-up) are dropped
+    time.sleep(args.warmup)
+    recorder.recording = True
+    started = time.monotonic()
+    time.sleep(args.duration)
+    recorder.recording = False
+    elapsed = time.monotonic() - started
+    stop.set()
+    for thread in threads:
+        thread.join(args.timeout)
+    return recorder.summary(elapsed)
+
+
+def print_summary(summary):
+    print(f"{'endpoint':<24} {'requests':>9} {'errors':>7} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+    rows = sorted(summary['endpoints'].items())
+    if summary['overall']:
+        rows.append(('overall', summary['overall']))
+    for name, stats in rows:
+        print(f"{name:<24} {stats['requests']:>9} {stats['errors']:>7} {stats['per_second']:>8} "
+              f"{stats['p50_ms']:>8} {stats['p95_ms']:>8} {stats['p99_ms']:>8} {stats['max_ms']:>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:5000')
+    parser.add_argument('--concurrency', type=int, default=16, help="simulated users at a time")
+    parser.add_argument('--duration', type=float, default=60, help="measured seconds")
+    parser.add_argument('--warmup', type=float, default=10, help="seconds run before measuring")
+    parser.add_argument('--think', type=float, default=0, help="mean pause between visits, seconds")
+    parser.add_argument('--timeout', type=float, default=30)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chat', action='store_true', help="load /chat instead of the job API")
+    parser.add_argument('--output', help="also write the summary as JSON")
+    args = parser.parse_args()
+
+    summary = run_load(args)
+    summary['config'] = {key: value for key, value in vars(args).items() if key != 'output'}
+    print_summary(summary)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
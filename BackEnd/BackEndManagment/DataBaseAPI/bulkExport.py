@@ -0,0 +1,131 @@
+import logging
+import zlib
+
+import pymysql
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+STREAM_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'json': 'application/json'
+}
+
+_table_columns = {}
+
+
+def table_columns(connection, table):
+    columns = _table_columns.get(table)
+    if columns is None:
+        with connection.cursor() as cursor:
+            cursor.execute(f"SELECT * FROM `{table}` LIMIT 0")
+            columns = [column[0] for column in cursor.description]
+        _table_columns[table] = columns
+    return columns
+
+
+def select_list(connection, table, fields_param):
+    """Column list for ``?fields=``; unknown names raise ValueError instead of reaching SQL."""
+    if not fields_param:
+        return "*"
+    columns = table_columns(connection, table)
+    fields = [field.strip() for field in fields_param.split(',') if field.strip()]
+    unknown = [field for field in fields if field not in columns]
+    if unknown:
+        raise ValueError("Unknown fields: " + ", ".join(unknown))
+    return ", ".join(f"`{field}`" for field in fields)
+
+
+def choose_encoding(accept_encodings):
+    if brotli is not None and accept_encodings['br']:
+        return 'br'
+    if accept_encodings['gzip']:
+        return 'gzip'
+    return None
+
+
+class _GzipEncoder:
+    def __init__(self):
+        self._compressor = zlib.compressobj(6, zlib.DEFLATED, 31)
+
+    def chunk(self, data):
+        # Sync flush so each batch reaches the client instead of sitting in the compressor.
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder:
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=5)
+
+    def chunk(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class _IdentityEncoder:
+    def chunk(self, data):
+        return data
+
+    def finish(self):
+        return b''
+
+
+def make_encoder(encoding):
+    if encoding == 'br':
+        return _BrotliEncoder()
+    if encoding == 'gzip':
+        return _GzipEncoder()
+    return _IdentityEncoder()
+
+
+def stream_rows(connection, query, dumps, stream_format, encoding, batch_size=500):
+    """Yield encoded NDJSON or JSON-array chunks from an unbuffered cursor.
+
+    Only one batch of rows is held in memory at a time.  The connection is
+    returned to the pool when the result is exhausted, or discarded if the
+    client goes away mid-stream.  A failure mid-stream ends NDJSON with an
+    ``{"error": ...}`` line and is re-raised, so the server drops the
+    connection instead of completing the body as if every row had been sent.
+    """
+    encoder = make_encoder(encoding)
+    finished = False
+    # No ``with`` block: closing an unbuffered cursor drains the rest of the result.
+    cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+    try:
+        cursor.execute(query)
+        first = True
+        if stream_format == 'json':
+            yield encoder.chunk(b'[')
+        while True:
+            rows = cursor.fetchmany(batch_size)
+            if not rows:
+                break
+            if stream_format == 'json':
+                text = ("" if first else ",") + ",".join(dumps(row) for row in rows)
+            else:
+                text = "".join(dumps(row) + "\n" for row in rows)
+            first = False
+            yield encoder.chunk(text.encode('utf-8'))
+        if stream_format == 'json':
+            yield encoder.chunk(b']')
+        yield encoder.finish()
+        finished = True
+    except Exception as e:
+        logging.error("Error streaming %s: %s", query, e)
+        if stream_format == 'ndjson':
+            yield encoder.chunk((dumps({'error': str(e)}) + "\n").encode('utf-8'))
+        raise
+    finally:
+        if finished:
+            cursor.close()
+            connection.close()
+        else:
+            connection.discard()
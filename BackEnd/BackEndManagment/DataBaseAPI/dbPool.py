@@ -0,0 +1,194 @@
+import threading
+import time
+from collections import deque
+
+import pymysql
+
+
+class PoolTimeout(Exception):
+    pass
+
+
+class PooledConnection:
+    """Wraps a pymysql connection so close() hands it back to the pool."""
+
+    def __init__(self, pool, raw, created_at):
+        self._pool = pool
+        self._raw = raw
+        self._created_at = created_at
+        self._released = False
+
+    def __getattr__(self, name):
+        return getattr(self._raw, name)
+
+    def close(self):
+        if self._released:
+            return
+        self._released = True
+        self._pool._release(self._raw, self._created_at)
+
+    def discard(self):
+        # For connections left mid-result (e.g. an abandoned unbuffered cursor):
+        # drop the socket instead of draining it and return the slot to the pool.
+        if self._released:
+            return
+        try:
+            self._raw.close()
+        except Exception:
+            pass
+        self.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None:
+            try:
+                self._raw.rollback()
+            except Exception:
+                pass
+        self.close()
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of pymysql connections.
+
+    ``pool_size`` connections are kept idle between requests, up to
+    ``max_overflow`` extra ones are opened under bursts and closed again
+    when returned.  Borrowers wait at most ``timeout`` seconds for a slot.
+    """
+
+    def __init__(self, connect_kwargs, pool_size=5, max_overflow=5,
+                 recycle=3600, timeout=30, ping_interval=30):
+        self._connect_kwargs = connect_kwargs
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.recycle = recycle
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+
+        self._idle = deque()
+        self._open = 0
+        self._cond = threading.Condition()
+        self._stats = {
+            'checkouts': 0,
+            'waits': 0,
+            'wait_time': 0.0,
+            'timeouts': 0,
+            'connects': 0,
+            'reconnects': 0,
+            'recycled': 0,
+            'overflow_closed': 0,
+        }
+
+    def _connect(self):
+        raw = pymysql.connect(**self._connect_kwargs)
+        with self._cond:
+            self._stats['connects'] += 1
+        return raw, time.monotonic()
+
+    def _discard(self, raw):
+        try:
+            raw.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, raw, idle_since):
+        # Skip the round trip for connections that were used moments ago.
+        if time.monotonic() - idle_since < self.ping_interval:
+            return raw.open
+        try:
+            raw.ping(reconnect=False)
+            return True
+        except Exception:
+            return False
+
+    def get_connection(self):
+        deadline = time.monotonic() + self.timeout
+        waited = False
+        wait_started = None
+        with self._cond:
+            while True:
+                if self._idle:
+                    raw, created_at, idle_since = self._idle.pop()
+                    break
+                if self._open < self.pool_size + self.max_overflow:
+                    self._open += 1
+                    raw = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._stats['timeouts'] += 1
+                    raise PoolTimeout(
+                        "Timed out after %ss waiting for a database connection" % self.timeout
+                    )
+                if not waited:
+                    waited = True
+                    wait_started = time.monotonic()
+                    self._stats['waits'] += 1
+                self._cond.wait(remaining)
+            self._stats['checkouts'] += 1
+            if waited:
+                self._stats['wait_time'] += time.monotonic() - wait_started
+
+        try:
+            if raw is None:
+                raw, created_at = self._connect()
+            elif time.monotonic() - created_at > self.recycle:
+                self._discard(raw)
+                with self._cond:
+                    self._stats['recycled'] += 1
+                raw, created_at = self._connect()
+            elif not self._is_healthy(raw, idle_since):
+                self._discard(raw)
+                with self._cond:
+                    self._stats['reconnects'] += 1
+                raw, created_at = self._connect()
+        except Exception:
+            with self._cond:
+                self._open -= 1
+                self._cond.notify()
+            raise
+
+        return PooledConnection(self, raw, created_at)
+
+    def _release(self, raw, created_at):
+        reusable = raw.open
+        if reusable:
+            try:
+                # Drop any uncommitted work so the next borrower starts clean.
+                raw.rollback()
+            except Exception:
+                reusable = False
+
+        with self._cond:
+            if reusable and len(self._idle) < self.pool_size:
+                self._idle.append((raw, created_at, time.monotonic()))
+                raw = None
+            else:
+                self._open -= 1
+                if reusable:
+                    self._stats['overflow_closed'] += 1
+            self._cond.notify()
+
+        if raw is not None:
+            self._discard(raw)
+
+    def close_all(self):
+        with self._cond:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for raw, _, _ in idle:
+            self._discard(raw)
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats['open'] = self._open
+            stats['idle'] = len(self._idle)
+            stats['in_use'] = self._open - len(self._idle)
+        stats['pool_size'] = self.pool_size
+        stats['max_overflow'] = self.max_overflow
+        stats['wait_time'] = round(stats['wait_time'], 4)
+        return stats
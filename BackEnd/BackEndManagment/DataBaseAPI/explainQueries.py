@@ -0,0 +1,128 @@
+"""EXPLAIN plans and latencies for the job API's filter queries.
+
+Run once before and once after applying migrations/002_jobs_indexes.sql, then
+compare the two reports:
+
+    python explainQueries.py --host localhost --user root --database Vakances --output before.json
+    mysql Vakances < migrations/002_jobs_indexes.sql
+    python explainQueries.py --host localhost --user root --database Vakances --output after.json
+    python explainQueries.py --compare before.json after.json
+"""
+import argparse
+import json
+import statistics
+import time
+
+import pymysql
+
+from jobFilters import MATCH_MODES, filter_conditions
+
+
+def sample_values(cursor):
+    cursor.execute("SELECT category, COUNT(*) AS n FROM jobs WHERE category IS NOT NULL "
+                   "GROUP BY category ORDER BY n DESC LIMIT 1")
+    category = cursor.fetchone()['category']
+    cursor.execute("SELECT location, COUNT(*) AS n FROM jobs WHERE location IS NOT NULL "
+                   "GROUP BY location ORDER BY n DESC LIMIT 1")
+    location = cursor.fetchone()['location']
+    return category, location
+
+
+def build_queries(category, location):
+    """Queries the API issues for /all-jobs (page + count) and the home feed, per match mode."""
+    queries = []
+    for mode in MATCH_MODES:
+        # Prefix mode gets the first word, the way a type-ahead client would send it.
+        category_term = category.split(',')[0] if mode == 'prefix' else category
+        where_clause, params = filter_conditions([category_term], [location], None, None, mode)
+        queries.append((f"all-jobs page ({mode})",
+                        f"SELECT * FROM jobs WHERE {where_clause} ORDER BY id DESC LIMIT 10 OFFSET 0",
+                        params))
+        queries.append((f"all-jobs count ({mode})",
+                        f"SELECT COUNT(*) AS total FROM jobs WHERE {where_clause}",
+                        params))
+    where_clause, params = filter_conditions([], [], 1000, 3000, 'substring')
+    queries.append(("salary range",
+                    f"SELECT * FROM jobs WHERE {where_clause} ORDER BY id DESC LIMIT 10",
+                    params))
+    return queries
+
+
+def measure(cursor, sql, params, runs):
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        cursor.execute(sql, params)
+        cursor.fetchall()
+        timings.append((time.perf_counter() - started) * 1000)
+    timings.sort()
+    return {
+        'median_ms': round(statistics.median(timings), 3),
+        'p95_ms': round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 3)
+    }
+
+
+def run_report(args):
+    connection = pymysql.connect(host=args.host, user=args.user, password=args.password,
+                                 database=args.database, port=args.port,
+                                 cursorclass=pymysql.cursors.DictCursor)
+    report = []
+    try:
+        with connection.cursor() as cursor:
+            category, location = sample_values(cursor)
+            for name, sql, params in build_queries(category, location):
+                try:
+                    cursor.execute("EXPLAIN " + sql, params)
+                    plan = [{key: row.get(key) for key in ('table', 'type', 'key', 'rows', 'Extra')}
+                            for row in cursor.fetchall()]
+                    timing = measure(cursor, sql, params, args.runs)
+                except pymysql.MySQLError as e:
+                    # FULLTEXT queries fail before the migration; record that instead of aborting.
+                    plan, timing = [], {'error': str(e)}
+                report.append({'query': name, 'sql': sql, 'explain': plan, **timing})
+    finally:
+        connection.close()
+
+    for entry in report:
+        plan = "; ".join(f"type={p['type']} key={p['key']} rows={p['rows']}" for p in entry['explain'])
+        timing = entry.get('error') or f"median {entry['median_ms']} ms, p95 {entry['p95_ms']} ms"
+        print(f"{entry['query']:<28} {timing:<36} {plan}")
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, default=str)
+
+
+def compare(before_path, after_path):
+    with open(before_path, encoding='utf-8') as f:
+        before = {entry['query']: entry for entry in json.load(f)}
+    with open(after_path, encoding='utf-8') as f:
+        after = {entry['query']: entry for entry in json.load(f)}
+    print(f"{'query':<28} {'before ms':>10} {'after ms':>10} {'speedup':>8}  plan after")
+    for name, entry in after.items():
+        old = before.get(name, {})
+        old_ms, new_ms = old.get('median_ms'), entry.get('median_ms')
+        speedup = f"{old_ms / new_ms:.1f}x" if old_ms and new_ms else "-"
+        plan = "; ".join(f"{p['type']}/{p['key']}" for p in entry['explain'])
+        print(f"{name:<28} {str(old_ms or '-'):>10} {str(new_ms or '-'):>10} {speedup:>8}  {plan}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='localhost')
+    parser.add_argument('--port', type=int, default=3306)
+    parser.add_argument('--user', default='root')
+    parser.add_argument('--password', default='')
+    parser.add_argument('--database', default='Vakances')
+    parser.add_argument('--runs', type=int, default=50)
+    parser.add_argument('--output', help="write the report as JSON")
+    parser.add_argument('--compare', nargs=2, metavar=('BEFORE', 'AFTER'))
+    args = parser.parse_args()
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run_report(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+import functools
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from flask import Response, make_response, request
+
+
+class TTLCache:
+    """Small thread-safe LRU cache whose entries also expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries=256, ttl=60):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value, ttl=None):
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class DataGeneration:
+    """Version of the jobs data, re-read from MySQL at most every ``check_interval`` seconds.
+
+    ``read_generation`` returns any hashable value that changes whenever the
+    scraper commits (e.g. ``MAX(id)`` plus the ``data_version`` row).
+    """
+
+    def __init__(self, read_generation, check_interval=2):
+        self._read_generation = read_generation
+        self.check_interval = check_interval
+        self._value = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def current(self):
+        now = time.monotonic()
+        if self._value is None or now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if self._value is None or now - self._checked_at >= self.check_interval:
+                    self._value = self._read_generation()
+                    self._checked_at = time.monotonic()
+        return self._value
+
+
+class ResponseCache:
+    """Caches GET responses per (path, normalized query string, data generation).
+
+    Entries are dropped by LRU/TTL, and a new data generation makes every older
+    entry unreachable.  Each cached body carries an ETag, so clients sending
+    ``If-None-Match`` get a 304 instead of the payload.
+    """
+
+    def __init__(self, generation, max_entries=512, ttl=300):
+        self.generation = generation
+        self._cache = TTLCache(max_entries=max_entries, ttl=ttl)
+
+    @staticmethod
+    def normalized_query(list_params=()):
+        items = []
+        for key, value in request.args.items(multi=True):
+            if key in list_params:
+                value = ','.join(sorted(v.strip() for v in value.split(',') if v.strip()))
+            items.append((key, value))
+        return tuple(sorted(items))
+
+    def cached(self, list_params=(), bypass_params=()):
+        """Decorator for GET routes; ``list_params`` are comma lists whose order is irrelevant."""
+        def decorator(view):
+            @functools.wraps(view)
+            def wrapper(*args, **kwargs):
+                if any(param in request.args for param in bypass_params):
+                    return view(*args, **kwargs)
+                try:
+                    generation = self.generation.current()
+                except Exception as e:
+                    logging.error("Could not read data generation, skipping cache: %s", e)
+                    return view(*args, **kwargs)
+
+                key = (request.path, self.normalized_query(list_params), generation)
+                entry = self._cache.get(key)
+                if entry is None:
+                    response = make_response(view(*args, **kwargs))
+                    if response.status_code != 200 or response.is_streamed:
+                        return response
+                    body = response.get_data()
+                    entry = (body, response.mimetype, hashlib.sha1(body).hexdigest())
+                    self._cache.set(key, entry)
+
+                body, mimetype, etag = entry
+                if request.if_none_match.contains(etag):
+                    response = Response(status=304)
+                else:
+                    response = Response(body, status=200, mimetype=mimetype)
+                response.set_etag(etag)
+                response.headers['Cache-Control'] = 'no-cache'
+                return response
+            return wrapper
+        return decorator
+
+    def clear(self):
+        self._cache.clear()
+
+    def stats(self):
+        return self._cache.stats()
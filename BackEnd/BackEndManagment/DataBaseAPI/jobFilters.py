@@ -0,0 +1,57 @@
+import re
+
+
+MATCH_MODES = ('substring', 'prefix', 'exact', 'fulltext')
+
+
+def escape_like(value):
+    return value.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def match_condition(column, values, mode):
+    """SQL for "``column`` matches any of ``values``" under a ?match= mode.
+
+    'exact' and 'prefix' can use the (column, id) indexes from
+    migrations/002_jobs_indexes.sql, 'fulltext' uses the FULLTEXT index
+    (word-prefix matching), 'substring' is the original leading-wildcard LIKE.
+    """
+    if mode == 'exact':
+        return f"{column} IN (" + ", ".join(["%s"] * len(values)) + ")", list(values)
+    if mode == 'prefix':
+        clauses = [f"{column} LIKE %s" for _ in values]
+        return "(" + " OR ".join(clauses) + ")", [escape_like(value) + '%' for value in values]
+    if mode == 'fulltext':
+        clauses = []
+        params = []
+        for value in values:
+            words = re.findall(r'\w+', value)
+            if words:
+                clauses.append(f"MATCH({column}) AGAINST (%s IN BOOLEAN MODE)")
+                params.append(" ".join(f"+{word}*" for word in words))
+            else:
+                clauses.append(f"{column} LIKE CONCAT('%%', %s, '%%')")
+                params.append(value)
+        return "(" + " OR ".join(clauses) + ")", params
+    clauses = [f"{column} LIKE CONCAT('%%', %s, '%%')" for _ in values]
+    return "(" + " OR ".join(clauses) + ")", list(values)
+
+
+def filter_conditions(categories, locations, pay_from, pay_to, match_mode):
+    conditions = []
+    params = []
+    if categories:
+        condition, condition_params = match_condition('category', categories, match_mode)
+        conditions.append(condition)
+        params.extend(condition_params)
+    if locations:
+        condition, condition_params = match_condition('location', locations, match_mode)
+        conditions.append(condition)
+        params.extend(condition_params)
+    if pay_from is not None:
+        conditions.append("salary_min >= %s")
+        params.append(pay_from)
+    if pay_to is not None:
+        conditions.append("salary_max <= %s")
+        params.append(pay_to)
+    where_clause = " AND ".join(conditions) if conditions else "1"
+    return where_clause, params
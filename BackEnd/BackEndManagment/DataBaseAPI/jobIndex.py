@@ -0,0 +1,278 @@
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from array import array
+
+from searchIndex import TextIndex, fold, tokenize
+
+
+def collation_key(value):
+    """Compare/sort key approximating utf8mb4_general_ci: case, diacritics and trailing spaces ignored."""
+    return fold(value).rstrip(' ').upper()
+
+
+def like_matcher(term):
+    """Match the way ``column LIKE CONCAT('%', term, '%')`` does under a *_ci collation."""
+    pattern = []
+    escaped = False
+    for char in fold(term):
+        if escaped:
+            pattern.append(re.escape(char))
+            escaped = False
+        elif char == '\\':
+            escaped = True
+        elif char == '%':
+            pattern.append('.*')
+        elif char == '_':
+            pattern.append('.')
+        else:
+            pattern.append(re.escape(char))
+    regex = re.compile(''.join(pattern), re.DOTALL)
+    return lambda value: regex.search(fold(value)) is not None
+
+
+def value_matcher(term, mode='substring'):
+    """Python counterpart of ``match_condition`` in jobFilters.py."""
+    if mode == 'exact':
+        key = collation_key(term)
+        return lambda value: collation_key(value) == key
+    if mode == 'prefix':
+        folded = fold(term)
+        return lambda value: fold(value).startswith(folded)
+    if mode == 'fulltext':
+        words = tokenize(term)
+        if words:
+            def match(value):
+                value_words = tokenize(value)
+                return all(any(v.startswith(word) for v in value_words) for word in words)
+            return match
+    return like_matcher(term)
+
+
+def bitmap_from_positions(positions, size):
+    bits = bytearray((size + 7) // 8)
+    for pos in positions:
+        bits[pos >> 3] |= 1 << (pos & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def _salary(value):
+    return float('nan') if value is None else float(value)
+
+
+class IndexSnapshot:
+    """Immutable view of the jobs table.
+
+    Row positions follow ascending ``id``; every filter is a Python int used
+    as a bitmap over those positions, so AND/OR/COUNT are single big-int ops.
+    """
+
+    def __init__(self, rows, ids, salary_min, salary_max, categories, locations, text=None):
+        self.rows = rows
+        self.ids = ids
+        self.salary_min = salary_min
+        self.salary_max = salary_max
+        self.categories = categories
+        self.locations = locations
+        self.text = text if text is not None else TextIndex()
+        self.size = len(rows)
+        self.all_mask = (1 << self.size) - 1
+        self.watermark = ids[-1] if self.size else 0
+        self._salary_masks = {}
+        self._facet_groups = {}
+
+    def extended(self, new_rows):
+        rows = self.rows + new_rows
+        ids = array('q', self.ids)
+        salary_min = array('d', self.salary_min)
+        salary_max = array('d', self.salary_max)
+        categories = dict(self.categories)
+        locations = dict(self.locations)
+        for pos, row in enumerate(new_rows, start=self.size):
+            ids.append(row['id'])
+            salary_min.append(_salary(row.get('salary_min')))
+            salary_max.append(_salary(row.get('salary_max')))
+            bit = 1 << pos
+            categories[row.get('category')] = categories.get(row.get('category'), 0) | bit
+            locations[row.get('location')] = locations.get(row.get('location'), 0) | bit
+        text = self.text.extended(new_rows, self.size)
+        return IndexSnapshot(rows, ids, salary_min, salary_max, categories, locations, text)
+
+    def value_mask(self, postings, terms, mode='substring'):
+        # Terms are checked once per distinct value, not once per row.
+        matchers = [value_matcher(term, mode) for term in terms]
+        mask = 0
+        for value, bits in postings.items():
+            if value is not None and any(match(value) for match in matchers):
+                mask |= bits
+        return mask
+
+    def salary_mask(self, pay_from, pay_to):
+        if pay_from is None and pay_to is None:
+            return self.all_mask
+        key = (pay_from, pay_to)
+        mask = self._salary_masks.get(key)
+        if mask is None:
+            # NaN (SQL NULL) fails a comparison, matching SQL semantics; like the
+            # SQL WHERE clause, only the bounds that were given are checked.
+            if pay_to is None:
+                positions = [pos for pos, s_min in enumerate(self.salary_min) if s_min >= pay_from]
+            elif pay_from is None:
+                positions = [pos for pos, s_max in enumerate(self.salary_max) if s_max <= pay_to]
+            else:
+                positions = [
+                    pos for pos, (s_min, s_max) in enumerate(zip(self.salary_min, self.salary_max))
+                    if s_min >= pay_from and s_max <= pay_to
+                ]
+            mask = bitmap_from_positions(positions, self.size)
+            if len(self._salary_masks) > 64:
+                self._salary_masks.clear()
+            self._salary_masks[key] = mask
+        return mask
+
+    def filter_mask(self, categories=(), locations=(), pay_from=None, pay_to=None, mode='substring'):
+        mask = self.salary_mask(pay_from, pay_to)
+        if categories:
+            mask &= self.value_mask(self.categories, categories, mode)
+        if locations:
+            mask &= self.value_mask(self.locations, locations, mode)
+        return mask
+
+    def page(self, mask, limit, offset=0, before_id=None):
+        """Rows selected by ``mask`` in ``ORDER BY id DESC`` order."""
+        if before_id is not None:
+            mask &= (1 << bisect.bisect_left(self.ids, before_id)) - 1
+        rows = []
+        while mask and len(rows) < limit:
+            pos = mask.bit_length() - 1
+            mask ^= 1 << pos
+            if offset:
+                offset -= 1
+                continue
+            rows.append(self.rows[pos])
+        return rows, mask != 0
+
+    def search(self, query, mask, limit, offset=0, prefix=True):
+        """Rows selected by ``mask`` matching ``query``, best BM25 score first, and their count."""
+        scores = self.text.scores(query, None if mask == self.all_mask else mask, prefix)
+        # Equal scores list the newest row first, like the other listings
+        best = heapq.nlargest(offset + limit, scores.items(), key=lambda item: (item[1], item[0]))
+        rows = [dict(self.rows[pos], score=round(score, 3)) for pos, score in best[offset:]]
+        return rows, len(scores)
+
+    def facet_groups(self, postings):
+        """Values of ``postings`` grouped the way SQL ``GROUP BY`` groups them, in its order."""
+        groups = self._facet_groups.get(id(postings))
+        if groups is None:
+            by_key = {}
+            for value in postings:
+                by_key.setdefault(None if value is None else collation_key(value), []).append(value)
+            # MariaDB returns GROUP BY results ordered by the grouped column, NULL first.
+            groups = [by_key[key] for key in sorted(by_key, key=lambda key: (key is not None, key or ''))]
+            self._facet_groups[id(postings)] = groups
+        return groups
+
+    def facet_counts(self, postings, mask, name):
+        counts = []
+        for values in self.facet_groups(postings):
+            group_mask = 0
+            first_pos = None
+            first_value = None
+            for value in values:
+                bits = postings[value] & mask
+                if bits:
+                    group_mask |= bits
+                    # Each group is shown with the spelling of its first row
+                    pos = (bits & -bits).bit_length()
+                    if first_pos is None or pos < first_pos:
+                        first_pos, first_value = pos, value
+            if group_mask:
+                counts.append({name: first_value, 'count': group_mask.bit_count()})
+        return counts
+
+
+class JobIndex:
+    """In-process copy of the ``jobs`` table, refreshed by ``id`` watermark.
+
+    Rows with an id above the current watermark are appended every
+    ``refresh_interval`` seconds.  Rows whose filtered or searched columns
+    change in place are picked up by a full rebuild when the data version
+    changes; other updates and deleted rows by the rebuild every
+    ``rebuild_interval`` seconds.
+    """
+
+    def __init__(self, get_connection, refresh_interval=10, rebuild_interval=3600):
+        self._get_connection = get_connection
+        self.refresh_interval = refresh_interval
+        self.rebuild_interval = rebuild_interval
+        self._snapshot = None
+        self._checked_at = 0.0
+        self._built_at = 0.0
+        self._generation = None
+        self._version = None
+        self._refresh_lock = threading.Lock()
+
+    def _fetch_rows(self, after_id):
+        connection = self._get_connection()
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT * FROM jobs WHERE id > %s ORDER BY id", (after_id,))
+                return list(cursor.fetchall())
+        finally:
+            connection.close()
+
+    def rebuild(self):
+        started = time.monotonic()
+        empty = IndexSnapshot([], array('q'), array('d'), array('d'), {}, {})
+        snapshot = empty.extended(self._fetch_rows(0))
+        self._snapshot = snapshot
+        self._checked_at = self._built_at = time.monotonic()
+        logging.info("Job index built: %d rows in %.3fs", snapshot.size, self._checked_at - started)
+        return snapshot
+
+    def refresh(self):
+        snapshot = self._snapshot
+        new_rows = self._fetch_rows(snapshot.watermark)
+        if new_rows:
+            snapshot = snapshot.extended(new_rows)
+            self._snapshot = snapshot
+            logging.info("Job index added %d rows (watermark %d)", len(new_rows), snapshot.watermark)
+        self._checked_at = time.monotonic()
+        return snapshot
+
+    def ensure_fresh(self, generation=None, version=None):
+        """Return a current snapshot, refreshing it first when it is due.
+
+        A ``generation`` different from the last one seen (the scraper committed)
+        makes the refresh due immediately instead of after ``refresh_interval``.
+        A different ``version`` means existing rows changed, which the id
+        watermark cannot see, so the snapshot is rebuilt instead.
+        """
+        if self._snapshot is None:
+            with self._refresh_lock:
+                if self._snapshot is None:
+                    snapshot = self.rebuild()
+                    self._generation, self._version = generation, version
+                    return snapshot
+        now = time.monotonic()
+        stale_generation = generation != self._generation or version != self._version
+        if stale_generation or now - self._checked_at >= self.refresh_interval:
+            # A new generation must be visible before responses are cached under it, so
+            # those requests wait; interval refreshes let concurrent readers carry on.
+            if self._refresh_lock.acquire(blocking=stale_generation):
+                try:
+                    if (generation == self._generation and version == self._version
+                            and time.monotonic() - self._checked_at < self.refresh_interval):
+                        return self._snapshot
+                    if version != self._version or now - self._built_at >= self.rebuild_interval:
+                        snapshot = self.rebuild()
+                    else:
+                        snapshot = self.refresh()
+                    self._generation, self._version = generation, version
+                    return snapshot
+                finally:
+                    self._refresh_lock.release()
+        return self._snapshot
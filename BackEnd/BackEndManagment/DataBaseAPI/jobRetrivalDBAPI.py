@@ -1,13 +1,29 @@
+import base64
 import logging
-from flask import Flask, jsonify, request
+import os
+import sys
+import time
+from flask import Flask, Response, has_request_context, jsonify, request
 from flask_cors import CORS
 import pymysql
 
+from bulkExport import STREAM_FORMATS, choose_encoding, select_list, stream_rows
+from dbPool import ConnectionPool
+from jobCache import DataGeneration, ResponseCache, TTLCache
+from jobFilters import MATCH_MODES, escape_like, filter_conditions, match_condition
+from jobIndex import JobIndex
+from searchIndex import tokenize
+
+# Metrics shared with the chat API and the scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'Instrumentation'))
+import perfMetrics
+
 
 logging.basicConfig(level=logging.INFO)
 
 app = Flask(__name__)
 CORS(app)  
+perfMetrics.instrument_flask(app)
 
 
 db_config = {
@@ -17,19 +33,138 @@ db_config = {
     'database': ''
 }
 
+pool_config = {
+    'pool_size': 5,       # idle connections kept open between requests
+    'max_overflow': 5,    # extra connections allowed during bursts
+    'recycle': 3600,      # seconds before a connection is replaced
+    'timeout': 30,        # seconds to wait for a free connection
+    'ping_interval': 30   # idle seconds after which a borrowed connection is pinged
+}
+
+class TimedDictCursor(pymysql.cursors.DictCursor):
+    # Query time and row counts per route for /metrics
+    def execute(self, query, args=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, args)
+        finally:
+            label = request.endpoint if has_request_context() else 'background'
+            perfMetrics.record_query(label, time.perf_counter() - started, max(self.rowcount, 0))
+
+
+db_pool = ConnectionPool(
+    connect_kwargs={
+        'host': db_config['host'],
+        'user': db_config['user'],
+        'password': db_config['password'],
+        'database': db_config['database'],
+        'cursorclass': TimedDictCursor
+    },
+    **pool_config
+)
+
 def get_db_connection(): # Slack Nosūtīti ja nepieciešams
-    connection = pymysql.connect(
-        host=db_config['host'],
-        user=db_config['user'],
-        password=db_config['password'],
-        database=db_config['database'],
-        cursorclass=pymysql.cursors.DictCursor
-    )
-    return connection
+    # Borrowed from the pool; connection.close() returns it instead of disconnecting.
+    return db_pool.get_connection()
+
+
+def read_data_generation():
+    # MAX(id) catches inserts; the 'jobs' data_version is bumped when existing rows change
+    # in a filtered or searched column (re-crawled listings with a new title, company,
+    # location or salary; salary backfills) and 'job_summaries' when the summary tables do.
+    connection = get_db_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT (SELECT MAX(id) FROM jobs) AS max_id, "
+                "(SELECT version FROM data_version WHERE name = 'jobs') AS version, "
+                "(SELECT version FROM data_version WHERE name = 'job_summaries') AS summaries_version"
+            )
+            row = cursor.fetchone()
+            return (row['max_id'], row['version'], row['summaries_version'])
+    finally:
+        connection.close()
+
+
+data_generation = DataGeneration(read_data_generation, check_interval=2)
+
+cache_config = {
+    'max_entries': 1024,
+    'ttl': 300  # seconds; a new data generation invalidates entries sooner
+}
+
+response_cache = ResponseCache(data_generation, **cache_config)
+
+
+# COUNT(*) for a filter set is reused for a short while instead of rescanning on every page.
+count_cache = TTLCache(max_entries=512, ttl=30)
+
+# Home screen feeds keyed by (categories, location); short-lived so new listings show up quickly.
+feed_cache = TTLCache(max_entries=256, ttl=15)
+
+
+index_config = {
+    'enabled': True,
+    'refresh_interval': 10,   # seconds between checks for rows above the id watermark
+    'rebuild_interval': 3600  # seconds between full reloads (picks up deletes)
+}
+
+job_index = JobIndex(
+    get_db_connection,
+    refresh_interval=index_config['refresh_interval'],
+    rebuild_interval=index_config['rebuild_interval']
+)
+
+
+def refresh_job_index():
+    generation = data_generation.current()
+    # Rows changed in place bump the version, which needs a full rebuild of the index
+    return job_index.ensure_fresh(generation, version=generation[1])
+
+
+if index_config['enabled']:
+    try:
+        refresh_job_index()
+    except Exception as e:
+        logging.error("Could not build job index at startup: %s", e)
+
+
+def get_ready_index():
+    # Returns None when the index is off or unavailable so routes fall back to SQL.
+    if not index_config['enabled']:
+        return None
+    try:
+        with perfMetrics.stage('index_refresh'):
+            return refresh_job_index()
+    except Exception as e:
+        logging.error("Job index unavailable, falling back to SQL: %s", e)
+        return None
+
+
+@app.route('/pool-stats', methods=['GET'])
+def get_pool_stats():
+    return jsonify(db_pool.stats())
+
+
+@app.route('/cache-stats', methods=['GET'])
+def get_cache_stats():
+    return jsonify({
+        'responses': response_cache.stats(),
+        'counts': count_cache.stats(),
+        'feeds': feed_cache.stats()
+    })
 
 
 @app.route('/filter-options', methods=['GET'])
+@response_cache.cached()
 def get_filter_options():
+    index = get_ready_index()
+    if index is not None:
+        return jsonify({
+            'locations': list(index.locations),
+            'categories': list(index.categories)
+        })
+
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
@@ -45,7 +180,42 @@ def get_filter_options():
         connection.close()
 
 
+def encode_cursor(last_id):
+    return base64.urlsafe_b64encode(f"id:{last_id}".encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor_param):
+    padded = cursor_param + '=' * (-len(cursor_param) % 4)
+    prefix, _, value = base64.urlsafe_b64decode(padded.encode()).decode().partition(':')
+    if prefix != 'id':
+        raise ValueError("Malformed cursor")
+    return int(value)
+
+
+def get_match_mode():
+    match_mode = request.args.get('match', default='substring')
+    if match_mode not in MATCH_MODES:
+        raise ValueError("match must be one of " + ", ".join(MATCH_MODES))
+    return match_mode
+
+
+def count_jobs(cursor, where_clause, params, mode):
+    # 'exact' always counts, 'cached' reuses a recent count for the same filters, 'none' skips it.
+    if mode == 'none':
+        return None
+    cache_key = (where_clause, tuple(params), data_generation.current())
+    if mode == 'cached':
+        total = count_cache.get(cache_key)
+        if total is not None:
+            return total
+    cursor.execute(f"SELECT COUNT(*) AS total FROM jobs WHERE {where_clause}", tuple(params))
+    total = cursor.fetchone()['total']
+    count_cache.set(cache_key, total)
+    return total
+
+
 @app.route('/all-jobs', methods=['GET'])
+@response_cache.cached(list_params=('categories', 'location'))
 def get_all_jobs():
     categories_param = request.args.get('categories', '')
     locations_param = request.args.get('location', '')
@@ -53,43 +223,80 @@ def get_all_jobs():
     pay_to = request.args.get('payTo', type=float)
     page = request.args.get('page', default=1, type=int)
     limit = request.args.get('limit', default=10, type=int)
+    if page < 1 or limit < 1:
+        return jsonify({'error': 'page and limit must be at least 1'}), 400
+    limit = min(limit, 100)
     offset = (page - 1) * limit
+    # Passing ?cursor= (empty for the first page) switches to keyset pagination.
+    cursor_param = request.args.get('cursor')
+    total_mode = request.args.get('total', default='cached')
+    if total_mode not in ('exact', 'cached', 'none'):
+        return jsonify({'error': "total must be one of exact, cached, none"}), 400
+    try:
+        match_mode = get_match_mode()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    before_id = None
+    if cursor_param:
+        try:
+            before_id = decode_cursor(cursor_param)
+        except (ValueError, UnicodeDecodeError):
+            return jsonify({'error': 'Invalid cursor'}), 400
 
     
     categories = [cat.strip() for cat in categories_param.split(',') if cat.strip()]
     locations = [loc.strip() for loc in locations_param.split(',') if loc.strip()]
 
+    index = get_ready_index()
+    if index is not None:
+        mask = index.filter_mask(categories, locations, pay_from, pay_to, match_mode)
+        total = mask.bit_count() if total_mode != 'none' else None
+        if cursor_param is not None:
+            jobs, has_more = index.page(mask, limit, before_id=before_id)
+            return jsonify({
+                'jobs': jobs,
+                'total': total,
+                'limit': limit,
+                'next_cursor': encode_cursor(jobs[-1]['id']) if has_more and jobs else None
+            })
+        jobs, _ = index.page(mask, limit, offset=offset)
+        return jsonify({
+            'jobs': jobs,
+            'total': total,
+            'page': page,
+            'limit': limit,
+            'pages': (total + limit - 1) // limit if total is not None else None
+        })
+
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
-            conditions = []
-            params = []
-
-           
-            if categories:
-                category_clauses = ["category LIKE CONCAT('%%', %s, '%%')" for _ in categories]
-                conditions.append("(" + " OR ".join(category_clauses) + ")")
-                params.extend(categories)
-
-            
-            if locations:
-                location_clauses = ["location LIKE CONCAT('%%', %s, '%%')" for _ in locations]
-                conditions.append("(" + " OR ".join(location_clauses) + ")")
-                params.extend(locations)
-
-            
-            if pay_from is not None:
-                conditions.append("salary_min >= %s")
-                params.append(pay_from)
-            if pay_to is not None:
-                conditions.append("salary_max <= %s")
-                params.append(pay_to)
-
-            
-            where_clause = " AND ".join(conditions) if conditions else "1"
+            where_clause, params = filter_conditions(categories, locations, pay_from, pay_to, match_mode)
             logging.info("WHERE clause: %s", where_clause.replace('%', '%%'))
             logging.info("Query params: %s", params)
 
+            if cursor_param is not None:
+                page_clause = where_clause
+                page_params = list(params)
+                if before_id is not None:
+                    page_clause += " AND id < %s"
+                    page_params.append(before_id)
+                # Fetch one extra row to learn whether another page exists.
+                query = f"SELECT * FROM jobs WHERE {page_clause} ORDER BY id DESC LIMIT %s"
+                cursor.execute(query, tuple(page_params + [limit + 1]))
+                jobs = cursor.fetchall()
+                has_more = len(jobs) > limit
+                jobs = jobs[:limit]
+                total = count_jobs(cursor, where_clause, params, total_mode)
+
+                return jsonify({
+                    'jobs': jobs,
+                    'total': total,
+                    'limit': limit,
+                    'next_cursor': encode_cursor(jobs[-1]['id']) if has_more and jobs else None
+                })
+
             
             query = f"SELECT * FROM jobs WHERE {where_clause} ORDER BY id DESC LIMIT %s OFFSET %s"
             params_with_limit = params + [limit, offset]
@@ -97,16 +304,14 @@ def get_all_jobs():
             jobs = cursor.fetchall()
 
             
-            count_query = f"SELECT COUNT(*) AS total FROM jobs WHERE {where_clause}"
-            cursor.execute(count_query, tuple(params))
-            total = cursor.fetchone()['total']
+            total = count_jobs(cursor, where_clause, params, total_mode)
 
             return jsonify({
                 'jobs': jobs,
                 'total': total,
                 'page': page,
                 'limit': limit,
-                'pages': (total + limit - 1) // limit
+                'pages': (total + limit - 1) // limit if total is not None else None
             })
 
     except Exception as e:
@@ -117,6 +322,7 @@ def get_all_jobs():
 
 
 @app.route('/filter-counts', methods=['GET'])
+@response_cache.cached(list_params=('categories', 'location'))
 def get_filter_counts():
     
     categories_param = request.args.get('categories', '')
@@ -127,42 +333,35 @@ def get_filter_counts():
     
     selected_categories = [cat.strip() for cat in categories_param.split(',') if cat.strip()]
     selected_locations = [loc.strip() for loc in locations_param.split(',') if loc.strip()]
+    try:
+        match_mode = get_match_mode()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    index = get_ready_index()
+    if index is not None:
+        # Each facet is counted under every filter except its own, as the SQL below does.
+        salary_mask = index.salary_mask(pay_from, pay_to)
+        category_mask = salary_mask
+        if selected_locations:
+            category_mask &= index.value_mask(index.locations, selected_locations, match_mode)
+        location_mask = salary_mask
+        if selected_categories:
+            location_mask &= index.value_mask(index.categories, selected_categories, match_mode)
+        return jsonify({
+            'categoryCounts': index.facet_counts(index.categories, category_mask, 'category'),
+            'locationCounts': index.facet_counts(index.locations, location_mask, 'location')
+        })
 
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
-            
-            conditions = []
-            params = []
-            if selected_locations:
-                location_clauses = ["location LIKE CONCAT('%%', %s, '%%')" for _ in selected_locations]
-                conditions.append("(" + " OR ".join(location_clauses) + ")")
-                params.extend(selected_locations)
-            if pay_from is not None:
-                conditions.append("salary_min >= %s")
-                params.append(pay_from)
-            if pay_to is not None:
-                conditions.append("salary_max <= %s")
-                params.append(pay_to)
-            where_clause = " AND ".join(conditions) if conditions else "1"
+            where_clause, params = filter_conditions([], selected_locations, pay_from, pay_to, match_mode)
             category_query = f"SELECT category, COUNT(*) as count FROM jobs WHERE {where_clause} GROUP BY category"
             cursor.execute(category_query, tuple(params))
             category_counts = cursor.fetchall()
 
-            
-            conditions = []
-            params = []
-            if selected_categories:
-                category_clauses = ["category LIKE CONCAT('%%', %s, '%%')" for _ in selected_categories]
-                conditions.append("(" + " OR ".join(category_clauses) + ")")
-                params.extend(selected_categories)
-            if pay_from is not None:
-                conditions.append("salary_min >= %s")
-                params.append(pay_from)
-            if pay_to is not None:
-                conditions.append("salary_max <= %s")
-                params.append(pay_to)
-            where_clause = " AND ".join(conditions) if conditions else "1"
+            where_clause, params = filter_conditions(selected_categories, [], pay_from, pay_to, match_mode)
             location_query = f"SELECT location, COUNT(*) as count FROM jobs WHERE {where_clause} GROUP BY location"
             cursor.execute(location_query, tuple(params))
             location_counts = cursor.fetchall()
@@ -179,67 +378,68 @@ def get_filter_counts():
 
 
 @app.route('/jobs', methods=['GET'])
+@response_cache.cached(list_params=('categories',))
 def get_jobs():
     categories_param = request.args.get('categories', '')
     location = request.args.get('location', '').strip()
     categories = [cat.strip() for cat in categories_param.split(',') if cat.strip()]
     logging.info("Received categories: %s", categories)
     logging.info("Received location: %s", location)
+    try:
+        match_mode = get_match_mode()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    cache_key = (tuple(sorted(categories)), location, match_mode, data_generation.current())
+    cached = feed_cache.get(cache_key)
+    if cached is not None:
+        return jsonify(cached)
 
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
-            
-            recommended = []
-            if categories and location:
-                conditions = []
-                params = []
-                for cat in categories:
-                    conditions.append("category LIKE CONCAT('%%', %s, '%%')")
-                    params.append(cat)
-                category_condition = "(" + " OR ".join(conditions) + ")"
-                query = f"SELECT * FROM jobs WHERE {category_condition} AND location = %s ORDER BY id DESC LIMIT 5"
-                all_params = params + [location]
-                logging.info("Query with both category and location: %s", query)
-                logging.info("Params: %s", all_params)
-                cursor.execute(query, tuple(all_params))
-                recommended = cursor.fetchall()
-                if not recommended:
-                    logging.info("No results with both filters; trying category only.")
-                    query = f"SELECT * FROM jobs WHERE {category_condition} ORDER BY id DESC LIMIT 5"
-                    cursor.execute(query, tuple(params))
-                    recommended = cursor.fetchall()
-            elif categories:
-                conditions = []
-                params = []
-                for cat in categories:
-                    conditions.append("category LIKE CONCAT('%%', %s, '%%')")
-                    params.append(cat)
-                category_condition = "(" + " OR ".join(conditions) + ")"
-                query = f"SELECT * FROM jobs WHERE {category_condition} ORDER BY id DESC LIMIT 5"
-                cursor.execute(query, tuple(params))
-                recommended = cursor.fetchall()
-
-           
-            if not recommended:
-                cursor.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 5")
-                recommended = cursor.fetchall()
-
-           
-            cursor.execute("SELECT * FROM jobs ORDER BY id DESC LIMIT 5")
-            newest = cursor.fetchall()
-
-           
-            local_jobs = []
+            # Every list the home screen may need is fetched in one UNION ALL round trip;
+            # the newest list doubles as the global fallback for recommendations.
+            feeds = []
+            params = []
+            if categories:
+                category_condition, category_params = match_condition('category', categories, match_mode)
+                if location:
+                    feeds.append(('both', f"{category_condition} AND location = %s"))
+                    params.extend(category_params + [location])
+                feeds.append(('category', category_condition))
+                params.extend(category_params)
+            feeds.append(('newest', "1"))
             if location:
-                cursor.execute("SELECT * FROM jobs WHERE location = %s ORDER BY id DESC LIMIT 5", (location,))
-                local_jobs = cursor.fetchall()
-
-            return jsonify({
+                feeds.append(('local', "location = %s"))
+                params.append(location)
+
+            query = " UNION ALL ".join(
+                f"(SELECT '{feed}' AS feed, jobs.* FROM jobs WHERE {condition} ORDER BY id DESC LIMIT 5)"
+                for feed, condition in feeds
+            )
+            logging.info("Home feed query: %s", query)
+            logging.info("Params: %s", params)
+            cursor.execute(query, tuple(params))
+
+            results = {feed: [] for feed, _ in feeds}
+            for row in cursor.fetchall():
+                results[row.pop('feed')].append(row)
+            # UNION ALL does not promise to keep each branch's ORDER BY in the combined result.
+            for rows in results.values():
+                rows.sort(key=lambda row: row['id'], reverse=True)
+
+            recommended = results.get('both') or results.get('category') or results['newest']
+            if categories and location and not results.get('both'):
+                logging.info("No results with both filters; using category only.")
+
+            reply = {
                 'recommended': recommended,
-                'newest': newest,
-                'local': local_jobs,
-            })
+                'newest': results['newest'],
+                'local': results.get('local', []),
+            }
+            feed_cache.set(cache_key, reply)
+            return jsonify(reply)
 
     except Exception as e:
         logging.error("Error fetching jobs: %s", e)
@@ -247,33 +447,158 @@ def get_jobs():
     finally:
         connection.close()
 
-@app.route('/monthly_jobs', methods=['GET'])
-def get_monthly_jobs():
+@app.route('/search', methods=['GET'])
+@response_cache.cached(list_params=('categories', 'location'))
+def search_jobs():
+    """Jobs whose title, company or category contain every word of ``?q=``, best match first.
+
+    The last word also matches as a prefix (``?prefix=0`` turns that off) and
+    diacritics are ignored.  Takes the same filters as /all-jobs, paged with
+    ``?limit=`` and ``?offset=``.
+    """
+    query = request.args.get('q', '').strip()
+    if not query:
+        return jsonify({'error': 'No search query provided'}), 400
+    categories_param = request.args.get('categories', '')
+    locations_param = request.args.get('location', '')
+    pay_from = request.args.get('payFrom', type=float)
+    pay_to = request.args.get('payTo', type=float)
+    limit = min(max(request.args.get('limit', default=10, type=int), 1), 100)
+    offset = max(request.args.get('offset', default=0, type=int), 0)
+    prefix = request.args.get('prefix', default='1') != '0'
+    try:
+        match_mode = get_match_mode()
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+    categories = [cat.strip() for cat in categories_param.split(',') if cat.strip()]
+    locations = [loc.strip() for loc in locations_param.split(',') if loc.strip()]
+
+    index = get_ready_index()
+    if index is not None:
+        with perfMetrics.stage('search'):
+            mask = index.filter_mask(categories, locations, pay_from, pay_to, match_mode)
+            jobs, total = index.search(query, mask, limit, offset, prefix)
+        return jsonify({'jobs': jobs, 'total': total, 'limit': limit, 'offset': offset, 'ranked': True})
+
+    # Without the index: unranked LIKE matching, newest first (the *_ci collation ignores diacritics)
+    words = tokenize(query)
+    if not words:
+        return jsonify({'jobs': [], 'total': 0, 'limit': limit, 'offset': offset, 'ranked': False})
     connection = get_db_connection()
     try:
         with connection.cursor() as cursor:
-            cursor.execute("SELECT * FROM monthly_jobs")
-            rows = cursor.fetchall()
-            return jsonify(rows)
+            where_clause, params = filter_conditions(categories, locations, pay_from, pay_to, match_mode)
+            for word in words:
+                where_clause += " AND CONCAT_WS(' ', title, company, category) LIKE %s"
+                params.append('%' + escape_like(word) + '%')
+            cursor.execute(f"SELECT * FROM jobs WHERE {where_clause} ORDER BY id DESC LIMIT %s OFFSET %s",
+                           tuple(params + [limit, offset]))
+            jobs = cursor.fetchall()
+            total = count_jobs(cursor, where_clause, params, 'cached')
+            return jsonify({'jobs': jobs, 'total': total, 'limit': limit, 'offset': offset, 'ranked': False})
     except Exception as e:
-        logging.error("Error fetching monthly jobs: %s", e)
+        logging.error("Error searching jobs: %s", e)
         return jsonify({'error': str(e)}), 500
     finally:
         connection.close()
 
-@app.route('/hourly_jobs', methods=['GET'])
-def get_hourly_jobs():
+# Dimensions of job_salary_summary (migrations/005_salary_summaries.sql)
+SUMMARY_DIMENSIONS = ('category', 'location', 'salary_type')
+
+
+@app.route('/salary-summary', methods=['GET'])
+@response_cache.cached()
+def get_salary_summary():
+    """Precomputed job counts and monthly salaries per ``?by=category|location|salary_type``.
+
+    ``?histogram=1`` adds the salary buckets.  Reads the summary tables the
+    scraper keeps up to date, so the cost does not grow with the jobs table.
+    """
+    dimension = request.args.get('by', default='category')
+    if dimension not in SUMMARY_DIMENSIONS:
+        return jsonify({'error': "by must be one of " + ", ".join(SUMMARY_DIMENSIONS)}), 400
+
+    connection = get_db_connection()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT value, jobs, salary_jobs, monthly_min, monthly_max, avg_monthly_min, avg_monthly_max "
+                "FROM job_salary_summary WHERE dimension = %s ORDER BY jobs DESC",
+                (dimension,)
+            )
+            reply = {'by': dimension, 'summary': cursor.fetchall()}
+            if request.args.get('histogram') == '1':
+                cursor.execute(
+                    "SELECT value, bucket_from, bucket_to, jobs FROM job_salary_histogram "
+                    "WHERE dimension = %s ORDER BY value, bucket_from",
+                    (dimension,)
+                )
+                reply['histogram'] = cursor.fetchall()
+            return jsonify(reply)
+    except Exception as e:
+        logging.error("Error fetching salary summary: %s", e)
+        return jsonify({'error': str(e)}), 500
+    finally:
+        connection.close()
+
+def export_table(table):
+    """Rows of ``table``, optionally projected with ``?fields=`` and streamed with ``?stream=``.
+
+    ``?stream=ndjson`` or ``?stream=json`` sends rows from an unbuffered cursor in
+    batches (gzip/brotli when the client accepts it), so memory stays flat
+    regardless of table size.  Without it the whole result is returned at once.
+    """
+    stream_format = request.args.get('stream')
+    if stream_format is not None and stream_format not in STREAM_FORMATS:
+        return jsonify({'error': "stream must be one of " + ", ".join(STREAM_FORMATS)}), 400
+
     connection = get_db_connection()
+    try:
+        columns = select_list(connection, table, request.args.get('fields', ''))
+    except ValueError as e:
+        connection.close()
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        connection.close()
+        logging.error("Error reading columns of %s: %s", table, e)
+        return jsonify({'error': str(e)}), 500
+    query = f"SELECT {columns} FROM `{table}`"
+
+    if stream_format is not None:
+        encoding = choose_encoding(request.accept_encodings)
+        response = Response(
+            stream_rows(connection, query, app.json.dumps, stream_format, encoding),
+            mimetype=STREAM_FORMATS[stream_format]
+        )
+        if encoding:
+            response.headers['Content-Encoding'] = encoding
+        response.headers['Vary'] = 'Accept-Encoding'
+        # Releases the connection even if the body is never iterated (no-op once it has been).
+        response.call_on_close(connection.discard)
+        return response
+
     try:
         with connection.cursor() as cursor:
-            cursor.execute("SELECT * FROM hourly_jobs")
+            cursor.execute(query)
             rows = cursor.fetchall()
             return jsonify(rows)
     except Exception as e:
-        logging.error("Error fetching hourly jobs: %s", e)
+        logging.error("Error fetching %s: %s", table, e)
         return jsonify({'error': str(e)}), 500
     finally:
         connection.close()
 
+
+@app.route('/monthly_jobs', methods=['GET'])
+@response_cache.cached(bypass_params=('stream',))
+def get_monthly_jobs():
+    return export_table('monthly_jobs')
+
+@app.route('/hourly_jobs', methods=['GET'])
+@response_cache.cached(bypass_params=('stream',))
+def get_hourly_jobs():
+    return export_table('hourly_jobs')
+
 if __name__ == '__main__':
     app.run(debug=True, host='0.0.0.0', port=5000)
@@ -0,0 +1,14 @@
+-- Version counters read by the job API, together with MAX(id), to invalidate
+-- cached responses.  'jobs' is bumped whenever existing rows change in a column
+-- the API filters or searches on (a batch with changed known listings, a salary
+-- backfill), which also makes the API rebuild its in-process job index; new
+-- rows only raise MAX(id).
+
+CREATE TABLE IF NOT EXISTS `data_version` (
+  `name` varchar(64) NOT NULL,
+  `version` bigint(20) NOT NULL DEFAULT 0,
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT IGNORE INTO `data_version` (`name`, `version`) VALUES ('jobs', 0);
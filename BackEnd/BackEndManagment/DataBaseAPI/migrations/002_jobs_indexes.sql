@@ -0,0 +1,28 @@
+-- Index-friendly filter columns for the job API.
+--
+-- TEXT columns cannot carry ordinary secondary indexes, so the filtered columns
+-- become VARCHARs (title and company are not indexed and stay TEXT).  191
+-- characters keeps utf8mb4 keys within 767 bytes, so the indexes also build on
+-- COMPACT row format; the longest category name is far shorter.
+--
+-- With these indexes ?match=exact and ?match=prefix filters become range scans
+-- on (category, id) / (location, id), which also deliver rows already in
+-- ORDER BY id DESC order per value.  ?match=fulltext uses the FULLTEXT indexes
+-- (word-prefix matching).  MariaDB has no ngram parser; on MySQL 8 add
+-- "WITH PARSER ngram" to the FULLTEXT keys for true substring behaviour.
+-- The default ?match=substring keeps the original LIKE '%..%' semantics.
+
+ALTER TABLE `jobs`
+  MODIFY `category` varchar(191) DEFAULT NULL,
+  MODIFY `location` varchar(191) DEFAULT NULL;
+
+ALTER TABLE `jobs`
+  ADD KEY `idx_jobs_category_id` (`category`, `id`),
+  ADD KEY `idx_jobs_location_id` (`location`, `id`),
+  ADD KEY `idx_jobs_salary` (`salary_min`, `salary_max`);
+
+ALTER TABLE `jobs`
+  ADD FULLTEXT KEY `ft_jobs_category` (`category`),
+  ADD FULLTEXT KEY `ft_jobs_location` (`location`);
+
+ANALYZE TABLE `jobs`;
@@ -0,0 +1,13 @@
+-- One row per listing URL, so the scraper can upsert instead of inserting duplicates.
+--
+-- `url` is TEXT and too long to index directly; a stored SHA1 of it carries the
+-- unique key.  Existing duplicates are removed first, keeping the newest row.
+
+ALTER TABLE `jobs`
+  ADD COLUMN `url_hash` char(40) AS (SHA1(`url`)) STORED;
+
+DELETE older FROM `jobs` AS older
+  JOIN `jobs` AS newer ON newer.`url_hash` = older.`url_hash` AND newer.`id` > older.`id`;
+
+ALTER TABLE `jobs`
+  ADD UNIQUE KEY `uq_jobs_url_hash` (`url_hash`);
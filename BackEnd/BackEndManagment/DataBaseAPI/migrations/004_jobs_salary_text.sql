@@ -0,0 +1,14 @@
+-- Keeps the scraped salary text so salary type and equivalents can be
+-- recomputed in the database (scraperCli.py --backfill-salaries) after a rule
+-- change, without re-scraping.
+--
+-- `calculated` = 1 marks rows normalized by WebScaper/salaryNormalizer.py;
+-- the index lets the backfill walk the remaining rows in id order.
+
+ALTER TABLE `jobs`
+  ADD COLUMN `salary_text` varchar(255) DEFAULT NULL AFTER `salary_max`;
+
+UPDATE `jobs` SET `calculated` = 0 WHERE `calculated` IS NULL;
+
+ALTER TABLE `jobs`
+  ADD KEY `idx_jobs_calculated` (`calculated`, `id`);
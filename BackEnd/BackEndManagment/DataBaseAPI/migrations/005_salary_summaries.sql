@@ -0,0 +1,43 @@
+-- Precomputed salary aggregates per category, location and salary type, so
+-- analytics questions (average pay per category, jobs per city, salary
+-- ranges) read a few hundred rows instead of grouping the whole jobs table.
+--
+-- Salaries are the monthly equivalents (hourly rates x 160).  The scraper
+-- (WebScaper/salarySummary.py) adds each committed batch of new rows, tracked
+-- by the id watermark in job_summary_state; scraperCli.py --rebuild-summaries
+-- recomputes everything, e.g. after salary rules change or rows are deleted.
+
+CREATE TABLE IF NOT EXISTS `job_salary_summary` (
+  `dimension` varchar(16) NOT NULL COMMENT 'category, location or salary_type',
+  `value` varchar(191) NOT NULL COMMENT 'value of that jobs column ('''' for NULL)',
+  `jobs` int(11) NOT NULL DEFAULT 0 COMMENT 'number of jobs',
+  `salary_jobs` int(11) NOT NULL DEFAULT 0 COMMENT 'jobs with a salary',
+  `monthly_min` decimal(10,2) DEFAULT NULL COMMENT 'lowest monthly_equiv_min',
+  `monthly_max` decimal(10,2) DEFAULT NULL COMMENT 'highest monthly_equiv_max',
+  `monthly_min_sum` decimal(16,2) NOT NULL DEFAULT 0,
+  `monthly_max_sum` decimal(16,2) NOT NULL DEFAULT 0,
+  `avg_monthly_min` decimal(10,2) AS (IF(`salary_jobs` > 0, `monthly_min_sum` / `salary_jobs`, NULL)) VIRTUAL COMMENT 'average monthly_equiv_min',
+  `avg_monthly_max` decimal(10,2) AS (IF(`salary_jobs` > 0, `monthly_max_sum` / `salary_jobs`, NULL)) VIRTUAL COMMENT 'average monthly_equiv_max',
+  `updated_at` timestamp NOT NULL DEFAULT current_timestamp() ON UPDATE current_timestamp(),
+  PRIMARY KEY (`dimension`, `value`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE IF NOT EXISTS `job_salary_histogram` (
+  `dimension` varchar(16) NOT NULL COMMENT 'category, location or salary_type',
+  `value` varchar(191) NOT NULL COMMENT 'value of that jobs column ('''' for NULL)',
+  `bucket_from` decimal(10,2) NOT NULL COMMENT 'monthly_equiv_max >= bucket_from',
+  `bucket_to` decimal(10,2) NOT NULL COMMENT 'monthly_equiv_max < bucket_to',
+  `jobs` int(11) NOT NULL DEFAULT 0,
+  PRIMARY KEY (`dimension`, `value`, `bucket_from`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+CREATE TABLE IF NOT EXISTS `job_summary_state` (
+  `name` varchar(64) NOT NULL,
+  `last_id` int(11) NOT NULL DEFAULT 0 COMMENT 'highest jobs.id included in the summaries',
+  PRIMARY KEY (`name`)
+) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci;
+
+INSERT IGNORE INTO `job_summary_state` (`name`, `last_id`) VALUES ('salary_summary', 0);
+
+-- Bumped with every summary update so the job API drops cached /salary-summary responses
+INSERT IGNORE INTO `data_version` (`name`, `version`) VALUES ('job_summaries', 0);
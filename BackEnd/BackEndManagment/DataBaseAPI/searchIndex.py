@@ -0,0 +1,136 @@
+import bisect
+import math
+import re
+import unicodedata
+from array import array
+
+
+# Field weights for BM25F-style term frequencies: a word in the title counts double
+SEARCH_FIELDS = {'title': 2.0, 'company': 1.5, 'category': 1.0}
+
+BM25 = {'k1': 1.2, 'b': 0.75}
+
+# The last query word is expanded to at most this many indexed words, the most frequent first
+MAX_PREFIX_TERMS = 64
+
+_WORD = re.compile(r'\w+')
+
+
+def fold(text):
+    """Case-fold ``text`` and strip diacritics, so 'Rīga', 'RIGA' and 'riga' are one word."""
+    decomposed = unicodedata.normalize('NFKD', text.casefold())
+    return ''.join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text):
+    return _WORD.findall(fold(text)) if text else []
+
+
+class TextIndex:
+    """Immutable inverted index over the text fields of an IndexSnapshot.
+
+    Postings map a folded word to the ascending row positions it occurs at
+    and its field-weighted frequency there.  ``extended`` shares untouched
+    posting lists with the previous index and copies only the lists the new
+    rows add to, so older snapshots stay valid for readers.
+    """
+
+    def __init__(self, postings=None, terms=None, lengths=None, total_length=0.0):
+        self.postings = postings if postings is not None else {}
+        self.terms = terms if terms is not None else []
+        self.lengths = lengths if lengths is not None else array('f')
+        self.total_length = total_length
+
+    def extended(self, new_rows, start):
+        postings = dict(self.postings)
+        lengths = array('f', self.lengths)
+        total_length = self.total_length
+        touched = {}
+        # Companies and categories repeat a lot; fold each distinct value once
+        tokens_by_value = {}
+        for pos, row in enumerate(new_rows, start=start):
+            frequencies = {}
+            for field, weight in SEARCH_FIELDS.items():
+                value = row.get(field)
+                tokens = tokens_by_value.get(value)
+                if tokens is None:
+                    tokens = tokens_by_value[value] = tokenize(value)
+                for token in tokens:
+                    frequencies[token] = frequencies.get(token, 0.0) + weight
+            length = sum(frequencies.values())
+            lengths.append(length)
+            total_length += length
+            for term, frequency in frequencies.items():
+                posting = touched.get(term)
+                if posting is None:
+                    old = postings.get(term)
+                    posting = touched[term] = (array('I', old[0]) if old else array('I'),
+                                               array('f', old[1]) if old else array('f'))
+                posting[0].append(pos)
+                posting[1].append(frequency)
+        new_terms = [term for term in touched if term not in postings]
+        postings.update(touched)
+        terms = sorted(self.terms + new_terms) if new_terms else self.terms
+        return TextIndex(postings, terms, lengths, total_length)
+
+    def expand(self, word, prefix):
+        if not prefix:
+            return [word] if word in self.postings else []
+        matches = []
+        i = bisect.bisect_left(self.terms, word)
+        while i < len(self.terms) and self.terms[i].startswith(word):
+            matches.append(self.terms[i])
+            i += 1
+        if len(matches) > MAX_PREFIX_TERMS:
+            matches.sort(key=lambda term: len(self.postings[term][0]), reverse=True)
+            matches = matches[:MAX_PREFIX_TERMS]
+        return matches
+
+    def scores(self, query, allowed=None, prefix=True):
+        """BM25 score per row position matching every word of ``query``.
+
+        The last word also matches longer words starting with it (type-ahead)
+        unless ``prefix`` is false.  ``allowed`` is a bitmap of the positions to
+        consider, e.g. a filter mask from the snapshot.
+        """
+        words = tokenize(query)
+        size = len(self.lengths)
+        if not words or not size:
+            return {}
+        expanded = []
+        for i, word in enumerate(words):
+            terms = self.expand(word, prefix and i == len(words) - 1)
+            if not terms:
+                return {}
+            expanded.append(terms)
+        # Rarest word first: later words only look up rows that are still candidates
+        expanded.sort(key=lambda terms: sum(len(self.postings[term][0]) for term in terms))
+
+        allowed_bytes = allowed.to_bytes((size + 7) // 8, 'little') if allowed is not None else None
+        k1, b = BM25['k1'], BM25['b']
+        average_length = self.total_length / size
+        lengths = self.lengths
+        scores = None
+        for terms in expanded:
+            word_scores = {}
+            for term in terms:
+                positions, frequencies = self.postings[term]
+                idf = math.log(1 + (size - len(positions) + 0.5) / (len(positions) + 0.5))
+                for pos, frequency in zip(positions, frequencies):
+                    if scores is None:
+                        if allowed_bytes is not None and not (allowed_bytes[pos >> 3] >> (pos & 7)) & 1:
+                            continue
+                    elif pos not in scores:
+                        continue
+                    score = idf * frequency * (k1 + 1) / (
+                        frequency + k1 * (1 - b + b * lengths[pos] / average_length))
+                    # Words sharing a prefix count once, by the best match
+                    if score > word_scores.get(pos, 0.0):
+                        word_scores[pos] = score
+            if scores is None:
+                scores = word_scores
+            else:
+                scores = {pos: scores[pos] + score for pos, score in word_scores.items()}
+            if not scores:
+                break
+        return scores
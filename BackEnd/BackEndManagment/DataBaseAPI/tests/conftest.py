@@ -0,0 +1,90 @@
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+
+class FakeJobsDB:
+    """The part of the jobs table and data_version that the job index reads."""
+
+    def __init__(self, rows=()):
+        self.rows = [dict(row) for row in rows]
+        self.version = 0
+
+    def insert(self, **row):
+        row['id'] = max((r['id'] for r in self.rows), default=0) + 1
+        self.rows.append(row)
+        return row['id']
+
+    def update(self, job_id, **changes):
+        # Like JobWriter.flush and the salary backfill: change the row and bump the version
+        next(row for row in self.rows if row['id'] == job_id).update(changes)
+        self.version += 1
+
+    def generation(self):
+        return (max((row['id'] for row in self.rows), default=None), self.version, 0)
+
+    def connect(self):
+        return FakeConnection(self)
+
+
+class FakeConnection:
+    def __init__(self, db):
+        self.db = db
+
+    def cursor(self):
+        return FakeCursor(self.db)
+
+    def close(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+    def execute(self, query, args=None):
+        assert query == "SELECT * FROM jobs WHERE id > %s ORDER BY id", query
+        self._rows = [dict(row) for row in sorted(self.db.rows, key=lambda row: row['id'])
+                      if row['id'] > args[0]]
+
+    def fetchall(self):
+        return self._rows
+
+
+def job(title, category='IT', location='Rīga', salary_min=1000, salary_max=2000, company='SIA Tests'):
+    return {'title': title, 'company': company, 'category': category, 'location': location,
+            'salary_min': salary_min, 'salary_max': salary_max}
+
+
+@pytest.fixture
+def jobs_db():
+    db = FakeJobsDB()
+    db.insert(**job('Programmētājs'))
+    db.insert(**job('Noliktavas darbinieks', category='Loģistika', location='Ogre', salary_min=900, salary_max=1100))
+    db.insert(**job('Pārdevējs', category='Tirdzniecība', location='RĪGA', salary_min=None, salary_max=None))
+    return db
+
+
+@pytest.fixture
+def api(jobs_db, monkeypatch):
+    """jobRetrivalDBAPI with its job index and data generation reading ``jobs_db``."""
+    import jobRetrivalDBAPI
+    from jobIndex import JobIndex
+
+    monkeypatch.setattr(jobRetrivalDBAPI, 'job_index', JobIndex(jobs_db.connect))
+    monkeypatch.setattr(jobRetrivalDBAPI.data_generation, '_read_generation', jobs_db.generation)
+    monkeypatch.setattr(jobRetrivalDBAPI.data_generation, 'check_interval', 0)
+    monkeypatch.setitem(jobRetrivalDBAPI.index_config, 'enabled', True)
+    jobRetrivalDBAPI.response_cache.clear()
+    yield jobRetrivalDBAPI.app.test_client()
+    jobRetrivalDBAPI.response_cache.clear()
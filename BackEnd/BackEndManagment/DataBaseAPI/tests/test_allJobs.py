@@ -0,0 +1,18 @@
+import pytest
+
+
+@pytest.mark.parametrize('query', ['limit=0', 'limit=-5', 'page=0', 'page=-1'])
+def test_out_of_range_paging_is_rejected(api, query):
+    response = api.get('/all-jobs?' + query)
+    assert response.status_code == 400
+    assert 'error' in response.get_json()
+
+
+def test_pages_and_large_limits(api):
+    response = api.get('/all-jobs?limit=1000').get_json()
+    assert response['limit'] == 100
+    assert response['total'] == 3
+
+    response = api.get('/all-jobs?limit=2&page=2').get_json()
+    assert [job['title'] for job in response['jobs']] == ['Programmētājs']
+    assert response['pages'] == 2
@@ -0,0 +1,65 @@
+import json
+import zlib
+
+import pytest
+
+from bulkExport import stream_rows
+
+
+class FailingCursor:
+    """Returns one batch of rows, then fails like a dropped server connection."""
+
+    def __init__(self):
+        self.batches = [[{'id': 1}, {'id': 2}]]
+
+    def execute(self, query):
+        pass
+
+    def fetchmany(self, size):
+        if not self.batches:
+            raise ConnectionError('Lost connection to MySQL server during query')
+        return self.batches.pop(0)
+
+    def close(self):
+        pass
+
+
+class FakeConnection:
+    def __init__(self):
+        self.discarded = False
+        self.closed = False
+
+    def cursor(self, cursor_class=None):
+        return FailingCursor()
+
+    def close(self):
+        self.closed = True
+
+    def discard(self):
+        self.discarded = True
+
+
+def consume(stream):
+    chunks = []
+    with pytest.raises(ConnectionError):
+        for chunk in stream:
+            chunks.append(chunk)
+    return b''.join(chunks)
+
+
+def test_ndjson_ends_with_an_error_line_and_raises():
+    connection = FakeConnection()
+    body = consume(stream_rows(connection, 'SELECT 1', json.dumps, 'ndjson', None))
+
+    lines = [json.loads(line) for line in body.decode('utf-8').splitlines()]
+    assert lines[:2] == [{'id': 1}, {'id': 2}]
+    assert 'Lost connection' in lines[2]['error']
+    assert connection.discarded and not connection.closed
+
+
+def test_gzip_body_is_not_finished_on_error():
+    body = consume(stream_rows(FakeConnection(), 'SELECT 1', json.dumps, 'json', 'gzip'))
+
+    decompressor = zlib.decompressobj(31)
+    assert decompressor.decompress(body) == b'[{"id": 1},{"id": 2}'
+    assert not decompressor.eof
@@ -0,0 +1,151 @@
+"""The job index must answer /all-jobs and /filter-counts like the SQL path does.
+
+utf8mb4_general_ci ignores case, diacritics and trailing spaces, and GROUP BY
+merges values that compare equal and orders the groups NULL first.  The last
+test checks both paths against a real MariaDB when TEST_MYSQL_DATABASE names a
+scratch database (its ``jobs`` table is replaced); TEST_MYSQL_HOST,
+TEST_MYSQL_USER and TEST_MYSQL_PASSWORD default to localhost/root/empty.
+"""
+import os
+
+import pytest
+
+from conftest import FakeJobsDB, job
+from jobIndex import JobIndex
+
+ROWS = [
+    job('Programmētājs', category='IT', location='Rīga'),
+    job('Noliktavas darbinieks', category='Loģistika', location='Ogre', salary_min=900, salary_max=1100),
+    job('Pārdevējs', category='Tirdzniecība', location='RĪGA', salary_min=None, salary_max=None),
+    job('Testētājs', category='it', location='Riga '),
+    job('Šoferis', category='Loģistika', location=None, salary_min=1200, salary_max=1500),
+    job('Grāmatvedis', category='Finanses', location='Jūrmala', salary_min=1500, salary_max=1800),
+    job('Kurjers', category='Loģistika', location='Jurmala', salary_min=800, salary_max=1000),
+    # "no € 1300" and "līdz € 700": one side of the range unknown
+    job('Mūrnieks', category='Būvniecība', location='Valmiera', salary_min=1300, salary_max=None),
+    job('Apkopējs', category='Pakalpojumi', location='Valmiera', salary_min=None, salary_max=700),
+]
+
+QUERIES = [
+    '/all-jobs?location=Riga',
+    '/all-jobs?location=riga&match=exact',
+    '/all-jobs?location=RI&match=prefix',
+    '/all-jobs?location=jurm',
+    '/all-jobs?categories=logistika&location=Ogre,Jūrmala',
+    '/all-jobs?categories=IT&payFrom=900',
+    '/all-jobs?payFrom=1000',
+    '/all-jobs?payTo=1000',
+    '/all-jobs?payFrom=800&payTo=1500',
+    '/filter-counts?payFrom=1000',
+    '/filter-counts',
+    '/filter-counts?location=Riga',
+    '/filter-counts?categories=LOGISTIKA',
+]
+
+
+@pytest.fixture
+def jobs_db():
+    db = FakeJobsDB()
+    for row in ROWS:
+        db.insert(**row)
+    return db
+
+
+def test_filters_ignore_case_and_diacritics(api):
+    assert api.get('/all-jobs?location=Riga').get_json()['total'] == 3
+    assert api.get('/all-jobs?location=riga&match=exact').get_json()['total'] == 3
+    assert api.get('/all-jobs?location=RI&match=prefix').get_json()['total'] == 3
+    assert api.get('/all-jobs?location=jurmala&match=fulltext').get_json()['total'] == 2
+    assert api.get('/all-jobs?categories=logistika').get_json()['total'] == 3
+
+
+def test_salary_bounds_check_only_the_given_side(api):
+    def titles(query):
+        return sorted(job['title'] for job in api.get('/all-jobs?' + query).get_json()['jobs'])
+
+    # WHERE salary_min >= 1000 keeps rows whose salary_max is NULL, and the other way round
+    assert titles('payFrom=1000') == ['Grāmatvedis', 'Mūrnieks', 'Programmētājs', 'Testētājs', 'Šoferis']
+    assert titles('payTo=1000') == ['Apkopējs', 'Kurjers']
+    assert titles('payFrom=800&payTo=1500') == ['Kurjers', 'Noliktavas darbinieks', 'Šoferis']
+
+
+def test_facets_group_and_order_like_sql(api):
+    counts = api.get('/filter-counts').get_json()
+    # One group per collation-equal value, named after its first row, NULL first
+    assert counts['locationCounts'] == [
+        {'location': None, 'count': 1},
+        {'location': 'Jūrmala', 'count': 2},
+        {'location': 'Ogre', 'count': 1},
+        {'location': 'Rīga', 'count': 3},
+        {'location': 'Valmiera', 'count': 2},
+    ]
+    assert counts['categoryCounts'] == [
+        {'category': 'Būvniecība', 'count': 1},
+        {'category': 'Finanses', 'count': 1},
+        {'category': 'IT', 'count': 2},
+        {'category': 'Loģistika', 'count': 3},
+        {'category': 'Pakalpojumi', 'count': 1},
+        {'category': 'Tirdzniecība', 'count': 1},
+    ]
+
+    counts = api.get('/filter-counts?location=riga').get_json()
+    assert counts['categoryCounts'] == [
+        {'category': 'IT', 'count': 2},
+        {'category': 'Tirdzniecība', 'count': 1},
+    ]
+
+
+@pytest.fixture
+def mariadb():
+    database = os.environ.get('TEST_MYSQL_DATABASE')
+    if not database:
+        pytest.skip("TEST_MYSQL_DATABASE is not set")
+    import pymysql
+
+    def connect():
+        return pymysql.connect(
+            host=os.environ.get('TEST_MYSQL_HOST', 'localhost'),
+            user=os.environ.get('TEST_MYSQL_USER', 'root'),
+            password=os.environ.get('TEST_MYSQL_PASSWORD', ''),
+            database=database,
+            cursorclass=pymysql.cursors.DictCursor,
+            autocommit=True
+        )
+
+    connection = connect()
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS jobs")
+            cursor.execute(
+                "CREATE TABLE jobs (id int NOT NULL AUTO_INCREMENT PRIMARY KEY, title text, company text, "
+                "category text, location text, salary_min decimal(10,2), salary_max decimal(10,2)) "
+                "ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COLLATE=utf8mb4_general_ci"
+            )
+            cursor.executemany(
+                "INSERT INTO jobs (title, company, category, location, salary_min, salary_max) "
+                "VALUES (%(title)s, %(company)s, %(category)s, %(location)s, %(salary_min)s, %(salary_max)s)",
+                ROWS
+            )
+        yield connect
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TABLE IF EXISTS jobs")
+    finally:
+        connection.close()
+
+
+def test_index_matches_sql_path(mariadb, monkeypatch):
+    import jobRetrivalDBAPI
+
+    monkeypatch.setattr(jobRetrivalDBAPI, 'get_db_connection', mariadb)
+    monkeypatch.setattr(jobRetrivalDBAPI, 'job_index', JobIndex(mariadb))
+    monkeypatch.setattr(jobRetrivalDBAPI.data_generation, '_read_generation', lambda: ('parity', 0, 0))
+    client = jobRetrivalDBAPI.app.test_client()
+
+    def responses(index_enabled):
+        monkeypatch.setitem(jobRetrivalDBAPI.index_config, 'enabled', index_enabled)
+        jobRetrivalDBAPI.response_cache.clear()
+        jobRetrivalDBAPI.count_cache.clear()
+        return [client.get(query).get_json() for query in QUERIES]
+
+    for query, indexed, sql in zip(QUERIES, responses(True), responses(False)):
+        assert indexed == sql, query
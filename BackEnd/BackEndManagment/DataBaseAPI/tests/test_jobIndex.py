@@ -0,0 +1,48 @@
+from jobIndex import JobIndex
+
+
+def titles(snapshot, **filters):
+    rows, _ = snapshot.page(snapshot.filter_mask(**filters), limit=100)
+    return [row['title'] for row in rows]
+
+
+def test_new_rows_are_appended_without_a_rebuild(jobs_db):
+    index = JobIndex(jobs_db.connect)
+    first = index.ensure_fresh(jobs_db.generation(), version=jobs_db.version)
+    built_at = index._built_at
+
+    jobs_db.insert(title='Grāmatvedis', company='SIA Tests', category='Finanses', location='Rīga',
+                   salary_min=1500, salary_max=1800)
+    snapshot = index.ensure_fresh(jobs_db.generation(), version=jobs_db.version)
+
+    assert index._built_at == built_at
+    assert snapshot.size == first.size + 1
+    assert titles(snapshot)[0] == 'Grāmatvedis'
+
+
+def test_rows_changed_in_place_rebuild_the_index(jobs_db):
+    index = JobIndex(jobs_db.connect)
+    index.ensure_fresh(jobs_db.generation(), version=jobs_db.version)
+
+    jobs_db.update(1, title='Vecākais programmētājs', location='Ogre', salary_min=2500, salary_max=3000)
+    snapshot = index.ensure_fresh(jobs_db.generation(), version=jobs_db.version)
+
+    assert snapshot.rows[0]['title'] == 'Vecākais programmētājs'
+    assert titles(snapshot, locations=['Ogre']) == ['Noliktavas darbinieks', 'Vecākais programmētājs']
+    assert titles(snapshot, pay_from=2500) == ['Vecākais programmētājs']
+    assert snapshot.search('vecakais', snapshot.all_mask, 10)[1] == 1
+
+
+def test_edited_row_shows_up_in_api_responses(api, jobs_db):
+    assert api.get('/all-jobs?location=Ogre').get_json()['total'] == 1
+    counts = api.get('/filter-counts').get_json()['locationCounts']
+    assert {'location': 'Ogre', 'count': 1} in counts
+    assert api.get('/search?q=vecakais').get_json()['total'] == 0
+
+    jobs_db.update(1, title='Vecākais programmētājs', location='Ogre')
+
+    response = api.get('/all-jobs?location=Ogre').get_json()
+    assert [job['title'] for job in response['jobs']] == ['Noliktavas darbinieks', 'Vecākais programmētājs']
+    counts = api.get('/filter-counts').get_json()['locationCounts']
+    assert {'location': 'Ogre', 'count': 2} in counts
+    assert api.get('/search?q=vecakais').get_json()['total'] == 1
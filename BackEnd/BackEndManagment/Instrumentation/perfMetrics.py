@@ -0,0 +1,312 @@
+"""Process-local metrics and per-request stage timing.
+
+Shared by the job API (DataBaseAPI/), the chat API (Vanna.AI/BackEndAPI/)
+and the scraper (WebScaper/), which add this directory to ``sys.path``.
+Everything is rendered in the Prometheus text format by ``render()``;
+Flask apps expose it with ``instrument_flask(app)`` and the scraper with
+``serve_metrics(port)``.
+
+Setting SLOW_REQUEST_MS logs every request slower than that many
+milliseconds together with the time spent in each stage.
+"""
+import bisect
+import contextvars
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _label_text(names, values, extra=()):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    pairs.extend(f'{name}="{_escape(value)}"' for name, value in extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, help_text, labels=()):
+        self.name = name
+        self.help_text = help_text
+        self.labels = tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        return tuple(labels.get(name, '') for name in self.labels)
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{_label_text(self.labels, key)} {value}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, help_text, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = {'counts': [0] * (len(self.buckets) + 1), 'sum': 0.0}
+            entry['counts'][bisect.bisect_left(self.buckets, value)] += 1
+            entry['sum'] += value
+
+    def _render_value(self, key, value):
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), value['counts']):
+            cumulative += count
+            le = '+Inf' if bound == float('inf') else repr(bound)
+            lines.append(f"{self.name}_bucket{_label_text(self.labels, key, [('le', le)])} {cumulative}")
+        lines.append(f"{self.name}_sum{_label_text(self.labels, key)} {value['sum']}")
+        lines.append(f"{self.name}_count{_label_text(self.labels, key)} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name, help_text, labels, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help_text, labels, **kwargs)
+            return metric
+
+    def counter(self, name, help_text, labels=()):
+        return self._get(Counter, name, help_text, labels)
+
+    def gauge(self, name, help_text, labels=()):
+        return self._get(Gauge, name, help_text, labels)
+
+    def histogram(self, name, help_text, labels=(), buckets=DEFAULT_BUCKETS):
+        return self._get(Histogram, name, help_text, labels, buckets=buckets)
+
+    def render(self):
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = Registry()
+
+HTTP_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', "Request latency by route", ('route', 'method', 'status'))
+STAGE_SECONDS = REGISTRY.histogram(
+    'stage_duration_seconds', "Time spent in a named stage of a request or crawl", ('stage',))
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    'db_query_duration_seconds', "Database query time", ('query',))
+DB_QUERY_ROWS = REGISTRY.counter(
+    'db_query_rows_total', "Rows returned or affected by database queries", ('query',))
+LLM_SECONDS = REGISTRY.histogram(
+    'llm_call_duration_seconds', "LLM-backed operation latency", ('operation',),
+    buckets=(0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0))
+LLM_TOKENS = REGISTRY.counter(
+    'llm_tokens_total', "Tokens used by LLM calls", ('operation', 'kind'))
+
+
+# === Per-request stage timing ===
+
+_current_trace = contextvars.ContextVar('perf_trace', default=None)
+_llm_operation = contextvars.ContextVar('llm_operation', default='other')
+
+_slow_request_ms = os.environ.get('SLOW_REQUEST_MS')
+SLOW_REQUEST_SECONDS = float(_slow_request_ms) / 1000 if _slow_request_ms else None
+
+slow_log = logging.getLogger('slow_requests')
+
+
+class Trace:
+    def __init__(self, name):
+        self.name = name
+        self.started = time.perf_counter()
+        self.stages = []
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def breakdown(self):
+        totals = {}
+        for stage_name, seconds in list(self.stages):
+            totals[stage_name] = totals.get(stage_name, 0.0) + seconds
+        return ', '.join(f"{stage_name}={seconds * 1000:.0f}ms" for stage_name, seconds in totals.items())
+
+
+def start_trace(name):
+    trace = Trace(name)
+    _current_trace.set(trace)
+    return trace
+
+
+def end_trace(trace):
+    """Clears the current trace and logs it if it was slower than SLOW_REQUEST_MS."""
+    _current_trace.set(None)
+    elapsed = trace.elapsed()
+    if SLOW_REQUEST_SECONDS is not None and elapsed >= SLOW_REQUEST_SECONDS:
+        slow_log.warning("Slow request %s: %.0f ms (%s)", trace.name, elapsed * 1000, trace.breakdown() or "no stages")
+    return elapsed
+
+
+def record_stage(name, seconds):
+    STAGE_SECONDS.observe(seconds, stage=name)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.stages.append((name, seconds))
+
+
+@contextmanager
+def stage(name):
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - started)
+
+
+def record_query(label, seconds, rows):
+    DB_QUERY_SECONDS.observe(seconds, query=label)
+    DB_QUERY_ROWS.inc(rows, query=label)
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.stages.append(('db', seconds))
+
+
+@contextmanager
+def llm_call(operation):
+    """Times an LLM-backed operation; tokens used inside it are counted under ``operation``."""
+    token = _llm_operation.set(operation)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        _llm_operation.reset(token)
+        LLM_SECONDS.observe(elapsed, operation=operation)
+        record_stage(operation, elapsed)
+
+
+def instrument_openai_client(client):
+    """Counts prompt/completion tokens of every chat completion made through ``client``."""
+    completions = client.chat.completions
+    create = completions.create
+
+    def create_with_usage(*args, **kwargs):
+        response = create(*args, **kwargs)
+        usage = getattr(response, 'usage', None)
+        if usage is not None:
+            operation = _llm_operation.get()
+            LLM_TOKENS.inc(usage.prompt_tokens or 0, operation=operation, kind='prompt')
+            LLM_TOKENS.inc(usage.completion_tokens or 0, operation=operation, kind='completion')
+        return response
+
+    completions.create = create_with_usage
+    return client
+
+
+# === Exposition ===
+
+def _finish_request(trace, route, method, status):
+    elapsed = end_trace(trace)
+    HTTP_SECONDS.observe(elapsed, route=route, method=method, status=str(status))
+
+
+def instrument_flask(app):
+    """Route latency for every request, stage timing via ``stage()``, and GET /metrics."""
+    from flask import Response, g, request
+
+    def route():
+        return request.url_rule.rule if request.url_rule else 'unmatched'
+
+    @app.before_request
+    def start_request_trace():
+        g.perf_trace = start_trace(f"{request.method} {request.path}")
+
+    @app.after_request
+    def finish_streamed_trace(response):
+        trace = g.get('perf_trace')
+        if trace is not None and response.is_streamed:
+            # A streamed body is produced after the request context ends; time it until it is sent
+            g.perf_trace = None
+            rule, method, status = route(), request.method, response.status_code
+            response.call_on_close(lambda: _finish_request(trace, rule, method, status))
+        g.perf_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def finish_request_trace(exc):
+        trace = g.pop('perf_trace', None)
+        if trace is not None:
+            _finish_request(trace, route(), request.method, g.pop('perf_status', 500))
+
+    def metrics():
+        return Response(REGISTRY.render(), mimetype=CONTENT_TYPE)
+
+    app.add_url_rule('/metrics', 'metrics', metrics)
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split('?')[0] != '/metrics':
+            self.send_error(404)
+            return
+        body = REGISTRY.render().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', CONTENT_TYPE)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_metrics(port, host='0.0.0.0'):
+    """Serves GET /metrics from a daemon thread, for processes without a web app."""
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
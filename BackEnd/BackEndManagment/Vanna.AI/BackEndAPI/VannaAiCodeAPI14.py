@@ -1,10 +1,74 @@
-from flask import Flask, request, jsonify, Response
+from flask import Flask, request, jsonify, Response, stream_with_context
 import json
+import logging
+import os
+import sys
+import time
 import pandas as pd
 import concurrent.futures
 from vanna.openai import OpenAI_Chat
 from vanna.chromadb import ChromaDB_VectorStore
 
+from chartBuilder import build_chart, column_schema
+from chatCache import ResultStore, SemanticSqlCache, TTLCache, normalize_question
+from queryRunner import BoundedExecutor, ExecutorBusy, QueryRunner, QueryTimeout
+from requestLimits import ClientLimiter, SingleFlight
+from summaryTraining import summary_training_items
+from trainingState import prepare_training
+
+# Metrics shared with the job API and the scraper
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'Instrumentation'))
+import perfMetrics
+
+logging.basicConfig(level=logging.INFO)
+
+# Directory of the persisted Chroma collections (and training_state.json)
+CHROMA_PATH = os.environ.get('VANNA_CHROMA_PATH', '.')
+# 'incremental' trains only schema changes, 'full' re-embeds everything, 'skip' trusts the store
+TRAINING_MODE = os.environ.get('VANNA_TRAINING_MODE', 'incremental')
+
+mysql_config = {
+    'host': '',
+    'user': '',
+    'password': '',
+    'database': '',
+    'port': 3306
+}
+
+query_config = {
+    'max_workers': 8,
+    'max_pending': 32,
+    'query_timeout': 20,
+    'chart_timeout': 10,
+    # Upper bound for any single OpenAI call, so abandoned calls end too
+    'llm_timeout': 30
+}
+
+result_config = {
+    # Rows read from the database per question; more are reported as truncated
+    'max_rows': 1000,
+    # Rows in the /chat reply; the rest are paged through /chat/result/<handle>
+    'page_size': 100,
+    'max_results': 100,
+    'result_ttl': 600
+}
+
+server_config = {
+    'host': '0.0.0.0',
+    'port': 5001,
+    # More server threads than admitted requests, so the rest get a quick 503
+    'threads': 24,
+    'max_requests': 20,
+    'max_per_client': 2
+}
+
+sql_cache_config = {
+    'max_entries': 500,
+    'ttl': 3600,
+    # Cosine similarity a reworded question needs to reuse cached SQL
+    'threshold': float(os.environ.get('VANNA_SQL_CACHE_THRESHOLD', '0.95'))
+}
+
 
 class MyVanna(ChromaDB_VectorStore, OpenAI_Chat):
     def __init__(self, config=None):
@@ -14,24 +78,174 @@ class MyVanna(ChromaDB_VectorStore, OpenAI_Chat):
 
 vn = MyVanna(config={ 
     'api_key': '',
-    'model': 'gpt-4o-mini'
+    'model': 'gpt-4o-mini',
+    'path': CHROMA_PATH
 })
 
 
 vn.connect_to_mysql( # Slack Nosūtīti ja nepieciešams
-    host='',
-    dbname='',
-    user='',
-    password='',
-    port=3306
+    host=mysql_config['host'],
+    dbname=mysql_config['database'],
+    user=mysql_config['user'],
+    password=mysql_config['password'],
+    port=mysql_config['port']
 )
 
+vn.client = perfMetrics.instrument_openai_client(
+    vn.client.with_options(timeout=query_config['llm_timeout'], max_retries=1)
+)
 
-df_info = vn.run_sql("SELECT * FROM INFORMATION_SCHEMA.COLUMNS")
-plan = vn.get_training_plan_generic(df_info)
-vn.train(plan=plan)
+
+# Also teaches the salary summary tables, so aggregate questions avoid GROUP BY over jobs
+prepare_training(vn, mode=TRAINING_MODE, chroma_path=CHROMA_PATH, extra_items=summary_training_items())
+
+sql_cache = SemanticSqlCache(vn.generate_embedding, **sql_cache_config)
+
+executor = BoundedExecutor(query_config['max_workers'], query_config['max_pending'])
+query_runner = QueryRunner(mysql_config, executor, timeout=query_config['query_timeout'])
+result_store = ResultStore(result_config['max_results'], result_config['result_ttl'])
+# Plotly code generated by the LLM, keyed by (SQL, column schema)
+plotly_code_cache = TTLCache(max_entries=200, ttl=86400)
+
+# The connection from connect_to_mysql is not safe to share between request
+# threads; generate_sql's intermediate queries get their own connections too.
+vn.run_sql = lambda sql: query_runner.run(sql, max_rows=result_config['max_rows'])
+
+sql_flight = SingleFlight()
+query_flight = SingleFlight()
+limiter = ClientLimiter(server_config['max_requests'], server_config['max_per_client'])
 
 app = Flask(__name__)
+perfMetrics.instrument_flask(app)
+
+# Rows per "rows" event on /chat/stream
+STREAM_ROW_BATCH = 50
+
+
+class ChatError(Exception):
+    def __init__(self, message, status):
+        super().__init__(message)
+        self.status = status
+
+
+def client_id():
+    forwarded = request.headers.get('X-Forwarded-For')
+    return forwarded.split(',')[0].strip() if forwarded else request.remote_addr
+
+
+def rejection_response(reason):
+    if reason == 'client':
+        return jsonify({'error': 'Too many requests in progress for this client'}), 429
+    return jsonify({'error': 'Server busy, try again shortly'}), 503
+
+
+def classify_message(message):
+    msg_lower = message.lower()
+    contains_job = any(keyword in msg_lower for keyword in ["job", "vacancy", "listing"])
+    contains_graph = any(keyword in msg_lower for keyword in ["graph", "chart", "plot"])
+    if contains_job and contains_graph:
+        return "combined"
+    if contains_job:
+        return "job"
+    if contains_graph:
+        return "graph"
+    return "text"
+
+
+def generate_sql(message):
+    """SQL for ``message``, whether it came from the cache and the question's embedding."""
+    with perfMetrics.stage('sql_cache'):
+        sql_query, embedding = sql_cache.lookup(message)
+    from_cache = sql_query is not None
+    if not from_cache:
+        # Identical questions asked at the same time share one LLM call
+        with perfMetrics.llm_call('generate_sql'):
+            sql_query = sql_flight.do(normalize_question(message), vn.generate_sql, question=message, allow_llm_to_see_data=True)
+    logging.info("Generated SQL query%s: %s", " (cached)" if from_cache else "", sql_query)
+    return sql_query, from_cache, embedding
+
+
+def run_query(message, sql_query, from_cache, embedding=None):
+    """At most max_rows rows of the result and whether there were more."""
+    max_rows = result_config['max_rows']
+    started = time.perf_counter()
+    try:
+        df = query_flight.do(sql_query, query_runner.run, sql_query, max_rows=max_rows)
+    except QueryTimeout:
+        perfMetrics.record_query('chat', time.perf_counter() - started, 0)
+        raise ChatError('Database query timed out', 504)
+    except ExecutorBusy:
+        raise ChatError('Server busy, try again shortly', 503)
+    perfMetrics.record_query('chat', time.perf_counter() - started, len(df))
+
+    # Only SQL that actually ran is worth answering the next question with
+    if not from_cache:
+        sql_cache.set(message, sql_query, embedding)
+    truncated = len(df) > max_rows
+    return df.iloc[:max_rows], truncated
+
+
+def store_result(df, truncated):
+    """Keeps ``df`` for /chat/result paging; returns the reply fields describing it."""
+    total_rows = len(df)
+    page_size = result_config['page_size']
+    return {
+        "resultHandle": result_store.put(df) if total_rows > page_size else None,
+        "totalRows": total_rows,
+        "truncated": truncated,
+        "hasMore": total_rows > page_size
+    }
+
+
+def dumps_compact(data):
+    return json.dumps(data, default=str, separators=(',', ':'))
+
+
+def build_llm_graph(message, sql_query, df):
+    key = (sql_query, column_schema(df))
+    plotly_code = plotly_code_cache.get(key)
+    if plotly_code is None:
+        with perfMetrics.llm_call('generate_plotly_code'):
+            plotly_code = vn.generate_plotly_code(
+                question=message,
+                sql=sql_query,
+                df_metadata=f"{df.dtypes}" if df is not None else "No data"
+            )
+    with perfMetrics.stage('plotly_figure'):
+        fig = vn.get_plotly_figure(plotly_code=plotly_code, df=df, dark_mode=False)
+    plotly_code_cache.set(key, plotly_code)
+    return fig.to_json()
+
+
+def start_graph(message, sql_query, df):
+    """Future of the graph JSON; common result shapes are charted without the LLM."""
+    with perfMetrics.stage('chart_rules'):
+        fig = build_chart(df)
+    if fig is not None:
+        future = concurrent.futures.Future()
+        future.set_result(fig.to_json())
+        return future
+    try:
+        return executor.submit(build_llm_graph, message, sql_query, df)
+    except ExecutorBusy:
+        logging.warning("Graph generation skipped: executor busy")
+        return None
+
+
+def wait_for_graph(future):
+    """Graph JSON, or None if it failed or took longer than chart_timeout."""
+    if future is None:
+        return None
+    try:
+        return future.result(timeout=query_config['chart_timeout'])
+    except concurrent.futures.TimeoutError:
+        # Not waited for; the LLM client timeout bounds the abandoned call
+        future.cancel()
+        logging.warning("Graph generation timed out")
+    except Exception as graph_error:
+        logging.exception("Graph generation error: %s", graph_error)
+    return None
+
 
 @app.route('/chat', methods=['POST'])
 def chat():
@@ -40,72 +254,125 @@ def chat():
     if not message:
         return jsonify({'error': 'No message provided'}), 400
 
-    try:
-       
-        msg_lower = message.lower()
-        contains_job = any(keyword in msg_lower for keyword in ["job", "vacancy", "listing"])
-        contains_graph = any(keyword in msg_lower for keyword in ["graph", "chart", "plot"])
-        if contains_job and contains_graph:
-            response_type = "combined"
-        elif contains_job:
-            response_type = "job"
-        elif contains_graph:
-            response_type = "graph"
-        else:
-            response_type = "text"
-
-       
-        sql_query = vn.generate_sql(question=message, allow_llm_to_see_data=True)
-        print("Generated SQL Query:", sql_query)
-
-        
-        try:
-            with concurrent.futures.ThreadPoolExecutor() as executor:
-                future = executor.submit(vn.run_sql, sql_query)
-                df = future.result(timeout=20) 
-        except concurrent.futures.TimeoutError:
-            return jsonify({'error': 'Database query timed out'}), 504
+    client = client_id()
+    rejected = limiter.acquire(client)
+    if rejected:
+        return rejection_response(rejected)
 
-        records = df.to_dict(orient='records') if df is not None else []
+    try:
+        response_type = classify_message(message)
+        sql_query, from_cache, embedding = generate_sql(message)
+        df, truncated = run_query(message, sql_query, from_cache, embedding)
 
-        
         reply_data = {
             "responseType": response_type,
             "sqlQuery": sql_query
         }
 
-       
         if response_type in ["graph", "combined"]:
-            try:
-                
-                with concurrent.futures.ThreadPoolExecutor() as executor:
-                    future = executor.submit(
-                        vn.generate_plotly_code,
-                        question=message,
-                        sql=sql_query,
-                        df_metadata=f"{df.dtypes}" if df is not None else "No data"
-                    )
-                    plotly_code = future.result(timeout=10)  
-                fig = vn.get_plotly_figure(plotly_code=plotly_code, df=df, dark_mode=False)
-                graph_json = fig.to_json()
-                reply_data["graph"] = graph_json
-            except concurrent.futures.TimeoutError:
-                print("Graph generation timed out")
-                reply_data["graph"] = None
-            except Exception as graph_error:
-                print("Graph generation error:", graph_error)
-                reply_data["graph"] = None
-
-        
+            reply_data["graph"] = wait_for_graph(start_graph(message, sql_query, df))
+
         if response_type in ["text", "job", "combined"]:
-            reply_data["reply"] = records
+            reply_data["reply"] = df.iloc[:result_config['page_size']].to_dict(orient='records')
+            reply_data.update(store_result(df, truncated))
 
-        response_data = json.dumps(reply_data, default=str, indent=2)
+        response_data = dumps_compact(reply_data)
         return Response(response=response_data, status=200, mimetype='application/json')
 
+    except ChatError as e:
+        return jsonify({'error': str(e)}), e.status
     except Exception as e:
-        print("Error processing /chat request:", e)
+        logging.exception("Error processing /chat request")
         return jsonify({'error': str(e)}), 500
+    finally:
+        limiter.release(client)
+
+
+def sse_event(event, data):
+    return f"event: {event}\ndata: {dumps_compact(data)}\n\n"
+
+
+@app.route('/chat/stream', methods=['POST'])
+def chat_stream():
+    """Same answer as /chat, sent as server-sent events while each stage finishes.
+
+    Events in order: ``type`` {responseType}, ``sql`` {sqlQuery, cached},
+    ``rows`` {offset, rows} (batches of the first page) and ``result``
+    {resultHandle, totalRows, truncated, hasMore} (text/job/combined only),
+    ``graph`` {graph} (graph/combined only), then ``done``; any failure
+    ends the stream with ``error`` {error, status}.
+    """
+    data = request.get_json()
+    message = data.get('message')
+    if not message:
+        return jsonify({'error': 'No message provided'}), 400
+
+    client = client_id()
+    rejected = limiter.acquire(client)
+    if rejected:
+        return rejection_response(rejected)
+
+    def generate():
+        try:
+            response_type = classify_message(message)
+            yield sse_event('type', {'responseType': response_type})
+
+            sql_query, from_cache, embedding = generate_sql(message)
+            yield sse_event('sql', {'sqlQuery': sql_query, 'cached': from_cache})
+
+            df, truncated = run_query(message, sql_query, from_cache, embedding)
+
+            # The chart is generated while the rows are being sent
+            graph_future = None
+            if response_type in ["graph", "combined"]:
+                graph_future = start_graph(message, sql_query, df)
+
+            if response_type in ["text", "job", "combined"]:
+                first_page = df.iloc[:result_config['page_size']]
+                for offset in range(0, len(first_page), STREAM_ROW_BATCH):
+                    batch = first_page.iloc[offset:offset + STREAM_ROW_BATCH]
+                    yield sse_event('rows', {'offset': offset, 'rows': batch.to_dict(orient='records')})
+                yield sse_event('result', store_result(df, truncated))
+
+            if response_type in ["graph", "combined"]:
+                yield sse_event('graph', {'graph': wait_for_graph(graph_future)})
+
+            yield sse_event('done', {})
+        except ChatError as e:
+            yield sse_event('error', {'error': str(e), 'status': e.status})
+        except Exception as e:
+            logging.exception("Error processing /chat/stream request")
+            yield sse_event('error', {'error': str(e), 'status': 500})
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'}
+    )
+    # Also runs when the client disconnects before the stream starts
+    response.call_on_close(lambda: limiter.release(client))
+    return response
+
+@app.route('/chat/result/<handle>', methods=['GET'])
+def chat_result(handle):
+    """A page of a stored /chat result: ?offset=0&limit=page_size."""
+    df = result_store.get(handle)
+    if df is None:
+        return jsonify({'error': 'Result expired or not found'}), 404
+
+    try:
+        offset = max(int(request.args.get('offset', 0)), 0)
+        limit = min(max(int(request.args.get('limit', result_config['page_size'])), 1), result_config['max_rows'])
+    except ValueError:
+        return jsonify({'error': 'offset and limit must be integers'}), 400
+
+    response_data = dumps_compact({
+        "rows": df.iloc[offset:offset + limit].to_dict(orient='records'),
+        "offset": offset,
+        "totalRows": len(df),
+        "hasMore": offset + limit < len(df)
+    })
+    return Response(response=response_data, status=200, mimetype='application/json')
 
 @app.route('/train', methods=['POST'])
 def train():
@@ -125,10 +392,32 @@ def train():
         else:
             return jsonify({'error': 'Unknown training type'}), 400
 
+        # New training data can change the SQL and charts the model would generate
+        sql_cache.clear()
+        plotly_code_cache.clear()
         return jsonify({'message': 'Training data added successfully'})
     except Exception as e:
-        print("Error processing /train request:", e)
+        logging.exception("Error processing /train request")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/cache-stats', methods=['GET'])
+def cache_stats():
+    return jsonify({'sql': sql_cache.stats(), 'plotly_code': plotly_code_cache.stats()})
+
+@app.route('/executor-stats', methods=['GET'])
+def executor_stats():
+    return jsonify({
+        'executor': executor.stats(),
+        'requests': limiter.stats(),
+        'sql_singleflight': sql_flight.stats(),
+        'query_singleflight': query_flight.stats()
+    })
+
 if __name__ == '__main__':
-    app.run(host='0.0.0.0', port=5001)
+    # One process with many threads: the caches, executor and singleflight
+    # only work within a process, and Chroma's files are not multi-process safe.
+    if os.environ.get('VANNA_DEV_SERVER') == '1':
+        app.run(host=server_config['host'], port=server_config['port'], threaded=True)
+    else:
+        from waitress import serve
+        serve(app, host=server_config['host'], port=server_config['port'], threads=server_config['threads'])
@@ -0,0 +1,96 @@
+import datetime
+from decimal import Decimal
+
+import pandas as pd
+import plotly.express as px
+import plotly.graph_objects as go
+
+# More distinct categories than this make an unreadable bar chart on a phone
+MAX_CATEGORIES = 50
+# Numeric columns shown side by side in a grouped bar chart
+MAX_GROUPED_SERIES = 4
+
+
+def column_schema(df):
+    """Column names and dtypes; with the SQL, the key for cached Plotly code."""
+    return tuple((str(column), str(dtype)) for column, dtype in df.dtypes.items())
+
+
+def _coerce(series):
+    """pymysql returns DECIMAL and DATE as Python objects; give them real dtypes."""
+    if series.dtype != object:
+        return series
+    values = series.dropna()
+    if values.empty:
+        return series
+    if values.map(lambda value: isinstance(value, (int, float, Decimal))).all():
+        return pd.to_numeric(series)
+    if values.map(lambda value: isinstance(value, (datetime.date, datetime.datetime))).all():
+        return pd.to_datetime(series)
+    return series
+
+
+def _is_identifier(column):
+    name = str(column).casefold()
+    return name == 'id' or name.endswith('_id')
+
+
+def _column_kinds(df):
+    numeric, temporal, categorical = [], [], []
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_bool_dtype(series):
+            categorical.append(column)
+        elif pd.api.types.is_numeric_dtype(series):
+            numeric.append(column)
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            temporal.append(column)
+        else:
+            categorical.append(column)
+    return numeric, temporal, categorical
+
+
+def build_chart(df, title=None):
+    """A Plotly figure for the common result shapes, or None to leave it to the LLM.
+
+    The chart type follows from the column dtypes and category cardinality:
+    a single number becomes an indicator, one numeric column a histogram,
+    one categorical column a bar chart of counts, category + number(s) a
+    (grouped) bar chart, time + number a line chart and two numbers a
+    scatter plot.  ``id``/``*_id`` and all-NULL columns are not plotted; if
+    that leaves no numeric column there is nothing to chart.
+    """
+    if df is None or df.empty:
+        return None
+    df = df.apply(_coerce)
+    excluded = [column for column in df.columns if _is_identifier(column) or df[column].isna().all()]
+    df = df.drop(columns=excluded)
+    numeric, temporal, categorical = _column_kinds(df)
+    if excluded and not numeric:
+        return None
+    columns = len(df.columns)
+
+    if columns == 1 and numeric:
+        if len(df) == 1:
+            fig = go.Figure(go.Indicator(mode='number', value=float(df[numeric[0]].iloc[0]), title={'text': numeric[0]}))
+        else:
+            fig = px.histogram(df, x=numeric[0])
+    elif columns == 1 and categorical:
+        counts = df[categorical[0]].astype(str).value_counts()
+        if len(counts) > MAX_CATEGORIES:
+            return None
+        fig = px.bar(x=counts.index, y=counts.values, labels={'x': categorical[0], 'y': 'count'})
+    elif len(categorical) == 1 and 1 <= len(numeric) <= MAX_GROUPED_SERIES and not temporal:
+        if df[categorical[0]].nunique() > MAX_CATEGORIES:
+            return None
+        y = numeric[0] if len(numeric) == 1 else numeric
+        fig = px.bar(df, x=categorical[0], y=y, barmode='group')
+    elif columns == 2 and len(temporal) == 1 and len(numeric) == 1:
+        fig = px.line(df.sort_values(temporal[0]), x=temporal[0], y=numeric[0])
+    elif columns == 2 and len(numeric) == 2:
+        fig = px.scatter(df, x=numeric[0], y=numeric[1])
+    else:
+        return None
+
+    fig.update_layout(template='plotly', title=title)
+    return fig
@@ -0,0 +1,186 @@
+import re
+import threading
+import time
+import unicodedata
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+_TRAILING_PUNCTUATION = re.compile(r'[\s?!.,;:]+$')
+_WHITESPACE = re.compile(r'\s+')
+_QUOTED_OR_NUMBER = re.compile(r'"[^"]*"|(?<!\w)\'[^\']*\'(?!\w)|„[^“”"]*[“”"]|«[^»]*»|\d+(?:[.,]\d+)*')
+_WORD = re.compile(r'\w+')
+
+
+def normalize_question(question):
+    """Case, spacing and trailing punctuation do not change the SQL."""
+    question = unicodedata.normalize('NFKC', question).casefold().strip()
+    question = _TRAILING_PUNCTUATION.sub('', question)
+    return _WHITESPACE.sub(' ', question)
+
+
+def question_literals(question):
+    """Numbers, quoted strings and capitalized words after the first one.
+
+    Questions that differ only in these ("over 2000" / "over 3000", "in Riga" /
+    "in Liepaja") embed almost identically but need different SQL.
+    """
+    question = unicodedata.normalize('NFKC', question).strip()
+    literals = [literal.casefold() for literal in _QUOTED_OR_NUMBER.findall(question)]
+    words = _WORD.findall(_QUOTED_OR_NUMBER.sub(' ', question))
+    literals += [word.casefold() for word in words[1:] if word[0].isupper()]
+    return tuple(literals)
+
+
+class SemanticSqlCache:
+    """Question -> SQL cache in front of ``vn.generate_sql``.
+
+    A question is answered from the cache when its normalized form was seen
+    before, or when its embedding (the same embedding function the Chroma
+    store uses) has cosine similarity >= ``threshold`` with a cached one whose
+    literals (``question_literals``) are the same.
+    Entries expire after ``ttl`` seconds and the least recently used entry is
+    evicted beyond ``max_entries``.  ``clear()`` is called whenever training
+    data changes, since the stored SQL may no longer be what the model would
+    generate.
+    """
+
+    def __init__(self, embed, max_entries=500, ttl=3600, threshold=0.95):
+        self.embed = embed
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.threshold = threshold
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _embedding(self, normalized):
+        vector = np.asarray(self.embed(normalized), dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def _drop_expired(self, now):
+        expired = [key for key, entry in self._entries.items() if entry['expires'] <= now]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, question):
+        """Cached SQL for ``question`` or None."""
+        return self.lookup(question)[0]
+
+    def lookup(self, question):
+        """Cached SQL for ``question`` or None, and the question's embedding.
+
+        The embedding is None when the lookup did not need one; pass it to
+        ``set`` so a miss is not embedded twice.
+        """
+        normalized = normalize_question(question)
+        literals = question_literals(question)
+        now = time.monotonic()
+        with self._lock:
+            self._drop_expired(now)
+            entry = self._entries.get(normalized)
+            if entry is not None:
+                self._entries.move_to_end(normalized)
+                self.hits += 1
+                return entry['sql'], None
+            keys = [key for key, entry in self._entries.items() if entry['literals'] == literals]
+            if not keys:
+                self.misses += 1
+                return None, None
+            matrix = np.stack([self._entries[key]['embedding'] for key in keys])
+
+        # Embedding outside the lock; it is the slow part of a lookup.
+        embedding = self._embedding(normalized)
+        scores = matrix @ embedding
+        best = int(np.argmax(scores))
+        with self._lock:
+            entry = self._entries.get(keys[best])
+            if entry is not None and scores[best] >= self.threshold:
+                self._entries.move_to_end(keys[best])
+                self.hits += 1
+                self.semantic_hits += 1
+                return entry['sql'], embedding
+            self.misses += 1
+            return None, embedding
+
+    def set(self, question, sql, embedding=None):
+        normalized = normalize_question(question)
+        if embedding is None:
+            embedding = self._embedding(normalized)
+        with self._lock:
+            self._entries[normalized] = {
+                'sql': sql,
+                'embedding': embedding,
+                'literals': question_literals(question),
+                'expires': time.monotonic() + self.ttl
+            }
+            self._entries.move_to_end(normalized)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'threshold': self.threshold
+            }
+
+
+class TTLCache:
+    """Key -> value with TTL and LRU eviction, and hit/miss counters."""
+
+    def __init__(self, max_entries=100, ttl=600):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] <= time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, time.monotonic() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
+
+
+class ResultStore(TTLCache):
+    """Recent /chat results kept for paging under an opaque handle."""
+
+    def put(self, result):
+        handle = uuid.uuid4().hex
+        self.set(handle, result)
+        return handle
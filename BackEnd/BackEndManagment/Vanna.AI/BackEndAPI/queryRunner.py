@@ -0,0 +1,147 @@
+import concurrent.futures
+import contextvars
+import logging
+import threading
+
+import pandas as pd
+import pymysql
+
+
+class ExecutorBusy(Exception):
+    pass
+
+
+class QueryTimeout(Exception):
+    pass
+
+
+class BoundedExecutor:
+    """One thread pool shared by all requests, with a cap on queued work.
+
+    ``submit`` raises ExecutorBusy instead of queueing once ``max_pending``
+    tasks are running or waiting, so overload turns into quick errors
+    rather than an ever-growing queue of requests that will time out anyway.
+    """
+
+    def __init__(self, max_workers=8, max_pending=32):
+        self._executor = concurrent.futures.ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='chat-worker')
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pending = 0
+        self._lock = threading.Lock()
+        self.rejected = 0
+
+    def submit(self, fn, *args, **kwargs):
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise ExecutorBusy("Too many requests in progress")
+        with self._lock:
+            self._pending += 1
+        try:
+            # Tasks see the submitting request's context (e.g. its metrics trace)
+            future = self._executor.submit(contextvars.copy_context().run, fn, *args, **kwargs)
+        except Exception:
+            self._done(None)
+            raise
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        with self._lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'max_workers': self.max_workers,
+                'max_pending': self.max_pending,
+                'pending': self._pending,
+                'rejected': self.rejected
+            }
+
+
+class QueryRunner:
+    """Runs generated SQL on its own connection with a hard time limit.
+
+    Each query gets a fresh connection whose session carries a server-side
+    statement limit (``max_statement_time`` on MariaDB, ``max_execution_time``
+    on MySQL).  If the result is still not back after ``timeout`` seconds
+    the query is killed with ``KILL QUERY`` from a second connection and
+    QueryTimeout is raised immediately, so neither the request nor the
+    database connection waits for a runaway query.
+
+    With ``max_rows`` at most ``max_rows + 1`` rows are read: the session's
+    ``sql_select_limit`` makes the server stop there unless the query has its
+    own LIMIT, and the result is read through an unbuffered cursor whose
+    remaining rows are dropped with the connection.  The query itself is
+    sent unchanged, so its ORDER BY still decides which rows come first.
+    A DataFrame longer than ``max_rows`` means truncated.
+    """
+
+    def __init__(self, connect_kwargs, executor, timeout=20):
+        self.connect_kwargs = connect_kwargs
+        self.executor = executor
+        self.timeout = timeout
+
+    def _connect(self):
+        return pymysql.connect(cursorclass=pymysql.cursors.DictCursor, autocommit=True, **self.connect_kwargs)
+
+    def _limit_session(self, connection, timeout):
+        with connection.cursor() as cursor:
+            if 'MariaDB' in connection.get_server_info():
+                cursor.execute("SET SESSION max_statement_time = %s", (timeout,))
+            else:
+                cursor.execute("SET SESSION max_execution_time = %s", (int(timeout * 1000),))
+
+    def _execute(self, connection, sql, max_rows=None):
+        try:
+            if max_rows is None:
+                cursor = connection.cursor()
+                cursor.execute(sql)
+                return self._frame(cursor, cursor.fetchall())
+
+            with connection.cursor() as cursor:
+                cursor.execute("SET SESSION sql_select_limit = %s", (max_rows + 1,))
+            # Not closed: closing an unbuffered cursor would read the remaining rows
+            cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+            cursor.execute(sql)
+            return self._frame(cursor, cursor.fetchmany(max_rows + 1))
+        finally:
+            connection.close()
+
+    @staticmethod
+    def _frame(cursor, results):
+        return pd.DataFrame(results, columns=[desc[0] for desc in cursor.description or ()])
+
+    def _kill(self, thread_id):
+        try:
+            connection = self._connect()
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute("KILL QUERY %s", (thread_id,))
+            finally:
+                connection.close()
+        except pymysql.Error as e:
+            logging.warning("KILL QUERY %s failed: %s", thread_id, e)
+
+    def run(self, sql, timeout=None, max_rows=None):
+        timeout = timeout or self.timeout
+        connection = self._connect()
+        try:
+            self._limit_session(connection, timeout)
+            future = self.executor.submit(self._execute, connection, sql, max_rows)
+        except Exception:
+            connection.close()
+            raise
+
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            if future.cancel():
+                connection.close()
+            else:
+                self._kill(connection.thread_id())
+            raise QueryTimeout(f"Query exceeded {timeout} s")
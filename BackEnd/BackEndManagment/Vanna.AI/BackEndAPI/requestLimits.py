@@ -0,0 +1,97 @@
+import threading
+
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key into one execution.
+
+    The first caller for a key runs ``fn``; callers arriving while it is
+    still running wait for it and receive the same result (or exception).
+    Nothing is kept once the call finishes; that is the caches' job.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.executed = 0
+        self.coalesced = 0
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = {'done': threading.Event(), 'result': None, 'error': None}
+                self._calls[key] = call
+                leader = True
+                self.executed += 1
+            else:
+                leader = False
+                self.coalesced += 1
+
+        if not leader:
+            call['done'].wait()
+            if call['error'] is not None:
+                raise call['error']
+            return call['result']
+
+        try:
+            call['result'] = fn(*args, **kwargs)
+            return call['result']
+        except Exception as e:
+            call['error'] = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call['done'].set()
+
+    def stats(self):
+        with self._lock:
+            return {'in_flight': len(self._calls), 'executed': self.executed, 'coalesced': self.coalesced}
+
+
+class ClientLimiter:
+    """Admission control: at most ``max_total`` requests in progress, ``max_per_client`` per client.
+
+    ``acquire`` never waits; it returns None when admitted, otherwise
+    'busy' (server-wide limit) or 'client' (the client's own limit), so the
+    caller can answer immediately instead of queueing.
+    """
+
+    def __init__(self, max_total=32, max_per_client=2):
+        self.max_total = max_total
+        self.max_per_client = max_per_client
+        self._active = {}
+        self._total = 0
+        self._lock = threading.Lock()
+        self.rejected = {'busy': 0, 'client': 0}
+
+    def acquire(self, client):
+        with self._lock:
+            if self._total >= self.max_total:
+                reason = 'busy'
+            elif self._active.get(client, 0) >= self.max_per_client:
+                reason = 'client'
+            else:
+                self._active[client] = self._active.get(client, 0) + 1
+                self._total += 1
+                return None
+            self.rejected[reason] += 1
+            return reason
+
+    def release(self, client):
+        with self._lock:
+            self._total -= 1
+            if self._active[client] <= 1:
+                del self._active[client]
+            else:
+                self._active[client] -= 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                'in_progress': self._total,
+                'clients': len(self._active),
+                'max_total': self.max_total,
+                'max_per_client': self.max_per_client,
+                'rejected': dict(self.rejected)
+            }
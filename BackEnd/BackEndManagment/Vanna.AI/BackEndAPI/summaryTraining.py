@@ -0,0 +1,64 @@
+import logging
+import os
+import re
+
+from vanna.types import TrainingPlanItem
+
+# The summary tables are defined (and documented in column comments) by this migration
+MIGRATION_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'DataBaseAPI',
+                              'migrations', '005_salary_summaries.sql')
+
+SUMMARY_TABLES = ('job_salary_summary', 'job_salary_histogram')
+
+DOCUMENTATION = """\
+job_salary_summary and job_salary_histogram hold precomputed aggregates of the jobs table and are
+much faster than GROUP BY over jobs. Prefer them for counts, minimum, maximum and average salaries
+and salary distributions per category, per location (city or country) or per salary_type.
+Each row is for one dimension ('category', 'location' or 'salary_type') and one value of that jobs
+column, so always filter on dimension, e.g. WHERE dimension = 'location' AND value = 'Rīga'.
+Salaries are monthly equivalents in euros (monthly_equiv_min / monthly_equiv_max of jobs); divide by
+160 for hourly pay. job_salary_summary.jobs counts all jobs, avg_monthly_min and avg_monthly_max are
+averages over the jobs with a salary. job_salary_histogram counts jobs whose monthly_equiv_max is in
+[bucket_from, bucket_to). Use the jobs table only for individual listings or for filters the
+summaries do not have (title, company, several conditions at once)."""
+
+EXAMPLE_SQL = {
+    "What is the average salary in each category?":
+        "SELECT value AS category, jobs, avg_monthly_min, avg_monthly_max FROM job_salary_summary "
+        "WHERE dimension = 'category' ORDER BY avg_monthly_max DESC",
+    "How many jobs are there in each city?":
+        "SELECT value AS location, jobs FROM job_salary_summary WHERE dimension = 'location' ORDER BY jobs DESC",
+    "What is the salary range of hourly and monthly jobs?":
+        "SELECT value AS salary_type, jobs, monthly_min, monthly_max, monthly_min / 160 AS hourly_min, "
+        "monthly_max / 160 AS hourly_max FROM job_salary_summary WHERE dimension = 'salary_type'",
+    "Show the salary distribution of jobs in Rīga":
+        "SELECT bucket_from, bucket_to, jobs FROM job_salary_histogram "
+        "WHERE dimension = 'location' AND value = 'Rīga' ORDER BY bucket_from"
+}
+
+
+def summary_ddl(migration_path=MIGRATION_PATH):
+    """CREATE TABLE statements of the summary tables, without the migration's comments."""
+    with open(migration_path, encoding='utf-8') as f:
+        text = re.sub(r'^--.*\n', '', f.read(), flags=re.MULTILINE)
+    statements = [statement.strip() + ';' for statement in text.split(';\n')]
+    return [statement for statement in statements
+            if any(f"CREATE TABLE IF NOT EXISTS `{table}`" in statement for table in SUMMARY_TABLES)]
+
+
+def summary_training_items(migration_path=MIGRATION_PATH):
+    """DDL, documentation and example questions for prepare_training's ``extra_items``."""
+    items = []
+    try:
+        for ddl in summary_ddl(migration_path):
+            table = re.search(r'`(\w+)`', ddl).group(1)
+            items.append(TrainingPlanItem(item_type=TrainingPlanItem.ITEM_TYPE_DDL, item_group='summaries',
+                                          item_name=table, item_value=ddl))
+    except OSError as e:
+        logging.warning("Summary table DDL not found, training documentation only: %s", e)
+    items.append(TrainingPlanItem(item_type=TrainingPlanItem.ITEM_TYPE_IS, item_group='summaries',
+                                  item_name='salary summaries', item_value=DOCUMENTATION))
+    for question, sql in EXAMPLE_SQL.items():
+        items.append(TrainingPlanItem(item_type=TrainingPlanItem.ITEM_TYPE_SQL, item_group='summaries',
+                                      item_name=question, item_value=sql))
+    return items
@@ -0,0 +1,34 @@
+from decimal import Decimal
+
+import pandas as pd
+
+from chartBuilder import build_chart
+
+
+def chart_types(fig):
+    return [trace.type for trace in fig.data]
+
+
+def test_ids_are_not_measures():
+    df = pd.DataFrame({'id': [3, 2, 1], 'title': ['Programmētājs', 'Pavārs', 'Šoferis']})
+    assert build_chart(df) is None
+
+    df = pd.DataFrame({'category': ['IT', 'Transports'], 'category_id': [7, 9], 'jobs': [12, 4]})
+    fig = build_chart(df)
+    assert chart_types(fig) == ['bar']
+    assert list(fig.data[0].y) == [12, 4]
+
+
+def test_all_null_measure_gives_no_chart():
+    df = pd.DataFrame({'title': ['Pavārs', 'Šoferis'], 'avg_salary': [None, None]})
+    assert build_chart(df) is None
+
+
+def test_category_with_decimal_measure():
+    df = pd.DataFrame({'location': ['Rīga', 'Valmiera'], 'avg_salary': [Decimal('1500.50'), Decimal('1100.00')]})
+    assert chart_types(build_chart(df)) == ['bar']
+
+
+def test_single_category_column_is_counted():
+    df = pd.DataFrame({'category': ['IT', 'IT', 'Būvniecība']})
+    assert chart_types(build_chart(df)) == ['bar']
@@ -0,0 +1,42 @@
+from chatCache import SemanticSqlCache, question_literals
+
+
+class CountingEmbed:
+    """Every question embeds to the same vector, so only literals tell them apart."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, text):
+        self.calls.append(text)
+        return [1.0, 0.0, 0.0]
+
+
+def test_miss_is_embedded_once():
+    embed = CountingEmbed()
+    cache = SemanticSqlCache(embed)
+    cache.set('jobs in Riga', 'SELECT 1')
+
+    sql, embedding = cache.lookup('show jobs in Riga please')
+    assert sql == 'SELECT 1'
+    assert embedding is not None
+
+    embed.calls.clear()
+    sql, embedding = cache.lookup('how many jobs are in Riga')
+    cache.set('how many jobs are in Riga', 'SELECT 2', embedding)
+    assert embed.calls == ['how many jobs are in riga']
+
+
+def test_semantic_hit_needs_the_same_literals():
+    cache = SemanticSqlCache(CountingEmbed())
+    cache.set('Jobs paying over 2000 in Riga', 'SELECT 2000')
+
+    assert cache.get('jobs paying more than 2000 in Riga') == 'SELECT 2000'
+    assert cache.get('Jobs paying over 3000 in Riga') is None
+    assert cache.get('Jobs paying over 2000 in Liepaja') is None
+    assert cache.stats()['semantic_hits'] == 1
+
+
+def test_question_literals():
+    assert question_literals('Show jobs over 2 500.50 at "Rimi" in Riga') == ('2', '500.50', '"rimi"', 'riga')
+    assert question_literals("What's the average salary?") == ()
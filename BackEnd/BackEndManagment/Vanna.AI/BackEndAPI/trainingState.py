@@ -0,0 +1,128 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+
+from vanna.types import TrainingPlan, TrainingPlanItem
+from vanna.utils import deterministic_uuid
+
+STATE_FILE = 'training_state.json'
+
+# Only the connected database, not every schema on the server.
+SCHEMA_QUERY = (
+    "SELECT * FROM INFORMATION_SCHEMA.COLUMNS "
+    "WHERE TABLE_SCHEMA = DATABASE() "
+    "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+)
+
+
+def item_id(item):
+    """The id ChromaDB_VectorStore stores a training plan item under."""
+    if item.item_type == TrainingPlanItem.ITEM_TYPE_DDL:
+        return deterministic_uuid(item.item_value) + "-ddl"
+    if item.item_type == TrainingPlanItem.ITEM_TYPE_SQL:
+        question_sql_json = json.dumps({"question": item.item_name, "sql": item.item_value}, ensure_ascii=False)
+        return deterministic_uuid(question_sql_json) + "-sql"
+    return deterministic_uuid(item.item_value) + "-doc"
+
+
+def _collection_for(vn, training_id):
+    if training_id.endswith("-ddl"):
+        return vn.ddl_collection
+    if training_id.endswith("-sql"):
+        return vn.sql_collection
+    return vn.documentation_collection
+
+
+def schema_fingerprint(df_info, extra_items=()):
+    digest = hashlib.sha256(df_info.to_csv(index=False).encode('utf-8'))
+    for item in extra_items:
+        digest.update(item_id(item).encode('utf-8'))
+    return digest.hexdigest()
+
+
+def load_state(path):
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save_state(path, state):
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+def ensure_trained(vn, chroma_path='.', extra_items=()):
+    """Bring the persisted Chroma store in line with the current schema.
+
+    The schema of the connected database is fingerprinted; when it matches
+    the fingerprint saved next to the Chroma files nothing is embedded.
+    Otherwise only plan items whose ids are missing from the collections are
+    trained, and items this function trained earlier that no longer exist in
+    the schema are removed.  ``extra_items`` are additional TrainingPlanItems
+    (e.g. hand-written DDL or documentation) managed the same way.
+    """
+    state_path = os.path.join(chroma_path, STATE_FILE)
+    state = load_state(state_path)
+
+    df_info = vn.run_sql(SCHEMA_QUERY)
+    fingerprint = schema_fingerprint(df_info, extra_items)
+    if state.get('fingerprint') == fingerprint and vn.documentation_collection.count() > 0:
+        logging.info("Schema unchanged since last training; skipping")
+        return {'trained': 0, 'removed': 0, 'skipped': True}
+
+    plan_items = vn.get_training_plan_generic(df_info)._plan + list(extra_items)
+    ids = [item_id(item) for item in plan_items]
+
+    pending = []
+    for item, training_id in zip(plan_items, ids):
+        if not _collection_for(vn, training_id).get(ids=[training_id])['ids']:
+            pending.append(item)
+    if pending:
+        vn.train(plan=TrainingPlan(pending))
+
+    removed = 0
+    for stale_id in set(state.get('trained_ids', [])) - set(ids):
+        vn.remove_training_data(stale_id)
+        removed += 1
+
+    save_state(state_path, {'fingerprint': fingerprint, 'trained_ids': ids})
+    logging.info("Training synced: %d item(s) embedded, %d removed", len(pending), removed)
+    return {'trained': len(pending), 'removed': removed, 'skipped': False}
+
+
+def train_full(vn):
+    """Previous behaviour (now scoped to the connected database): embed the whole plan."""
+    df_info = vn.run_sql(SCHEMA_QUERY)
+    vn.train(plan=vn.get_training_plan_generic(df_info))
+
+
+def warm_up_in_background(vn):
+    """Load the embedding model and the collections' indexes off the startup path."""
+    def warm_up():
+        try:
+            embedding = vn.generate_embedding("warm up")
+            for collection in (vn.sql_collection, vn.ddl_collection, vn.documentation_collection):
+                if collection.count():
+                    collection.query(query_embeddings=[embedding], n_results=1)
+            logging.info("Chroma collections warmed up")
+        except Exception as e:
+            logging.warning("Chroma warm-up failed: %s", e)
+
+    thread = threading.Thread(target=warm_up, name='chroma-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+def prepare_training(vn, mode='incremental', chroma_path='.', extra_items=()):
+    """Startup entry point used by both Vanna apps; ``mode`` is 'incremental', 'full' or 'skip'."""
+    if mode == 'full':
+        train_full(vn)
+        vn.train(plan=TrainingPlan(list(extra_items)))
+    elif mode == 'incremental':
+        ensure_trained(vn, chroma_path, extra_items)
+    warm_up_in_background(vn)
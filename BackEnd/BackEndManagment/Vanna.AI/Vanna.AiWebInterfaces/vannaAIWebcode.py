@@ -1,7 +1,21 @@
+import logging
+import os
+import sys
+
 from vanna.openai import OpenAI_Chat
 from vanna.chromadb import ChromaDB_VectorStore
 from vanna.flask import VannaFlaskApp
 
+# Shares the training-state helpers with the chat API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BackEndAPI'))
+from summaryTraining import summary_training_items
+from trainingState import prepare_training
+
+logging.basicConfig(level=logging.INFO)
+
+CHROMA_PATH = os.environ.get('VANNA_CHROMA_PATH', os.path.dirname(os.path.abspath(__file__)))
+TRAINING_MODE = os.environ.get('VANNA_TRAINING_MODE', 'incremental')
+
 class MyVanna(ChromaDB_VectorStore, OpenAI_Chat):
     def __init__(self, config=None):
         ChromaDB_VectorStore.__init__(self, config=config)
@@ -9,7 +23,8 @@ class MyVanna(ChromaDB_VectorStore, OpenAI_Chat):
 
 vn = MyVanna(config={
     'api_key': '',
-    'model': 'gpt-4o-mini'
+    'model': 'gpt-4o-mini',
+    'path': CHROMA_PATH
 })
 
 
@@ -21,10 +36,9 @@ vn.connect_to_mysql( # Slack Nosūtīti ja nepieciešams
     port=3306
 )
 
-    
-df_info = vn.run_sql("SELECT * FROM INFORMATION_SCHEMA.COLUMNS")
-plan = vn.get_training_plan_generic(df_info)
-vn.train(plan=plan)
+
+# Embeds only schema changes; an unchanged schema skips training entirely
+prepare_training(vn, mode=TRAINING_MODE, chroma_path=CHROMA_PATH, extra_items=summary_training_items())
 
 # Create the Flask app & run it
 app = VannaFlaskApp(vn, allow_llm_to_see_data=True)
@@ -0,0 +1,68 @@
+import json
+import os
+import threading
+
+
+class CrawlState:
+    """Per-category crawl bookkeeping kept in a local JSON file between runs.
+
+    For every category it stores the newest listing URL seen (the high-water
+    mark of the date-sorted results), the ETag / Last-Modified validators
+    of each listing page, used for conditional GETs on the next run, and the
+    page that failed in the last run, if any.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self._data = json.load(f)
+
+    def _category(self, category_id):
+        return self._data.setdefault(str(category_id), {'newest_url': None, 'pages': {}})
+
+    def newest_url(self, category_id):
+        with self._lock:
+            return self._category(category_id)['newest_url']
+
+    def set_newest_url(self, category_id, url):
+        with self._lock:
+            self._category(category_id)['newest_url'] = url
+
+    def failed_page(self, category_id):
+        with self._lock:
+            return self._category(category_id).get('failed_page', 0)
+
+    def set_failed_page(self, category_id, page):
+        with self._lock:
+            self._category(category_id)['failed_page'] = page
+
+    def conditional_headers(self, category_id, page_url):
+        with self._lock:
+            validators = self._category(category_id)['pages'].get(page_url, {})
+        headers = {}
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+        return headers
+
+    def record_page(self, category_id, page_url, response_headers):
+        etag = response_headers.get('ETag')
+        last_modified = response_headers.get('Last-Modified')
+        with self._lock:
+            pages = self._category(category_id)['pages']
+            if etag or last_modified:
+                pages[page_url] = {'etag': etag, 'last_modified': last_modified}
+            else:
+                pages.pop(page_url, None)
+
+    def save(self):
+        with self._lock:
+            data = json.dumps(self._data, ensure_ascii=False, indent=1)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(data)
+        os.replace(tmp_path, self.path)
@@ -0,0 +1,138 @@
+import logging
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Errors worth another attempt; any other RequestException (too many redirects,
+# an invalid URL, ...) fails the page straight away.
+RETRY_ERRORS = (
+    requests.ConnectionError, requests.Timeout,
+    requests.exceptions.ChunkedEncodingError, requests.exceptions.ContentDecodingError
+)
+
+
+class RateLimiter:
+    """Spaces requests to the same host at least ``1 / requests_per_second`` apart."""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, host):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class FetchResult:
+    def __init__(self, url, status=None, text='', headers=None, error=None, attempts=0, elapsed=0.0):
+        self.url = url
+        self.status = status
+        self.text = text
+        self.headers = headers or {}
+        self.error = error
+        self.attempts = attempts
+        self.elapsed = elapsed
+
+    @property
+    def ok(self):
+        return self.error is None and self.status is not None and 200 <= self.status < 300
+
+
+class FetchEngine:
+    """Concurrent page fetcher sharing one keep-alive ``requests.Session``.
+
+    At most ``max_workers`` requests are in flight, each host is rate limited,
+    and connection errors, timeouts, broken responses and 429/5xx responses
+    are retried with exponential backoff, or after the server's Retry-After;
+    a page whose Retry-After exceeds ``max_retry_after`` seconds is given up.
+    Request errors never escape ``fetch``: a page that cannot be fetched is a
+    FetchResult with ``error`` set.  ``timeout`` is passed to requests as-is
+    (seconds, or a ``(connect, read)`` tuple).
+    """
+
+    def __init__(self, max_workers=6, requests_per_second=4.0, timeout=(5, 20),
+                 retries=3, backoff=0.5, max_retry_after=60, headers=None):
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.retries = retries
+        self.backoff = backoff
+        self.max_retry_after = max_retry_after
+        self.rate_limiter = RateLimiter(requests_per_second)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update(headers or {'User-Agent': 'Mozilla/5.0'})
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='fetch')
+
+    def _retry_delay(self, attempt, response=None):
+        if response is not None and response.headers.get('Retry-After', '').isdigit():
+            return float(response.headers['Retry-After'])
+        return self.backoff * (2 ** attempt) * (1 + random.random() * 0.25)
+
+    def fetch(self, url, headers=None):
+        host = urlsplit(url).netloc
+        started = time.monotonic()
+        error = None
+        for attempt in range(self.retries + 1):
+            self.rate_limiter.wait(host)
+            response = None
+            try:
+                response = self.session.get(url, headers=headers, timeout=self.timeout)
+                if response.status_code not in RETRY_STATUSES:
+                    return FetchResult(url, response.status_code, response.text, response.headers,
+                                       attempts=attempt + 1, elapsed=time.monotonic() - started)
+                error = f"HTTP {response.status_code}"
+            except RETRY_ERRORS as e:
+                error = str(e)
+            except requests.RequestException as e:
+                error = str(e)
+                break
+            if attempt == self.retries:
+                break
+            delay = self._retry_delay(attempt, response)
+            if delay > self.max_retry_after:
+                error += f", retry after {delay:.0f}s is over the {self.max_retry_after}s limit"
+                break
+            logging.warning("Fetching %s failed (%s); retrying in %.1fs", url, error, delay)
+            time.sleep(delay)
+        return FetchResult(url, response.status_code if response is not None else None,
+                           error=error, attempts=attempt + 1, elapsed=time.monotonic() - started)
+
+    def submit(self, url, headers=None):
+        return self._executor.submit(self.fetch, url, headers)
+
+    def fetch_all(self, urls):
+        """Fetch ``urls`` concurrently, yielding ``FetchResult``s as they complete."""
+        futures = [self.submit(url) for url in urls]
+        try:
+            for future in as_completed(futures):
+                yield future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,79 @@
+"""Serves saved visidarbi.lv listing pages so crawls can run offline.
+
+For /darba-sludinajumi?categories=<id>&page=<n> it returns
+fixtures/listing_<id>_<n>.html when that file exists, otherwise
+fixtures/listing_page.html.  Pages above --pages return an empty result list.
+
+    python fixtureServer.py --port 8765
+    VISIDARBI_BASE_URL=http://127.0.0.1:8765 python webScraper.py
+"""
+import argparse
+import os
+import random
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+EMPTY_PAGE = b'<html><body><div id="results" class="results"></div></body></html>'
+
+
+def make_handler(fixture_dir, pages, latency, fail_rate):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if latency:
+                time.sleep(latency)
+            if fail_rate and random.random() < fail_rate:
+                self.send_error(503, "Injected failure")
+                return
+            parts = urlsplit(self.path)
+            if parts.path.rstrip('/') != '/darba-sludinajumi':
+                self.send_error(404)
+                return
+            query = parse_qs(parts.query)
+            category = query.get('categories', [''])[0]
+            page = int(query.get('page', ['1'])[0])
+
+            body = EMPTY_PAGE
+            if page <= pages:
+                for name in (f"listing_{category}_{page}.html", "listing_page.html"):
+                    path = os.path.join(fixture_dir, name)
+                    if os.path.exists(path):
+                        with open(path, 'rb') as f:
+                            body = f.read()
+                        break
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--pages', type=int, default=5, help="pages per category that have results")
+    parser.add_argument('--latency', type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument('--fail-rate', type=float, default=0.0, help="share of requests answered with 503")
+    args = parser.parse_args()
+
+    handler = make_handler(args.fixtures, args.pages, args.latency, args.fail_rate)
+    server = ThreadingHTTPServer((args.host, args.port), handler)
+    print(f"Serving {args.fixtures} on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,145 @@
+import hashlib
+import os
+import sys
+import threading
+import time
+
+# Metrics shared with the job and chat APIs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BackEnd', 'BackEndManagment', 'Instrumentation'))
+import perfMetrics
+
+JOB_COLUMNS = (
+    'title', 'company', 'location', 'salary_type',
+    'salary_min', 'salary_max', 'salary_text',
+    'hourly_equiv_min', 'hourly_equiv_max',
+    'monthly_equiv_min', 'monthly_equiv_max',
+    'calculated', 'url', 'deadline', 'category'
+)
+
+URL_POSITION = JOB_COLUMNS.index('url')
+
+# Columns refreshed when a listing is seen again. The category stays as first
+# scraped, since the same listing can appear under several categories.
+UPDATE_COLUMNS = tuple(column for column in JOB_COLUMNS if column not in ('url', 'category'))
+
+# Columns the job API's in-process index filters and searches on (DataBaseAPI/jobIndex.py).
+# Changes to the others show up after the index's periodic rebuild.
+INDEXED_COLUMNS = ('title', 'company', 'location', 'salary_min', 'salary_max')
+_INDEXED_POSITIONS = tuple(JOB_COLUMNS.index(column) for column in INDEXED_COLUMNS)
+
+UPSERT_SQL = (
+    "INSERT INTO jobs (" + ", ".join(JOB_COLUMNS) + ") "
+    "VALUES (" + ", ".join(["%s"] * len(JOB_COLUMNS)) + ") "
+    "ON DUPLICATE KEY UPDATE " + ", ".join(f"{column} = VALUES({column})" for column in UPDATE_COLUMNS)
+)
+
+
+JOBS_WRITTEN = perfMetrics.REGISTRY.counter('scraper_jobs_written_total', "Jobs upserted by the scraper")
+
+
+def url_hash(url):
+    return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+
+def _indexed_values(values):
+    # Salaries come back from decimal(10,2) columns as Decimal
+    return tuple(round(float(value), 2) if column.startswith('salary_') and value is not None else value
+                 for column, value in zip(INDEXED_COLUMNS, values))
+
+
+class JobWriter:
+    """Buffers scraped jobs and upserts them in batches keyed on the listing URL.
+
+    Relies on the unique ``url_hash`` key from
+    BackEnd/BackEndManagment/DataBaseAPI/migrations/003_jobs_url_unique.sql
+    (and the ``salary_text`` column from 004_jobs_salary_text.sql), so
+    re-running a crawl updates rows instead of duplicating them.  Jobs are
+    flushed when ``flush_size`` are buffered or ``flush_interval`` seconds
+    have passed since the last flush; URLs already seen in this run are skipped.
+    """
+
+    def __init__(self, db, flush_size=200, flush_interval=5.0, on_flush=None):
+        self.db = db
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self._cursor = db.cursor()
+        self._buffer = []
+        self._seen = set()
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()
+        self.stats = {'written': 0, 'duplicates': 0, 'flushes': 0}
+
+    def add(self, job):
+        """Queue ``job`` (a dict with JOB_COLUMNS); returns False for an in-run duplicate."""
+        key = url_hash(job['url'])
+        with self._lock:
+            if key in self._seen:
+                self.stats['duplicates'] += 1
+                return False
+            self._seen.add(key)
+            self._buffer.append(tuple(job[column] for column in JOB_COLUMNS))
+            if (len(self._buffer) >= self.flush_size
+                    or time.monotonic() - self._last_flush >= self.flush_interval):
+                self.flush()
+            return True
+
+    def known_urls(self, urls):
+        """Subset of ``urls`` already stored in ``jobs`` or queued earlier in this run."""
+        hashes = {url_hash(url): url for url in urls}
+        with self._lock:
+            known = {url for key, url in hashes.items() if key in self._seen}
+            missing = [key for key in hashes if key not in self._seen]
+            if missing:
+                placeholders = ", ".join(["%s"] * len(missing))
+                self._cursor.execute(f"SELECT url_hash FROM jobs WHERE url_hash IN ({placeholders})", missing)
+                known.update(hashes[row[0]] for row in self._cursor.fetchall())
+        return known
+
+    def flush(self):
+        with self._lock:
+            self._last_flush = time.monotonic()
+            if not self._buffer:
+                return 0
+            rows = self._buffer
+            self._buffer = []
+            with perfMetrics.stage('insert'):
+                hashes = [url_hash(row[URL_POSITION]) for row in rows]
+                placeholders = ", ".join(["%s"] * len(hashes))
+                self._cursor.execute(
+                    f"SELECT url_hash, {', '.join(INDEXED_COLUMNS)} FROM jobs WHERE url_hash IN ({placeholders})",
+                    hashes
+                )
+                stored = {row[0]: _indexed_values(row[1:]) for row in self._cursor.fetchall()}
+                changed = any(
+                    key in stored and stored[key] != _indexed_values(row[pos] for pos in _INDEXED_POSITIONS)
+                    for key, row in zip(hashes, rows)
+                )
+                # mysql.connector rewrites this into one multi-row INSERT per batch.
+                self._cursor.executemany(UPSERT_SQL, rows)
+                # New rows raise MAX(id), which the job API watches.  Known listings whose indexed
+                # columns changed bump the version, so it rebuilds its index and drops cached
+                # responses once this batch is committed; re-crawled unchanged listings do not.
+                if changed:
+                    self._cursor.execute("UPDATE data_version SET version = version + 1 WHERE name = 'jobs'")
+                self.db.commit()
+            JOBS_WRITTEN.inc(len(rows))
+            self.stats['written'] += len(rows)
+            self.stats['flushes'] += 1
+            if self.on_flush:
+                self.on_flush(rows)
+            return len(rows)
+
+    def close(self):
+        self.flush()
+        self._cursor.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.db.rollback()
+            self._cursor.close()
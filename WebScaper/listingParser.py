@@ -0,0 +1,88 @@
+import re
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+try:
+    from lxml import html as lxml_html
+except ImportError:
+    lxml_html = None
+
+ITEM_SELECTOR = 'div.item.premium.big-item'
+FIELD_SELECTORS = {
+    'location': 'li.location span',
+    'company': 'li.company span',
+    'salary_text': 'li.salary span',
+    'deadline': 'li.duedate span'
+}
+
+
+def _has_class(name):
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+ITEM_XPATH = f"//div[{_has_class('item')} and {_has_class('premium')} and {_has_class('big-item')}]"
+TITLE_XPATH = f".//a[{_has_class('long-title')}]"
+FIELD_XPATHS = {
+    'location': f".//li[{_has_class('location')}]//span",
+    'company': f".//li[{_has_class('company')}]//span",
+    'salary_text': f".//li[{_has_class('salary')}]//span",
+    'deadline': f".//li[{_has_class('duedate')}]//span"
+}
+
+# Only the listing cards are built into a tree; headers, menus and footers are skipped.
+# A regex because newer bs4 versions match a plain string against the whole class attribute.
+_ITEM_STRAINER = SoupStrainer('div', class_=re.compile(r'(^|\s)big-item(\s|$)'))
+
+
+def _extract_soup(soup):
+    items = []
+    for item in soup.select(ITEM_SELECTOR):
+        title_tag = item.select_one('a.long-title')
+        if not title_tag:
+            continue
+        fields = {}
+        for field, selector in FIELD_SELECTORS.items():
+            tag = item.select_one(selector)
+            fields[field] = tag.text.strip() if tag else ''
+        items.append({'title': title_tag.text.strip(), 'href': title_tag['href'], **fields})
+    return items
+
+
+def extract_html_parser(html):
+    """Reference path: full document through BeautifulSoup's html.parser."""
+    return _extract_soup(BeautifulSoup(html, 'html.parser'))
+
+
+def extract_lxml_strainer(html):
+    return _extract_soup(BeautifulSoup(html, 'lxml', parse_only=_ITEM_STRAINER))
+
+
+def extract_xpath(html):
+    """Direct lxml tree and XPath, without building BeautifulSoup objects."""
+    tree = lxml_html.fromstring(html)
+    items = []
+    for item in tree.xpath(ITEM_XPATH):
+        titles = item.xpath(TITLE_XPATH)
+        if not titles:
+            continue
+        title_tag = titles[0]
+        fields = {}
+        for field, xpath in FIELD_XPATHS.items():
+            found = item.xpath(xpath)
+            fields[field] = found[0].text_content().strip() if found else ''
+        items.append({'title': title_tag.text_content().strip(), 'href': title_tag.get('href'), **fields})
+    return items
+
+
+PARSERS = {
+    'html.parser': extract_html_parser,
+    'lxml-strainer': extract_lxml_strainer,
+    'xpath': extract_xpath
+}
+
+DEFAULT_PARSER = 'xpath' if lxml_html is not None else 'html.parser'
+
+
+def extract_items(html, parser=DEFAULT_PARSER):
+    """Raw fields of every premium listing card on a results page."""
+    return PARSERS[parser](html)
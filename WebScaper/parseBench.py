@@ -0,0 +1,83 @@
+"""Parity check and micro-benchmark for the listing page parsers.
+
+Every parser in listingParser.PARSERS must extract exactly what the reference
+html.parser path does from each saved page in fixtures/; the script then
+reports pages per second for each parser.  Exits non-zero on any mismatch.
+
+    python parseBench.py
+    python parseBench.py --iterations 200 --fixtures path/to/saved/pages
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+from listingParser import PARSERS, extract_html_parser, lxml_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def load_pages(fixture_dir):
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.html'))):
+        with open(path, encoding='utf-8') as f:
+            pages[os.path.basename(path)] = f.read()
+    return pages
+
+
+def available_parsers():
+    if lxml_html is None:
+        print("lxml is not installed; only html.parser is checked")
+        return {'html.parser': PARSERS['html.parser']}
+    return PARSERS
+
+
+def check_parity(pages, parsers):
+    mismatches = 0
+    for name, html in pages.items():
+        expected = extract_html_parser(html)
+        for parser_name, extract in parsers.items():
+            got = extract(html)
+            if got != expected:
+                mismatches += 1
+                print(f"MISMATCH {parser_name} on {name}:\n  expected {expected}\n  got      {got}")
+        print(f"{name}: {len(expected)} listings")
+    return mismatches
+
+
+def benchmark(pages, parsers, iterations):
+    documents = list(pages.values())
+    results = {}
+    for parser_name, extract in parsers.items():
+        started = time.perf_counter()
+        for _ in range(iterations):
+            for html in documents:
+                extract(html)
+        elapsed = time.perf_counter() - started
+        results[parser_name] = iterations * len(documents) / elapsed
+    baseline = results['html.parser']
+    for parser_name, pages_per_second in results.items():
+        print(f"{parser_name:<14} {pages_per_second:10.1f} pages/s  {pages_per_second / baseline:5.1f}x")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--fixtures', default=FIXTURE_DIR)
+    parser.add_argument('--iterations', type=int, default=100)
+    args = parser.parse_args()
+
+    pages = load_pages(args.fixtures)
+    if not pages:
+        sys.exit(f"No .html pages in {args.fixtures}")
+    parsers = available_parsers()
+
+    mismatches = check_parity(pages, parsers)
+    benchmark(pages, parsers, args.iterations)
+    if mismatches:
+        sys.exit(f"{mismatches} parser mismatch(es)")
+
+
+if __name__ == '__main__':
+    main()
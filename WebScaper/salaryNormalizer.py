@@ -0,0 +1,163 @@
+import logging
+import re
+
+import numpy as np
+import pandas as pd
+
+SALARY_RULES = {
+    'hours_per_month': 160,
+    # Without a unit in the text, amounts from here up are monthly ...
+    'monthly_from': 500,
+    # ... and amounts up to here are hourly (in between counts as monthly)
+    'hourly_up_to': 30,
+    'hourly_keywords': ['hour', '/h', '€/h', 'per hour', '/st.', 'stundā', 'st.', 'h']
+}
+
+# The text has ',' turned into '.' first, so "12,50" reads as 12.5
+_NUMBER = re.compile(r'\d+(?:\.\d+)?')
+
+SALARY_COLUMNS = (
+    'salary_type', 'salary_min', 'salary_max',
+    'hourly_equiv_min', 'hourly_equiv_max',
+    'monthly_equiv_min', 'monthly_equiv_max'
+)
+
+
+def _keyword_pattern(keywords):
+    return re.compile('|'.join(re.escape(keyword) for keyword in keywords))
+
+
+def parse_salary_text(salary_text):
+    """salary_min / salary_max from the first two numbers of each text (NaN when there are none)."""
+    numbers = salary_text.fillna('').str.replace(',', '.', regex=False).str.findall(_NUMBER)
+    salary_min = pd.to_numeric(numbers.str[0])
+    salary_max = pd.to_numeric(numbers.str[1]).fillna(salary_min)
+    return salary_min, salary_max
+
+
+def classify_salary(salary_max, salary_text, rules=SALARY_RULES):
+    hinted = salary_text.fillna('').str.lower().str.contains(_keyword_pattern(rules['hourly_keywords']))
+    by_amount = np.where(
+        salary_max >= rules['monthly_from'], 'monthly',
+        np.where(salary_max <= rules['hourly_up_to'], 'hourly', 'monthly')
+    )
+    return pd.Series(np.where(hinted, 'hourly', by_amount), index=salary_text.index)
+
+
+def _round_cents(values):
+    # Python's round(), not NumPy's: NumPy scales by 100 first and can land a cent off
+    # on half-cent amounts (e.g. 503.20 / 160)
+    return values.map(lambda value: round(value, 2))
+
+
+def salary_equivalents(salary_min, salary_max, salary_type, rules=SALARY_RULES):
+    hours = rules['hours_per_month']
+    hourly = (salary_type == 'hourly').to_numpy()
+    return {
+        'hourly_equiv_min': np.where(hourly, salary_min, _round_cents(salary_min / hours)),
+        'hourly_equiv_max': np.where(hourly, salary_max, _round_cents(salary_max / hours)),
+        'monthly_equiv_min': np.where(hourly, _round_cents(salary_min * hours), salary_min),
+        'monthly_equiv_max': np.where(hourly, _round_cents(salary_max * hours), salary_max)
+    }
+
+
+def normalize_salaries(df, rules=SALARY_RULES):
+    """Salary type and hourly/monthly equivalents for a frame of listings.
+
+    Rows with ``salary_text`` are parsed and classified from the text.
+    Rows without it (stored before the text was kept) keep their
+    ``salary_min``, ``salary_max`` and ``salary_type`` and only get the
+    equivalents recomputed.  Rows with no amount at all have a NaN
+    ``salary_min``; everything else is marked ``calculated``.
+    """
+    out = df.copy()
+    for column in ('salary_text', 'salary_type', 'salary_min', 'salary_max'):
+        if column not in out:
+            out[column] = None
+    has_text = out['salary_text'].notna()
+
+    text = out.loc[has_text, 'salary_text']
+    salary_min, salary_max = parse_salary_text(text)
+    out.loc[has_text, 'salary_min'] = salary_min
+    out.loc[has_text, 'salary_max'] = salary_max
+    out.loc[has_text, 'salary_type'] = classify_salary(salary_max, text, rules)
+
+    out['salary_min'] = pd.to_numeric(out['salary_min'])
+    out['salary_max'] = pd.to_numeric(out['salary_max'])
+    for column, values in salary_equivalents(out['salary_min'], out['salary_max'], out['salary_type'], rules).items():
+        out[column] = values
+    out['calculated'] = out['salary_min'].notna()
+    return out
+
+
+BACKFILL_TABLE = """
+    CREATE TEMPORARY TABLE IF NOT EXISTS salary_backfill (
+        id int(11) NOT NULL PRIMARY KEY,
+        salary_type varchar(16),
+        salary_min decimal(10,2),
+        salary_max decimal(10,2),
+        hourly_equiv_min decimal(10,2),
+        hourly_equiv_max decimal(10,2),
+        monthly_equiv_min decimal(10,2),
+        monthly_equiv_max decimal(10,2)
+    )
+"""
+
+BACKFILL_UPDATE = (
+    "UPDATE jobs JOIN salary_backfill USING (id) SET "
+    + ", ".join(f"jobs.{column} = salary_backfill.{column}" for column in SALARY_COLUMNS)
+    + ", jobs.calculated = 1"
+)
+
+
+def _to_rows(df):
+    frame = df[['id', *SALARY_COLUMNS]].astype(object)
+    return list(frame.where(frame.notna(), None).itertuples(index=False, name=None))
+
+
+def backfill_salaries(db, chunk_size=5000, all_rows=False, rules=SALARY_RULES, progress=None):
+    """Recompute salary columns in ``jobs`` in id-ordered chunks; returns the number of rows updated.
+
+    By default only rows with ``calculated = 0`` are touched; ``all_rows``
+    re-normalizes the whole table after a rule change.  Each chunk is read,
+    normalized in one pass, loaded into a temporary table and applied with a
+    single UPDATE ... JOIN, then committed.
+    """
+    cursor = db.cursor(dictionary=True)
+    cursor.execute(BACKFILL_TABLE)
+    where = "" if all_rows else "calculated = 0 AND "
+    last_id = 0
+    updated = 0
+    try:
+        while True:
+            cursor.execute(
+                "SELECT id, salary_text, salary_type, salary_min, salary_max FROM jobs "
+                f"WHERE {where}id > %s ORDER BY id LIMIT %s",
+                (last_id, chunk_size)
+            )
+            chunk = cursor.fetchall()
+            if not chunk:
+                break
+            last_id = chunk[-1]['id']
+
+            normalized = normalize_salaries(pd.DataFrame(chunk), rules)
+            normalized = normalized[normalized['calculated']]
+            if not normalized.empty:
+                cursor.execute("DELETE FROM salary_backfill")
+                cursor.executemany(
+                    "INSERT INTO salary_backfill (id, " + ", ".join(SALARY_COLUMNS) + ") "
+                    "VALUES (" + ", ".join(["%s"] * (len(SALARY_COLUMNS) + 1)) + ")",
+                    _to_rows(normalized)
+                )
+                cursor.execute(BACKFILL_UPDATE)
+                cursor.execute("UPDATE data_version SET version = version + 1 WHERE name = 'jobs'")
+                db.commit()
+                updated += len(normalized)
+
+            logging.info("Salary backfill: %d rows updated (up to id %d)", updated, last_id)
+            if progress:
+                progress(updated, last_id)
+    finally:
+        cursor.execute("DROP TEMPORARY TABLE IF EXISTS salary_backfill")
+        cursor.close()
+    return updated
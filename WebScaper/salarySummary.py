@@ -0,0 +1,118 @@
+import logging
+
+# Tables from BackEnd/BackEndManagment/DataBaseAPI/migrations/005_salary_summaries.sql
+SUMMARY_CONFIG = {
+    'enabled': True,
+    # Width of the job_salary_histogram buckets, in monthly euros
+    'bucket_width': 500
+}
+
+STATE_NAME = 'salary_summary'
+
+# Every job counts once under each dimension
+_BATCH = " UNION ALL ".join(
+    f"SELECT '{dimension}' AS dimension, COALESCE({dimension}, '') AS value, "
+    "monthly_equiv_min, monthly_equiv_max FROM jobs WHERE id > %s AND id <= %s"
+    for dimension in ('category', 'location', 'salary_type')
+)
+
+SUMMARY_MERGE = (
+    "INSERT INTO job_salary_summary (dimension, value, jobs, salary_jobs, monthly_min, monthly_max, "
+    "monthly_min_sum, monthly_max_sum) "
+    "SELECT dimension, value, COUNT(*), COUNT(monthly_equiv_max), MIN(monthly_equiv_min), MAX(monthly_equiv_max), "
+    "COALESCE(SUM(monthly_equiv_min), 0), COALESCE(SUM(monthly_equiv_max), 0) "
+    f"FROM ({_BATCH}) AS batch GROUP BY dimension, value "
+    "ON DUPLICATE KEY UPDATE "
+    "jobs = jobs + VALUES(jobs), "
+    "salary_jobs = salary_jobs + VALUES(salary_jobs), "
+    # LEAST/GREATEST return NULL if either side is NULL
+    "monthly_min = LEAST(COALESCE(monthly_min, VALUES(monthly_min)), COALESCE(VALUES(monthly_min), monthly_min)), "
+    "monthly_max = GREATEST(COALESCE(monthly_max, VALUES(monthly_max)), COALESCE(VALUES(monthly_max), monthly_max)), "
+    "monthly_min_sum = monthly_min_sum + VALUES(monthly_min_sum), "
+    "monthly_max_sum = monthly_max_sum + VALUES(monthly_max_sum)"
+)
+
+HISTOGRAM_MERGE = (
+    "INSERT INTO job_salary_histogram (dimension, value, bucket_from, bucket_to, jobs) "
+    "SELECT dimension, value, FLOOR(monthly_equiv_max / %s) * %s AS bucket_start, "
+    "FLOOR(monthly_equiv_max / %s) * %s + %s, COUNT(*) "
+    f"FROM ({_BATCH}) AS batch WHERE monthly_equiv_max IS NOT NULL "
+    "GROUP BY dimension, value, bucket_start "
+    "ON DUPLICATE KEY UPDATE jobs = jobs + VALUES(jobs)"
+)
+
+
+def _batch_params(last_id, max_id):
+    return (last_id, max_id) * 3
+
+
+def refresh_summaries(db, config=SUMMARY_CONFIG):
+    """Add jobs above the watermark to the summary tables; returns the id range applied.
+
+    Runs in one transaction, so readers see either the old or the new
+    totals.  Existing rows updated by an upsert keep their old contribution
+    until ``rebuild_summaries``.
+    """
+    width = config['bucket_width']
+    cursor = db.cursor(buffered=True)
+    try:
+        cursor.execute("SELECT last_id FROM job_summary_state WHERE name = %s FOR UPDATE", (STATE_NAME,))
+        row = cursor.fetchone()
+        last_id = row[0] if row else 0
+        cursor.execute("SELECT COALESCE(MAX(id), 0) FROM jobs")
+        max_id = cursor.fetchone()[0]
+        if max_id <= last_id:
+            # Still commits, so a rebuild of an empty table keeps its deletes
+            db.commit()
+            return last_id, last_id
+
+        cursor.execute(SUMMARY_MERGE, _batch_params(last_id, max_id))
+        cursor.execute(HISTOGRAM_MERGE, (width,) * 5 + _batch_params(last_id, max_id))
+        cursor.execute(
+            "INSERT INTO job_summary_state (name, last_id) VALUES (%s, %s) "
+            "ON DUPLICATE KEY UPDATE last_id = VALUES(last_id)",
+            (STATE_NAME, max_id)
+        )
+        # The job API caches /salary-summary per data version
+        cursor.execute(
+            "INSERT INTO data_version (name, version) VALUES ('job_summaries', 1) "
+            "ON DUPLICATE KEY UPDATE version = version + 1"
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+    logging.info("Salary summaries updated with jobs %d-%d", last_id + 1, max_id)
+    return last_id, max_id
+
+
+def rebuild_summaries(db, config=SUMMARY_CONFIG):
+    """Recompute the summary tables from the whole jobs table."""
+    cursor = db.cursor()
+    try:
+        cursor.execute("DELETE FROM job_salary_summary")
+        cursor.execute("DELETE FROM job_salary_histogram")
+        cursor.execute(
+            "INSERT INTO job_summary_state (name, last_id) VALUES (%s, 0) "
+            "ON DUPLICATE KEY UPDATE last_id = 0",
+            (STATE_NAME,)
+        )
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        cursor.close()
+    # The deletes commit together with the full refresh
+    return refresh_summaries(db, config)
+
+
+def summary_hook(db, config=SUMMARY_CONFIG):
+    """``on_flush`` callback for JobWriter; a failed refresh is logged, not raised."""
+    def refresh(rows):
+        try:
+            refresh_summaries(db, config)
+        except Exception as e:
+            logging.error("Could not update salary summaries (is migration 005 applied?): %s", e)
+    return refresh
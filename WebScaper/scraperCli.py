@@ -0,0 +1,169 @@
+"""Headless VisiDarbi.lv scraper for servers and cron.
+
+    python scraperCli.py --pages 3                            # one full crawl
+    python scraperCli.py --incremental --pages 10             # stop at already saved listings
+    python scraperCli.py --daemon --interval 900 --incremental
+    python scraperCli.py --backfill-salaries [--all-rows]    # recompute salary columns in place
+    python scraperCli.py --rebuild-summaries                  # recompute the salary summary tables
+    python scraperCli.py --daemon --metrics-port 9105         # also serve GET /metrics
+
+Settings are read from --config (a JSON file), then SCRAPER_* environment
+variables, then command-line flags; later sources win.  Example config:
+
+    {"db": {"host": "localhost", "user": "root", "password": "", "database": "Vakances"},
+     "pages": 3, "incremental": true, "interval": 900}
+"""
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+import time
+
+import mysql.connector
+
+from salaryNormalizer import backfill_salaries
+from salarySummary import SUMMARY_CONFIG, rebuild_summaries
+from scraperCore import run_crawl
+
+# Metrics shared with the job and chat APIs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BackEnd', 'BackEndManagment', 'Instrumentation'))
+import perfMetrics
+
+DEFAULTS = {
+    'db': {'host': 'localhost', 'user': 'root', 'password': '', 'database': 'Vakances', 'port': 3306},
+    'pages': 2,
+    'incremental': False,
+    'interval': 900
+}
+
+ENV_DB_KEYS = {
+    'SCRAPER_DB_HOST': 'host',
+    'SCRAPER_DB_USER': 'user',
+    'SCRAPER_DB_PASSWORD': 'password',
+    'SCRAPER_DB_NAME': 'database',
+    'SCRAPER_DB_PORT': 'port'
+}
+
+
+def load_config(args):
+    config = {key: (dict(value) if isinstance(value, dict) else value) for key, value in DEFAULTS.items()}
+
+    if args.config:
+        with open(args.config, encoding='utf-8') as f:
+            file_config = json.load(f)
+        config['db'].update(file_config.pop('db', {}))
+        config.update(file_config)
+
+    for env_key, db_key in ENV_DB_KEYS.items():
+        if env_key in os.environ:
+            config['db'][db_key] = os.environ[env_key]
+    if 'SCRAPER_PAGES' in os.environ:
+        config['pages'] = os.environ['SCRAPER_PAGES']
+    if 'SCRAPER_INTERVAL' in os.environ:
+        config['interval'] = os.environ['SCRAPER_INTERVAL']
+    if 'SCRAPER_INCREMENTAL' in os.environ:
+        config['incremental'] = os.environ['SCRAPER_INCREMENTAL'].lower() in ('1', 'true', 'yes')
+
+    if args.pages is not None:
+        config['pages'] = args.pages
+    if args.interval is not None:
+        config['interval'] = args.interval
+    if args.incremental:
+        config['incremental'] = True
+
+    config['pages'] = int(config['pages'])
+    config['interval'] = float(config['interval'])
+    config['db']['port'] = int(config['db']['port'])
+    return config
+
+
+def crawl_once(config):
+    def progress(done, total, category_name, page):
+        logging.info("Scraped %d/%d pages (last: %s, page %d)", done, total, category_name, page)
+
+    summary = run_crawl(config['db'], config['pages'], incremental=config['incremental'], progress=progress)
+    logging.info("Crawl finished: %s", summary)
+    return summary
+
+
+def run_backfill(config, all_rows, chunk_size):
+    db = mysql.connector.connect(**config['db'])
+    try:
+        updated = backfill_salaries(db, chunk_size=chunk_size, all_rows=all_rows)
+        # Changed salaries of existing rows are not picked up incrementally
+        if updated and SUMMARY_CONFIG['enabled']:
+            rebuild_summaries(db)
+    finally:
+        db.close()
+    logging.info("Salary backfill finished: %d rows updated", updated)
+    return updated
+
+
+def run_rebuild_summaries(config):
+    db = mysql.connector.connect(**config['db'])
+    try:
+        _, max_id = rebuild_summaries(db)
+    finally:
+        db.close()
+    logging.info("Salary summaries rebuilt from jobs up to id %d", max_id)
+
+
+def run_daemon(config):
+    stop = threading.Event()
+
+    def request_stop(signum, frame):
+        logging.info("Signal %d received, stopping after the current crawl", signum)
+        stop.set()
+
+    signal.signal(signal.SIGTERM, request_stop)
+    signal.signal(signal.SIGINT, request_stop)
+
+    while not stop.is_set():
+        started = time.monotonic()
+        try:
+            crawl_once(config)
+        except Exception:
+            # A failed run (site or database down) should not end the daemon.
+            logging.exception("Crawl failed")
+        stop.wait(max(0.0, config['interval'] - (time.monotonic() - started)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--config', help="JSON config file")
+    parser.add_argument('--pages', type=int, help="pages per category (maximum in incremental mode)")
+    parser.add_argument('--incremental', action='store_true', help="stop paging at already saved listings")
+    parser.add_argument('--daemon', action='store_true', help="crawl repeatedly every --interval seconds")
+    parser.add_argument('--interval', type=float, help="seconds between daemon crawl starts")
+    parser.add_argument('--backfill-salaries', action='store_true',
+                        help="recompute salary type and equivalents of stored jobs instead of crawling")
+    parser.add_argument('--all-rows', action='store_true', help="with --backfill-salaries: every row, not only calculated = 0")
+    parser.add_argument('--chunk-size', type=int, default=5000, help="rows per backfill UPDATE")
+    parser.add_argument('--rebuild-summaries', action='store_true',
+                        help="recompute the salary summary tables from all jobs instead of crawling")
+    parser.add_argument('--metrics-port', type=int, default=os.environ.get('SCRAPER_METRICS_PORT'),
+                        help="serve Prometheus metrics on this port")
+    parser.add_argument('--log-level', default='INFO')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=args.log_level.upper(), format="%(asctime)s %(levelname)s %(message)s")
+    config = load_config(args)
+    if args.metrics_port:
+        perfMetrics.serve_metrics(int(args.metrics_port))
+
+    if args.backfill_salaries:
+        run_backfill(config, args.all_rows, args.chunk_size)
+    elif args.rebuild_summaries:
+        run_rebuild_summaries(config)
+    elif args.daemon:
+        run_daemon(config)
+    else:
+        summary = crawl_once(config)
+        raise SystemExit(1 if summary['pages_failed'] else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,279 @@
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+
+import mysql.connector
+import pandas as pd
+
+from crawlState import CrawlState
+from fetchEngine import FetchEngine
+from jobWriter import JOB_COLUMNS, JobWriter
+from listingParser import DEFAULT_PARSER, extract_items
+from salaryNormalizer import normalize_salaries
+from salarySummary import SUMMARY_CONFIG, summary_hook
+
+# Metrics shared with the job and chat APIs
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'BackEnd', 'BackEndManagment', 'Instrumentation'))
+import perfMetrics
+
+# Point at a local fixture server (see fixtureServer.py) to crawl saved pages
+BASE_URL = os.environ.get('VISIDARBI_BASE_URL', 'https://www.visidarbi.lv')
+
+FETCH_CONFIG = {
+    'max_workers': 6,            # requests in flight across all categories
+    'requests_per_second': 4.0,  # per-host rate limit
+    'timeout': (5, 20),          # connect / read seconds
+    'retries': 3,
+    'backoff': 0.5,              # seconds, doubled per retry
+    'max_retry_after': 60        # seconds; pages asking for a longer Retry-After are given up
+}
+
+PARSE_CONFIG = {
+    'parser': DEFAULT_PARSER,  # 'xpath' (lxml), 'lxml-strainer' or 'html.parser'
+    'processes': 0             # >0 parses full crawls in a process pool alongside fetching
+}
+
+# Per-category high-water marks and page validators for incremental crawls
+STATE_FILE = os.environ.get('SCRAPER_STATE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_state.json'))
+
+WRITER_CONFIG = {
+    'flush_size': 200,     # jobs per multi-row upsert
+    'flush_interval': 5.0  # seconds before a partial batch is written anyway
+}
+
+# === Full category map from Visidarbi.lv ===
+CATEGORIES = {
+    "Pārdošana, Tirdzniecība, Klientu apkalpošana": 14,
+    "Ražošana, Rūpniecība": 16,
+    "Būvniecība, Nekustamais īpašums, Ceļu būve": 4,
+    "Veselības aprūpe, Farmācija": 21,
+    "Pakalpojumi": 13,
+    "Izglītība, Zinātne": 7,
+    "Informāciju tehnoloģijas, Datori": 6,
+    "Transports, Loģistika, Piegāde": 17,
+    "Administrēšana, Asistēšana": 1,
+    "Vadība": 19,
+    "Inženiertehnika": 23,
+    "Tūrisms, Viesnīcas, Ēdināšana": 18,
+    "Bankas, Apdrošināšana, Finanses, Grāmatvedība": 3,
+    "Valsts un pašvaldību pārvalde": 20,
+    "Elektronika, Telekomunikācijas, Enerģētika": 5,
+    "Prakse, Brīvprātīgais darbs": 22,
+    "Mārketings, Reklāma, PR, Mediji": 12,
+    "Lauksaimniecība, Mežsaimniecība, Vide": 10,
+    "Personāla vadība": 15,
+    "Jurisprudence, Tieslietas": 8,
+    "Apsardze, Drošība": 2,
+    "Kultūra, Māksla, Izklaide": 9,
+    "Mājsaimniecība, Apkope": 11
+}
+
+PAGES = perfMetrics.REGISTRY.counter('scraper_pages_total', "Listing pages fetched, by result", ('result',))
+FETCH_SECONDS = perfMetrics.REGISTRY.histogram('scraper_fetch_duration_seconds', "Listing page fetch time, retries included")
+PAGES_PER_SECOND = perfMetrics.REGISTRY.gauge('scraper_last_crawl_pages_per_second', "Pages per second of the last finished crawl")
+
+
+def record_fetch(result):
+    FETCH_SECONDS.observe(result.elapsed)
+    if result.status == 304:
+        PAGES.inc(result='not_modified')
+    else:
+        PAGES.inc(result='ok' if result.ok else 'failed')
+
+def parse_listings_timed(html, category_name, base_url=BASE_URL, parser=PARSE_CONFIG['parser']):
+    # For the process pool: the parse time is recorded by the parent, whose metrics are exported
+    started = time.perf_counter()
+    jobs = parse_listings(html, category_name, base_url, parser)
+    return jobs, time.perf_counter() - started
+
+def listing_url(category_id, page, base_url=BASE_URL):
+    return (f"{base_url}/darba-sludinajumi?sort=date_from&categories={category_id}"
+            f"&salaryFilters=id%3A2%2Cid%3A3%2Cid%3A4%2Cid%3A5&page={page}#results")
+
+def parse_listings(html, category_name, base_url=BASE_URL, parser=PARSE_CONFIG['parser']):
+    items = extract_items(html, parser)
+    if not items:
+        return []
+
+    listings = pd.DataFrame(items)
+    listings['url'] = base_url + listings['href']
+    listings['category'] = category_name
+    listings = normalize_salaries(listings)
+    # Listings without any amount in the salary text are skipped
+    listings = listings[listings['calculated']]
+    return listings[list(JOB_COLUMNS)].to_dict(orient='records')
+
+def scrape_categories(categories, pages, writer, engine, progress=None, base_url=BASE_URL,
+                      parser=PARSE_CONFIG['parser'], parse_pool=None):
+    """Fetch every (category, page) concurrently through ``engine`` and queue the jobs to ``writer``.
+
+    Pages are parsed on this thread, or in ``parse_pool`` (a process pool) so
+    parsing overlaps with fetching; either way only this thread writes.
+    """
+    targets = {
+        listing_url(category_id, page, base_url): (category_name, page)
+        for category_name, category_id in categories.items()
+        for page in range(1, pages + 1)
+    }
+    done = 0
+    failed = 0
+    parsing = {}
+
+    def page_done(category_name, page):
+        nonlocal done
+        done += 1
+        if progress:
+            progress(done, len(targets), category_name, page)
+
+    def save_parsed(futures):
+        for future in futures:
+            category_name, page = parsing.pop(future)
+            jobs, parse_seconds = future.result()
+            perfMetrics.record_stage('parse', parse_seconds)
+            for job in jobs:
+                writer.add(job)
+            page_done(category_name, page)
+
+    for result in engine.fetch_all(targets):
+        category_name, page = targets[result.url]
+        record_fetch(result)
+        if not result.ok:
+            failed += 1
+            logging.error("Giving up on %s page %d: %s", category_name, page, result.error or result.status)
+            page_done(category_name, page)
+        elif parse_pool is not None:
+            future = parse_pool.submit(parse_listings_timed, result.text, category_name, base_url, parser)
+            parsing[future] = (category_name, page)
+            save_parsed([future for future in parsing if future.done()])
+        else:
+            with perfMetrics.stage('parse'):
+                jobs = parse_listings(result.text, category_name, base_url, parser)
+            for job in jobs:
+                writer.add(job)
+            page_done(category_name, page)
+
+    save_parsed(list(as_completed(parsing)))
+    return len(targets), failed
+
+def crawl_incremental(categories, max_pages, writer, engine, state, progress=None, base_url=BASE_URL,
+                      parser=PARSE_CONFIG['parser']):
+    """Walk each category newest-first and stop at the first page with nothing new.
+
+    Categories are crawled concurrently, pages within a category one after
+    another.  A page counts as fully known when it answers 304 to a
+    conditional GET, contains the previous run's newest URL, or holds only
+    URLs already in the database.  A category with a failed page keeps its
+    previous newest URL and ETags and remembers that page, so the next run
+    pages at least that far.  The caller saves ``state`` once the writer has
+    committed.
+    """
+    pending = {}
+    fetched = 0
+    failed = 0
+    previous_newest = {category_id: state.newest_url(category_id) for category_id in categories.values()}
+    retry_up_to = {category_id: state.failed_page(category_id) for category_id in categories.values()}
+    # Applied to the state only for categories that had no failed page
+    newest = {}
+    validators = {}
+    failed_pages = {}
+
+    def submit(category_name, category_id, page):
+        url = listing_url(category_id, page, base_url)
+        future = engine.submit(url, state.conditional_headers(category_id, url))
+        pending[future] = (category_name, category_id, page)
+
+    for category_name, category_id in categories.items():
+        submit(category_name, category_id, 1)
+
+    while pending:
+        finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+        for future in finished:
+            category_name, category_id, page = pending.pop(future)
+            result = future.result()
+            record_fetch(result)
+            fetched += 1
+            keep_paging = False
+
+            if result.status == 304:
+                logging.info("%s page %d unchanged since last crawl", category_name, page)
+                keep_paging = page < retry_up_to[category_id]
+            elif result.ok:
+                validators.setdefault(category_id, []).append((result.url, result.headers))
+                with perfMetrics.stage('parse'):
+                    jobs = parse_listings(result.text, category_name, base_url, parser)
+                urls = [job['url'] for job in jobs]
+                known = writer.known_urls(urls)
+                if page == 1 and urls:
+                    newest[category_id] = urls[0]
+                for job in jobs:
+                    if job['url'] not in known:
+                        writer.add(job)
+                keep_paging = bool(urls) and (page < retry_up_to[category_id] or (
+                    previous_newest[category_id] not in urls and len(known) < len(set(urls))))
+            else:
+                failed += 1
+                failed_pages[category_id] = page
+                logging.error("Giving up on %s page %d: %s", category_name, page, result.error or result.status)
+
+            if keep_paging and page < max_pages:
+                submit(category_name, category_id, page + 1)
+            if progress:
+                progress(fetched, fetched + len(pending), category_name, page)
+
+    for category_id in categories.values():
+        if category_id in failed_pages:
+            state.set_failed_page(category_id, max(failed_pages[category_id], retry_up_to[category_id]))
+            continue
+        for url, headers in validators.get(category_id, ()):
+            state.record_page(category_id, url, headers)
+        if category_id in newest:
+            state.set_newest_url(category_id, newest[category_id])
+        state.set_failed_page(category_id, 0)
+    return fetched, failed
+
+def run_crawl(db_config, pages, incremental=False, progress=None, categories=CATEGORIES,
+              fetch_config=FETCH_CONFIG, writer_config=WRITER_CONFIG, state_file=STATE_FILE,
+              parse_config=PARSE_CONFIG, summary_config=SUMMARY_CONFIG):
+    """Run one full or incremental crawl and return a summary dict.
+
+    Full crawls parse in a process pool when ``parse_config['processes']`` is
+    set; incremental crawls parse inline since each page decides the next.
+    ``db_config`` holds mysql.connector connection arguments; ``progress`` is
+    called as ``progress(done, total, category_name, page)`` from the calling
+    thread after every page.  With ``summary_config['enabled']`` the salary
+    summary tables are brought up to date after every committed batch.
+    """
+    started = time.monotonic()
+    db = mysql.connector.connect(**db_config)
+    try:
+        on_flush = summary_hook(db, summary_config) if summary_config['enabled'] else None
+        state = CrawlState(state_file) if incremental else None
+        with FetchEngine(**fetch_config) as engine, JobWriter(db, on_flush=on_flush, **writer_config) as writer:
+            if incremental:
+                fetched, failed = crawl_incremental(categories, pages, writer, engine, state, progress,
+                                                    parser=parse_config['parser'])
+            elif parse_config['processes']:
+                with ProcessPoolExecutor(max_workers=parse_config['processes']) as parse_pool:
+                    fetched, failed = scrape_categories(categories, pages, writer, engine, progress,
+                                                        parser=parse_config['parser'], parse_pool=parse_pool)
+            else:
+                fetched, failed = scrape_categories(categories, pages, writer, engine, progress,
+                                                    parser=parse_config['parser'])
+        # Only after the writer's last flush committed: the saved newest URLs and
+        # ETags make the next run skip these pages.
+        if state is not None:
+            state.save()
+    finally:
+        db.close()
+    seconds = time.monotonic() - started
+    PAGES_PER_SECOND.set(round(fetched / seconds, 2) if seconds else 0)
+    return {
+        'pages': fetched,
+        'pages_failed': failed,
+        'pages_per_second': round(fetched / seconds, 2) if seconds else 0,
+        'written': writer.stats['written'],
+        'duplicates': writer.stats['duplicates'],
+        'seconds': round(seconds, 2)
+    }
@@ -0,0 +1,38 @@
+import contextlib
+import os
+import sys
+import threading
+from http.server import ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from fetchEngine import FetchEngine
+
+
+class QuietServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        # Clients dropping broken or slow responses are expected here
+        pass
+
+
+@contextlib.contextmanager
+def serve(handler):
+    """Serve ``handler`` on a free local port for the duration of the block; yields the base URL."""
+    server = QuietServer(('127.0.0.1', 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+def engine(**kwargs):
+    """FetchEngine with test-friendly defaults: no rate limit, short timeouts and backoff."""
+    options = {'max_workers': 4, 'requests_per_second': 0, 'timeout': 2, 'retries': 2, 'backoff': 0.01}
+    options.update(kwargs)
+    return FetchEngine(**options)
@@ -0,0 +1,72 @@
+from urllib.parse import parse_qs, urlsplit
+
+from conftest import engine, serve
+from crawlState import CrawlState
+from fixtureServer import FIXTURE_DIR, make_handler
+from scraperCore import crawl_incremental
+
+CATEGORIES = {"Transports, Loģistika, Piegāde": 17}
+
+
+class MemoryWriter:
+    """The JobWriter calls crawl_incremental makes, storing URLs in memory."""
+
+    def __init__(self):
+        self.urls = set()
+
+    def known_urls(self, urls):
+        return self.urls.intersection(urls)
+
+    def add(self, job):
+        self.urls.add(job['url'])
+        return True
+
+
+def failing_handler():
+    """Fixture pages (3 per category); pages listed in ``failing`` answer 503."""
+    class FailingHandler(make_handler(FIXTURE_DIR, 3, 0.0, 0.0)):
+        failing = set()
+        requested = []
+
+        def do_GET(self):
+            page = int(parse_qs(urlsplit(self.path).query).get('page', ['1'])[0])
+            self.requested.append(page)
+            if page in self.failing:
+                self.send_error(503, "Injected failure")
+                return
+            super().do_GET()
+
+    return FailingHandler
+
+
+def crawl(base_url, writer, state_file):
+    state = CrawlState(state_file)
+    with engine(retries=0) as fetch_engine:
+        result = crawl_incremental(CATEGORIES, 5, writer, fetch_engine, state, base_url=base_url)
+    state.save()
+    return result
+
+
+def test_failed_page_is_fetched_on_the_next_run(tmp_path):
+    state_file = str(tmp_path / 'crawl_state.json')
+    writer = MemoryWriter()
+    handler = failing_handler()
+    with serve(handler) as base_url:
+        handler.failing.add(2)
+        assert crawl(base_url, writer, state_file) == (2, 1)
+        assert CrawlState(state_file).newest_url(17) is None
+        stored_after_failure = len(writer.urls)
+
+        # Page 1 is now all known, but page 2 was missed last time
+        handler.failing.clear()
+        handler.requested.clear()
+        assert crawl(base_url, writer, state_file) == (3, 0)
+        assert handler.requested == [1, 2, 3]
+        assert len(writer.urls) > stored_after_failure
+        state = CrawlState(state_file)
+        assert state.newest_url(17) is not None
+        assert state.failed_page(17) == 0
+
+        handler.requested.clear()
+        assert crawl(base_url, writer, state_file) == (1, 0)
+        assert handler.requested == [1]
@@ -0,0 +1,151 @@
+import time
+from http.server import BaseHTTPRequestHandler
+from types import SimpleNamespace
+
+import fixtureServer
+from conftest import engine, serve
+from fixtureServer import FIXTURE_DIR, make_handler
+from scraperCore import listing_url
+
+
+def recording(handler):
+    """``handler`` noting the arrival time of every request in ``arrivals``."""
+    class RecordingHandler(handler):
+        arrivals = []
+
+        def do_GET(self):
+            self.arrivals.append(time.monotonic())
+            super().do_GET()
+
+    return RecordingHandler
+
+
+def scripted(*responses):
+    """Handler answering each request with the next ``(status, headers, body)``, the last one repeating."""
+    class ScriptedHandler(BaseHTTPRequestHandler):
+        remaining = list(responses)
+
+        def do_GET(self):
+            status, headers, body = self.remaining.pop(0) if len(self.remaining) > 1 else self.remaining[0]
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            if 'Transfer-Encoding' not in headers:
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ScriptedHandler
+
+
+def fixture_handler(pages=2, latency=0.0, fail_rate=0.0):
+    return recording(make_handler(FIXTURE_DIR, pages, latency, fail_rate))
+
+
+def test_fetch_all_returns_every_page():
+    with serve(fixture_handler(pages=2)) as base_url, engine() as fetch_engine:
+        urls = [listing_url(17, page, base_url) for page in (1, 2, 3)]
+        results = {result.url: result for result in fetch_engine.fetch_all(urls)}
+
+    assert set(results) == set(urls)
+    assert all(result.ok and result.attempts == 1 for result in results.values())
+    assert 'big-item' in results[urls[0]].text
+    assert 'big-item' not in results[urls[2]].text
+
+
+def test_injected_503s_are_retried(monkeypatch):
+    # The first two requests draw a failure, later ones succeed
+    draws = iter([0.0, 0.0])
+    monkeypatch.setattr(fixtureServer, 'random', SimpleNamespace(random=lambda: next(draws, 1.0)))
+    handler = fixture_handler(fail_rate=0.5)
+    with serve(handler) as base_url, engine() as fetch_engine:
+        result = fetch_engine.fetch(listing_url(17, 1, base_url))
+
+    assert result.ok
+    assert result.attempts == 3
+    assert len(handler.arrivals) == 3
+
+
+def test_failed_pages_are_reported_not_raised():
+    handler = fixture_handler(fail_rate=1.0)
+    with serve(handler) as base_url, engine() as fetch_engine:
+        urls = [listing_url(17, page, base_url) for page in (1, 2)]
+        results = list(fetch_engine.fetch_all(urls))
+
+    assert len(results) == 2
+    for result in results:
+        assert not result.ok
+        assert result.status == 503
+        assert result.error == "HTTP 503"
+        assert result.attempts == 3
+    assert len(handler.arrivals) == 6
+
+
+def test_requests_to_one_host_are_spaced():
+    handler = fixture_handler()
+    with serve(handler) as base_url, engine(requests_per_second=20) as fetch_engine:
+        urls = [listing_url(category, 1, base_url) for category in range(1, 7)]
+        assert all(result.ok for result in fetch_engine.fetch_all(urls))
+
+    arrivals = sorted(handler.arrivals)
+    gaps = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+    # 4 workers, but at most one request every 50 ms
+    assert min(gaps) >= 0.04
+    assert arrivals[-1] - arrivals[0] >= 0.24
+
+
+def test_slow_responses_time_out():
+    handler = fixture_handler(latency=0.5)
+    with serve(handler) as base_url, engine(timeout=0.1, retries=1) as fetch_engine:
+        started = time.monotonic()
+        result = fetch_engine.fetch(listing_url(17, 1, base_url))
+
+    assert not result.ok
+    assert result.status is None
+    assert 'timed out' in result.error
+    assert result.attempts == 2
+    assert time.monotonic() - started < 0.5 * 2
+
+
+def test_retry_after_is_followed_up_to_the_limit():
+    handler = recording(scripted((503, {'Retry-After': '0'}, b''), (200, {}, b'ok')))
+    with serve(handler) as base_url, engine() as fetch_engine:
+        result = fetch_engine.fetch(base_url + '/')
+    assert result.ok and result.attempts == 2
+
+    handler = recording(scripted((429, {'Retry-After': '3600'}, b'')))
+    with serve(handler) as base_url, engine(max_retry_after=5) as fetch_engine:
+        started = time.monotonic()
+        result = fetch_engine.fetch(base_url + '/')
+
+    assert not result.ok
+    assert result.status == 429
+    assert result.attempts == 1
+    assert '3600s' in result.error
+    assert len(handler.arrivals) == 1
+    assert time.monotonic() - started < 1
+
+
+def test_broken_chunked_response_is_retried():
+    broken = (200, {'Transfer-Encoding': 'chunked'}, b'zz\r\nnot a chunk')
+    handler = recording(scripted(broken, (200, {}, b'ok')))
+    with serve(handler) as base_url, engine() as fetch_engine:
+        result = fetch_engine.fetch(base_url + '/')
+
+    assert result.ok
+    assert result.text == 'ok'
+    assert result.attempts == 2
+
+
+def test_redirect_loop_fails_the_page():
+    handler = recording(scripted((302, {'Location': '/'}, b'')))
+    with serve(handler) as base_url, engine() as fetch_engine:
+        results = list(fetch_engine.fetch_all([base_url + '/']))
+
+    assert len(results) == 1
+    assert not results[0].ok
+    assert results[0].attempts == 1
+    assert 'redirects' in results[0].error
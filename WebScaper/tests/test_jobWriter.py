@@ -0,0 +1,86 @@
+from decimal import Decimal
+
+from jobWriter import INDEXED_COLUMNS, JOB_COLUMNS, UPDATE_COLUMNS, JobWriter, url_hash
+
+
+class FakeJobsDB:
+    """Stands in for the mysql.connector connection: a jobs table keyed by url_hash."""
+
+    def __init__(self):
+        self.jobs = {}
+        self.version = 0
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+class FakeCursor:
+    def __init__(self, db):
+        self.db = db
+        self._rows = []
+
+    def execute(self, query, args=()):
+        if query.startswith("UPDATE data_version"):
+            self.db.version += 1
+        elif query.startswith(f"SELECT url_hash, {', '.join(INDEXED_COLUMNS)} FROM jobs"):
+            self._rows = [(key,) + tuple(self.db.jobs[key][column] for column in INDEXED_COLUMNS)
+                          for key in args if key in self.db.jobs]
+        else:
+            raise AssertionError(query)
+
+    def executemany(self, query, rows):
+        for row in rows:
+            job = dict(zip(JOB_COLUMNS, row))
+            # Salaries are stored as decimal(10,2)
+            for column in ('salary_min', 'salary_max'):
+                if job[column] is not None:
+                    job[column] = Decimal(str(job[column])).quantize(Decimal('0.01'))
+            key = url_hash(job['url'])
+            if key in self.db.jobs:
+                self.db.jobs[key].update({column: job[column] for column in UPDATE_COLUMNS})
+            else:
+                self.db.jobs[key] = job
+
+    def fetchall(self):
+        return self._rows
+
+    def close(self):
+        pass
+
+
+def job(url, **changes):
+    values = dict.fromkeys(JOB_COLUMNS)
+    values.update(title='Noliktavas darbinieks', company='AS Loģistika', location='Jelgava',
+                  salary_min=1200.0, salary_max=1500, deadline='Termiņš 15.04', url=url, category='Loģistika')
+    values.update(changes)
+    return values
+
+
+def write(db, *jobs):
+    with JobWriter(db, flush_size=100) as writer:
+        for item in jobs:
+            writer.add(item)
+
+
+def test_version_bumps_only_when_indexed_columns_change():
+    db = FakeJobsDB()
+    write(db, job('https://example.lv/1'), job('https://example.lv/2'))
+    assert len(db.jobs) == 2
+    assert db.version == 0
+
+    # A re-crawl of unchanged listings, a new one and a new deadline
+    write(db, job('https://example.lv/1'), job('https://example.lv/2', deadline='Termiņš 30.04'),
+          job('https://example.lv/3'))
+    assert len(db.jobs) == 3
+    assert db.version == 0
+
+    write(db, job('https://example.lv/1', salary_max=1600), job('https://example.lv/2'))
+    assert db.version == 1
+    write(db, job('https://example.lv/3', title='Noliktavas darbinieks (nakts maiņa)'))
+    assert db.version == 2
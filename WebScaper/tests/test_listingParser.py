@@ -0,0 +1,39 @@
+import glob
+import os
+
+import pytest
+
+from listingParser import PARSERS, extract_html_parser, lxml_html
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'fixtures')
+PAGES = sorted(glob.glob(os.path.join(FIXTURE_DIR, '*.html')))
+
+
+def load(name):
+    with open(os.path.join(FIXTURE_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+@pytest.mark.skipif(lxml_html is None, reason="lxml is not installed")
+@pytest.mark.parametrize('parser', [name for name in PARSERS if name != 'html.parser'])
+@pytest.mark.parametrize('path', PAGES, ids=os.path.basename)
+def test_parsers_match_html_parser(parser, path):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+    expected = extract_html_parser(html)
+    assert expected
+    assert PARSERS[parser](html) == expected
+
+
+def test_saved_page_fields():
+    items = extract_html_parser(load('listing_17_1.html'))
+    # 20 cards, of which the standard, small and plain ones are not premium listings
+    assert len(items) == 13
+    first = items[0]
+    assert first['title'] == 'Automehāniķis. Tiek kompensēti ceļa izdevumi un dzīves vieta!'
+    assert first['href'].endswith('/67ed764c7142a?pos=0&src=list')
+    assert first['salary_text'] == '€ 3700 – 4000'
+    assert first['deadline'] == 'Termiņš 15.04'
+    assert items[1]['company'] == 'SIA "Robin Jobs"'
+    # Listings in the inline script and the HTML comment are not cards
+    assert not any(item['title'] in ('{{title}}', 'Noņemts sludinājums') for item in items)
@@ -0,0 +1,79 @@
+import math
+import random
+import re
+
+import pandas as pd
+import pytest
+
+from salaryNormalizer import normalize_salaries
+
+
+# The per-row functions normalize_salaries replaced, as they were in scraperCore.py
+def smart_salary_type(salary_min, salary_max, raw_text):
+    raw = raw_text.lower()
+    if any(k in raw for k in ['hour', '/h', '€/h', 'per hour', '/st.', 'stundā', 'st.', 'h']):
+        return 'hourly'
+    if salary_max >= 500:
+        return 'monthly'
+    if salary_max <= 30:
+        return 'hourly'
+    return 'monthly'
+
+
+def extract_salary(text):
+    numbers = re.findall(r'\d+(?:[.,]\d+)?', text.replace(',', '.'))
+    if len(numbers) == 1:
+        return float(numbers[0]), float(numbers[0])
+    elif len(numbers) >= 2:
+        return float(numbers[0]), float(numbers[1])
+    return None, None
+
+
+def reference(text):
+    salary_min, salary_max = extract_salary(text)
+    if salary_min is None:
+        return None
+    salary_type = smart_salary_type(salary_min, salary_max, text)
+    if salary_type == 'hourly':
+        equivalents = (salary_min, salary_max, round(salary_min * 160, 2), round(salary_max * 160, 2))
+    else:
+        equivalents = (round(salary_min / 160, 2), round(salary_max / 160, 2), salary_min, salary_max)
+    return (salary_type, salary_min, salary_max) + equivalents
+
+
+COLUMNS = ('salary_type', 'salary_min', 'salary_max', 'hourly_equiv_min', 'hourly_equiv_max',
+           'monthly_equiv_min', 'monthly_equiv_max')
+
+
+def normalized(texts):
+    out = normalize_salaries(pd.DataFrame({'salary_text': texts}))
+    rows = []
+    for _, row in out.iterrows():
+        rows.append(tuple(row[column] for column in COLUMNS) if row['calculated'] else None)
+    return rows
+
+
+def random_texts(count, seed=20):
+    rng = random.Random(seed)
+    templates = ['€ {a} - {b}', 'no € {a}', '{a} - {b} EUR/h', '€ {a} /st.', 'līdz {b} €', '{a},{c} - {b},{c} stundā',
+                 'Pēc vienošanās', '{a}-{b} EUR mēnesī', '€ {a}.{c}']
+    texts = []
+    for _ in range(count):
+        a = rng.choice([rng.randint(1, 40), rng.randint(400, 6000)])
+        texts.append(rng.choice(templates).format(a=a, b=a + rng.randint(0, 1500), c=rng.randint(0, 99)))
+    return texts
+
+
+@pytest.mark.parametrize('texts', [
+    # Monthly amounts whose hourly equivalent is a half cent, where NumPy's rounding differs
+    ['€ 503,20 - 506,40', '€ 508 - 4000', '€ 2,40 - 520,80', 'no € 0,80 līdz 600'],
+    random_texts(5000),
+], ids=['half-cents', 'random'])
+def test_matches_per_row_functions(texts):
+    expected = [reference(text) for text in texts]
+    for text, got, want in zip(texts, normalized(texts), expected):
+        if want is None:
+            assert got is None, text
+        else:
+            assert got[0] == want[0], text
+            assert all(math.isclose(a, b, rel_tol=0, abs_tol=1e-9) for a, b in zip(got[1:], want[1:])), text